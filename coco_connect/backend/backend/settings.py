@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     # Third-party
     "rest_framework",
@@ -117,6 +118,9 @@ DATABASES = {
         "PASSWORD": "admin123",
         "HOST": "localhost",
         "PORT": "5432",
+        # The migration history doesn't replay on an empty database (0002 and
+        # 0003 both add the unit fields), so test databases are built from the models
+        "TEST": {"MIGRATE": False},
     }
 }
 
@@ -214,3 +218,94 @@ PAYHERE_CURRENCY = os.getenv("PAYHERE_CURRENCY", "LKR")
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 BACKEND_PUBLIC_URL = os.getenv("BACKEND_PUBLIC_URL", "http://localhost:8000")
+
+# -------------------------------------------------
+# IDEA SIMILARITY (AI)
+# -------------------------------------------------
+# "exact" = brute-force scan, "ivf" = approximate search (exact below IDEA_ANN_MIN_SIZE ideas)
+IDEA_SIMILARITY_BACKEND = os.getenv("IDEA_SIMILARITY_BACKEND", "ivf")
+# Clusters scanned per query: higher = better recall, slower
+IDEA_ANN_NPROBE = int(os.getenv("IDEA_ANN_NPROBE", "16"))
+IDEA_ANN_MIN_SIZE = int(os.getenv("IDEA_ANN_MIN_SIZE", "50000"))
+# Seconds between checks for ideas changed by other processes (0 = every lookup)
+IDEA_INDEX_REFRESH_SECONDS = float(os.getenv("IDEA_INDEX_REFRESH_SECONDS", "2"))
+# Storage precision for Idea.embedding ("float32" or "float16");
+# run `manage.py backfill_embedding_storage` after changing it
+IDEA_EMBEDDING_DTYPE = os.getenv("IDEA_EMBEDDING_DTYPE", "float32")
+
+# Embedding requests arriving within IDEA_EMBEDDING_MAX_WAIT_MS of each other
+# are encoded as one batch (up to IDEA_EMBEDDING_BATCH_SIZE texts)
+IDEA_EMBEDDING_BATCHING = os.getenv("IDEA_EMBEDDING_BATCHING", "1") == "1"
+IDEA_EMBEDDING_BATCH_SIZE = int(os.getenv("IDEA_EMBEDDING_BATCH_SIZE", "32"))
+IDEA_EMBEDDING_MAX_WAIT_MS = int(os.getenv("IDEA_EMBEDDING_MAX_WAIT_MS", "5"))
+
+# Embedding inference runs in IDEA_EMBEDDING_WORKERS spawned processes (0 = in the
+# web worker). Beyond IDEA_EMBEDDING_MAX_PENDING waiting requests per web process,
+# or after IDEA_EMBEDDING_TIMEOUT seconds, idea create/update answer 503.
+IDEA_EMBEDDING_WORKERS = int(os.getenv("IDEA_EMBEDDING_WORKERS", "1"))
+IDEA_EMBEDDING_MAX_PENDING = int(os.getenv("IDEA_EMBEDDING_MAX_PENDING", "64"))
+IDEA_EMBEDDING_TIMEOUT = float(os.getenv("IDEA_EMBEDDING_TIMEOUT", "30"))
+
+# Similarity alerts are generated by `manage.py sweep_similarity_alerts` for new and
+# edited ideas: every pair scoring >= IDEA_ALERT_THRESHOLD (by different authors)
+IDEA_ALERT_THRESHOLD = float(os.getenv("IDEA_ALERT_THRESHOLD", "0.65"))
+
+# Embedding cache keyed on sha256(model + normalized text): in-process LRU + DB table
+IDEA_EMBEDDING_CACHE_SIZE = int(os.getenv("IDEA_EMBEDDING_CACHE_SIZE", "2048"))
+IDEA_EMBEDDING_DB_CACHE = os.getenv("IDEA_EMBEDDING_DB_CACHE", "1") == "1"
+
+# Embedding model warm-up at startup: "" (off), "sync", "background" or "preload"
+# (see ConnectConfig.ready; "preload" pairs with gunicorn --preload, and makes the
+# IDEA_EMBEDDING_WORKERS processes forks that share the preloaded weights)
+IDEA_EMBEDDING_WARMUP = os.getenv("IDEA_EMBEDDING_WARMUP", "")
+
+# Embedding inference backend on CPU: "torch", "int8" (dynamic quantization) or "onnx"
+# (check with `manage.py check_embedding_parity <backend>` before switching)
+IDEA_EMBEDDING_BACKEND = os.getenv("IDEA_EMBEDDING_BACKEND", "torch")
+IDEA_EMBEDDING_ONNX_FILE = os.getenv("IDEA_EMBEDDING_ONNX_FILE", "")
+
+# ---- PROJECT SEARCH ----
+# Text search configuration for InvestmentProject.search_vector (stemming/stop words);
+# run `manage.py rebuild_project_search` after changing it
+PROJECT_SEARCH_CONFIG = os.getenv("PROJECT_SEARCH_CONFIG", "english")
+
+# Project filter facets (categories, locations, risk levels, ROI histogram) are cached
+# and invalidated on project/category changes; the timeout bounds staleness for
+# other processes when CACHES is process-local
+PROJECT_FACETS_CACHE_TIMEOUT = int(os.getenv("PROJECT_FACETS_CACHE_TIMEOUT", "600"))
+PROJECT_ROI_BUCKET = int(os.getenv("PROJECT_ROI_BUCKET", "5"))
+
+# Public listing responses (projects, categories, products, news) are cached per URL and
+# invalidated by model signals; the timeout bounds staleness for other processes when
+# CACHES is process-local
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))
+
+# ---- UNIT RESERVATIONS ----
+# Seconds a buyer's held units stay reserved before they go back on sale
+# (expired holds are reclaimed by buyers or `manage.py expire_unit_reservations`)
+UNIT_RESERVATION_TTL = int(os.getenv("UNIT_RESERVATION_TTL", "900"))
+
+# ---- PROJECT FUNDING STATS ----
+# Days after which an investment counts half as much towards "trending"; run
+# `manage.py refresh_funding_stats` after changing it
+PROJECT_TRENDING_HALF_LIFE_DAYS = float(os.getenv("PROJECT_TRENDING_HALF_LIFE_DAYS", "7"))
+
+# ---- DASHBOARD STATS ----
+# Seconds the platform/auth-log stats are cached; changes to the counted models
+# invalidate them sooner (with DEBUG the responses include a timing breakdown)
+DASHBOARD_STATS_CACHE_TIMEOUT = int(os.getenv("DASHBOARD_STATS_CACHE_TIMEOUT", "30"))
+
+# ---- IMAGE THUMBNAILS ----
+# Uploaded product/news/project images are resized to these widths in each format, off
+# the request in IMAGE_THUMBNAIL_WORKERS processes (0 renders inline), and cached under
+# MEDIA_ROOT/IMAGE_THUMBNAIL_DIR by content hash; run `manage.py generate_thumbnails --all`
+# after changing widths/formats
+IMAGE_THUMBNAIL_WIDTHS = tuple(
+    int(w) for w in os.getenv("IMAGE_THUMBNAIL_WIDTHS", "160,320,640,1280").split(",") if w.strip()
+)
+IMAGE_THUMBNAIL_FORMATS = tuple(
+    f.strip() for f in os.getenv("IMAGE_THUMBNAIL_FORMATS", "webp,jpeg").split(",") if f.strip()
+)
+IMAGE_THUMBNAIL_QUALITY = int(os.getenv("IMAGE_THUMBNAIL_QUALITY", "80"))
+IMAGE_THUMBNAIL_WORKERS = int(os.getenv("IMAGE_THUMBNAIL_WORKERS", "2"))
+IMAGE_THUMBNAIL_DIR = os.getenv("IMAGE_THUMBNAIL_DIR", "thumbs")
@@ -1,10 +1,164 @@
 # connect/apps.py
+import os
+import sys
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+# Set in embedding/thumbnail pool workers before django.setup(): they inherit
+# the server's argv and environment, but must not warm up (and so start pools)
+# themselves
+POOL_WORKER_ENV = "CONNECT_POOL_WORKER"
+
+
+def _serves_requests():
+    """
+    False for one-off manage.py commands (migrate, shell, ...), for the
+    runserver autoreloader parent and for pool workers; those shouldn't load
+    the model.
+    """
+    if os.environ.get(POOL_WORKER_ENV):
+        return False
+    argv = sys.argv or [""]
+    if os.path.basename(argv[0]) != "manage.py":
+        return True  # wsgi/asgi server
+    if argv[1:2] != ["runserver"]:
+        return False
+    return os.environ.get("RUN_MAIN") == "true" or "--noreload" in argv
+
+
+def _warm_up_embeddings(mode):
+    from .services.embeddings import get_pool, pool_enabled, warm_up
+
+    if pool_enabled() and mode != "preload":
+        # The model lives in the worker processes; a pool started in the
+        # gunicorn master wouldn't be shared with the forked workers.
+        try:
+            get_pool().start(wait=True)
+        except Exception as e:
+            print(f"Embedding worker start failed: {e}")
+            return
+        print(f"Embedding workers ready ({mode}): {get_pool().workers} process(es)")
+        return
+
+    try:
+        timings = warm_up(encode=(mode != "preload"))
+    except Exception as e:
+        print(f"Embedding warm-up failed: {e}")
+        return
+
+    parts = [f"load {timings['load_ms']:.0f}ms"]
+    if "encode_ms" in timings:
+        parts.append(f"first encode {timings['encode_ms']:.0f}ms")
+    print(f"Embedding model {timings['model']} ready ({mode}): {', '.join(parts)}")
+
 
 class ConnectConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "connect"
 
     def ready(self):
-        # 🔥 disable warmup - it blocks runserver
-        pass
+        # Keep the in-memory idea embedding index in sync with the DB
+        from django.db.models.signals import post_init, post_save, post_delete
+        from .models import Idea
+        from .services import embedding_index
+
+        post_save.connect(
+            embedding_index.idea_saved,
+            sender=Idea,
+            dispatch_uid="connect.embedding_index.idea_saved",
+        )
+        post_delete.connect(
+            embedding_index.idea_deleted,
+            sender=Idea,
+            dispatch_uid="connect.embedding_index.idea_deleted",
+        )
+
+        # Cached project filter facets are rebuilt after project/category changes
+        from .models import InvestmentCategory, InvestmentProject
+        from .services import project_facets
+
+        for model in (InvestmentProject, InvestmentCategory):
+            for signal, event in ((post_save, "saved"), (post_delete, "deleted")):
+                signal.connect(
+                    project_facets.facets_changed,
+                    sender=model,
+                    dispatch_uid=f"connect.project_facets.{model.__name__}_{event}",
+                )
+
+        # Farmer names are part of the project search document
+        from django.contrib.auth.models import User
+        from .services import project_search
+
+        post_save.connect(
+            project_search.farmer_saved,
+            sender=User,
+            dispatch_uid="connect.project_search.farmer_saved",
+        )
+
+        # Every project has a funding stats row (services/funding_stats.py)
+        from .services import funding_stats
+
+        post_save.connect(
+            funding_stats.project_saved,
+            sender=InvestmentProject,
+            dispatch_uid="connect.funding_stats.project_saved",
+        )
+
+        # Cached public responses (services/response_cache.py) go stale with these
+        from .services import response_cache
+
+        for model in (InvestmentProject, InvestmentCategory, User):
+            for signal, event in ((post_save, "saved"), (post_delete, "deleted")):
+                signal.connect(
+                    response_cache.model_changed,
+                    sender=model,
+                    dispatch_uid=f"connect.response_cache.{model.__name__}_{event}",
+                )
+
+        # Cached dashboard numbers (services/dashboard_stats.py) count these
+        from .models import AuthLog, Investment
+        from .services import dashboard_stats
+
+        for model in (InvestmentProject, Investment, User, AuthLog):
+            for signal, event in ((post_save, "saved"), (post_delete, "deleted")):
+                signal.connect(
+                    dashboard_stats.model_changed,
+                    sender=model,
+                    dispatch_uid=f"connect.dashboard_stats.{model.__name__}_{event}",
+                )
+
+        # Uploaded images get thumbnails (services/thumbnails.py)
+        from .models import News
+        from .services import thumbnails
+
+        for model in (News, InvestmentProject):
+            post_init.connect(
+                thumbnails.image_loaded,
+                sender=model,
+                dispatch_uid=f"connect.thumbnails.{model.__name__}_loaded",
+            )
+            post_save.connect(
+                thumbnails.image_saved,
+                sender=model,
+                dispatch_uid=f"connect.thumbnails.{model.__name__}_saved",
+            )
+
+        # 🔥 Model warm-up (IDEA_EMBEDDING_WARMUP):
+        #   ""          -> off, model loads on the first idea request
+        #   "sync"      -> load + dummy encode before serving (blocks startup)
+        #   "background"-> same, in a thread (doesn't block runserver)
+        #   "preload"   -> load weights only; with gunicorn --preload this runs
+        #                  once in the master and workers share it after fork
+        #                  (embedding pool workers are then forked too)
+        mode = getattr(settings, "IDEA_EMBEDDING_WARMUP", "")
+        if not mode or not _serves_requests():
+            return
+
+        if mode == "background":
+            threading.Thread(
+                target=_warm_up_embeddings, args=(mode,), name="embedding-warmup", daemon=True
+            ).start()
+        else:
+            _warm_up_embeddings(mode)
@@ -0,0 +1,106 @@
+# connect/fields.py
+import json
+import struct
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+
+# ----------------------------
+# Packed embedding format
+# ----------------------------
+# [version:u8][dtype:u8][dim:u16] followed by `dim` little-endian floats.
+# float32 is 4x smaller than the old JSON text; float16 halves it again.
+EMBEDDING_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BBH")
+
+_DTYPE_CODES = {
+    "float32": 1,
+    "float16": 2,
+}
+_CODE_DTYPES = {
+    1: np.dtype("<f4"),
+    2: np.dtype("<f2"),
+}
+
+
+def pack_embedding(vector, dtype="float32"):
+    """
+    list / ndarray -> header + raw float bytes. Empty vectors pack to None.
+    """
+    if vector is None:
+        return None
+
+    code = _DTYPE_CODES[dtype]
+    arr = np.asarray(vector, dtype=_CODE_DTYPES[code]).ravel()
+    if arr.size == 0:
+        return None
+
+    return _HEADER.pack(EMBEDDING_FORMAT_VERSION, code, arr.size) + arr.tobytes()
+
+
+def unpack_embedding(data):
+    """
+    Packed bytes -> read-only ndarray that shares the buffer (no copy).
+    float16 rows come back as float16; callers that need float32 convert.
+    """
+    if data is None:
+        return None
+
+    version, code, dim = _HEADER.unpack_from(data)
+    if version != EMBEDDING_FORMAT_VERSION or code not in _CODE_DTYPES:
+        raise ValueError(f"Unsupported embedding format (version={version}, dtype={code})")
+
+    return np.frombuffer(data, dtype=_CODE_DTYPES[code], count=dim, offset=_HEADER.size)
+
+
+class EmbeddingField(models.BinaryField):
+    """
+    Stores an embedding vector as packed float bytes instead of a JSON list.
+
+    Reads return a numpy array (decoded with np.frombuffer), writes accept a
+    list or array. `dtype` defaults to settings.IDEA_EMBEDDING_DTYPE.
+    """
+
+    description = "Packed float32/float16 embedding vector"
+
+    def __init__(self, *args, dtype=None, **kwargs):
+        if dtype is not None and dtype not in _DTYPE_CODES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.dtype = dtype
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.dtype is not None:
+            kwargs["dtype"] = self.dtype
+        return name, path, args, kwargs
+
+    def get_storage_dtype(self):
+        return self.dtype or getattr(settings, "IDEA_EMBEDDING_DTYPE", "float32")
+
+    def from_db_value(self, value, expression, connection):
+        return unpack_embedding(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, np.ndarray):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return unpack_embedding(value)
+        if isinstance(value, str):
+            # serialized form (see value_to_string)
+            value = json.loads(value)
+        if isinstance(value, (list, tuple)):
+            return np.asarray(value, dtype=np.float32)
+        raise ValidationError("Invalid embedding value.")
+
+    def get_prep_value(self, value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return value
+        return pack_embedding(self.to_python(value), self.get_storage_dtype())
+
+    def value_to_string(self, obj):
+        # JSON-friendly list (used by dumpdata and DRF's ModelField)
+        value = self.value_from_object(obj)
+        return None if value is None else np.asarray(value, dtype=np.float32).tolist()
@@ -1,7 +1,10 @@
 # connect/investment_serializers.py
 from rest_framework import serializers
 from django.db import transaction
-from .models import InvestmentProject, Investment
+from django.utils import timezone
+from .models import InvestmentProject, Investment, UnitReservation
+from .serializers import format_datetime
+from .services import unit_reservations
 
 
 class InvestmentProjectCreateSerializer(serializers.ModelSerializer):
@@ -112,6 +115,92 @@ class InvestmentProjectListSerializer(serializers.ModelSerializer):
         return []
 
 
+# -------------------------------------------------
+# Fast path for project listings
+# -------------------------------------------------
+# Columns read by project_list_data(); pass to queryset.values()
+PROJECT_LIST_VALUES = (
+    "id",
+    "title",
+    "description",
+    "category_id",
+    "category__name",
+    "location",
+    "farmer_id",
+    "farmer__first_name",
+    "farmer__last_name",
+    "farmer__username",
+    "expected_roi",
+    "duration_months",
+    "target_amount",
+    "current_amount",
+    "investment_type",
+    "risk_level",
+    "status",
+    "tags",
+    "created_at",
+    "investors_count",
+    "days_left",
+    "total_units",
+    "available_units",
+    "unit_price",
+    "investment_structure",
+)
+
+
+def _decimal(value):
+    # DRF renders DecimalFields as fixed-point strings ("12.50")
+    return None if value is None else f"{value:f}"
+
+
+def project_list_data(rows):
+    """
+    Same payload as InvestmentProjectListSerializer(rows, many=True).data,
+    built straight from queryset.values(*PROJECT_LIST_VALUES) rows (no model
+    instances, no per-field serializer calls).
+    """
+    tz = timezone.get_current_timezone()
+    data = []
+    for row in rows:
+        if row["farmer_id"] is None:
+            farmer_name = "Farmer"
+        else:
+            full = f"{row['farmer__first_name']} {row['farmer__last_name']}".strip()
+            farmer_name = full or row["farmer__username"] or "Farmer"
+
+        tags = row["tags"]
+        item = {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "category": row["category__name"],
+            "location": row["location"],
+            "farmer_name": farmer_name,
+            "farmer_experience": 0,
+            "farmer_rating": 4.5,
+            "roi": _decimal(row["expected_roi"]),
+            "duration": row["duration_months"],
+            "target_amount": _decimal(row["target_amount"]),
+            "current_amount": _decimal(row["current_amount"]),
+            "investment_type": row["investment_type"],
+            "risk_level": row["risk_level"],
+            "status": row["status"],
+            "tags": [tag.strip() for tag in tags.split(",") if tag.strip()] if tags else [],
+            "created_at": format_datetime(row["created_at"], tz),
+            "investors_count": row["investors_count"],
+            "days_left": row["days_left"],
+            "total_units": row["total_units"],
+            "available_units": row["available_units"],
+            "unit_price": _decimal(row["unit_price"]),
+            "investment_structure": row["investment_structure"],
+        }
+        if row["category_id"] is None:
+            # The serializer skips category.name when there's no category
+            del item["category"]
+        data.append(item)
+    return data
+
+
 class InvestmentCreateSerializer(serializers.ModelSerializer):
     project_id = serializers.IntegerField(write_only=True)
 
@@ -173,25 +262,41 @@ class InvestmentCreateSerializer(serializers.ModelSerializer):
         validated_data.pop("project_id", None)
 
         with transaction.atomic():
-            investment = Investment.objects.create(
-                investor=request.user,
-                project=project,
-                **validated_data,
-            )
-
-            # Update project totals
-            project.current_amount += investment.amount
-            project.investors_count += 1
+            if validated_data.get("investment_type") == "unit_purchase":
+                # Held and confirmed in one go; raises UnitsUnavailable
+                # instead of overselling (see services/unit_reservations.py)
+                reservation = unit_reservations.reserve(project, request.user, validated_data["units"])
+                investment = unit_reservations.confirm(reservation, **validated_data)
+            else:
+                investment = Investment.objects.create(
+                    investor=request.user,
+                    project=project,
+                    **validated_data,
+                )
+
+            # Project totals are updated by Investment.save once the
+            # investment completes (reserved units are already taken)
+            return investment
 
-            if investment.investment_type == "unit_purchase" and investment.units:
-                project.available_units -= investment.units
 
-            if project.current_amount >= project.target_amount:
-                project.status = "funded"
-                project.days_left = 0
+class UnitReservationSerializer(serializers.ModelSerializer):
+    project_title = serializers.CharField(source="project.title", read_only=True)
+    amount = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
 
-            project.save()
-            return investment
+    class Meta:
+        model = UnitReservation
+        fields = [
+            "id",
+            "project",
+            "project_title",
+            "units",
+            "unit_price",
+            "amount",
+            "status",
+            "expires_at",
+            "created_at",
+        ]
+        read_only_fields = fields
 
 
 class MyInvestmentSerializer(serializers.ModelSerializer):
@@ -0,0 +1,128 @@
+# connect/management/commands/_synthetic_projects.py
+# Shared by the project benchmarks/checks (not a command: leading underscore)
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+
+from connect.models import InvestmentCategory, InvestmentProject, ProjectFundingStats
+from connect.services import funding_stats
+from connect.services.project_search import full_text_enabled, refresh_search_vectors
+
+WORDS = (
+    "coconut coir husk fiber oil virgin cold pressed shell charcoal water milk desiccated "
+    "farm plantation nursery seedling harvest export village cooperative processing plant "
+    "drying machine solar storage packaging organic fertilizer compost biochar rope mat "
+    "brush toddy vinegar sugar flour cream chips activated carbon smallholder irrigation"
+).split()
+NAMES = "Nimal Kamal Sunil Saman Ruwan Chamara Dilani Nadeesha Priyanka Tharindu".split()
+SURNAMES = "Perera Silva Fernando Jayasinghe Bandara Wickramasinghe Dissanayake Herath".split()
+LOCATIONS = ["Colombo", "Kurunegala", "Puttalam", "Gampaha", "Kandy", "Galle", "Matara"]
+CATEGORIES = ["Coconut Oil", "Coir Products", "Plantation", "Processing", "Export", "Organic"]
+SYLLABLES = "ka ma la na ra sa ta pa ga da ya wa ni ri si thu ko do be".split()
+
+# (status, weight)
+STATUS_MIX = [("active", 40), ("funded", 20), ("completed", 20), ("pending", 15), ("rejected", 5)]
+
+
+def synthetic_text(rng, n_words, topic_share=0.15):
+    """
+    Mostly filler words (a few thousand distinct ones) with a share of topic
+    words, so topic queries match a realistic fraction of projects.
+    """
+    words = []
+    for _ in range(n_words):
+        if rng.random() < topic_share:
+            words.append(rng.choice(WORDS))
+        else:
+            words.append("".join(rng.choices(SYLLABLES, k=3)))
+    return " ".join(words)
+
+
+def seed_projects(n, status_mix=None, seed=0, farmers=500):
+    """
+    Inserts n synthetic projects (plus farmers/categories) with spread-out
+    ROI, funding, popularity and creation dates, builds their search
+    documents and ANALYZEs the tables the listing reads. Callers roll it back.
+    """
+    rng = random.Random(seed)
+    statuses, weights = zip(*(status_mix or STATUS_MIX))
+
+    farmers = User.objects.bulk_create(
+        [
+            User(username=f"synthetic_farmer_{seed}_{i}", first_name=rng.choice(NAMES), last_name=rng.choice(SURNAMES))
+            for i in range(farmers)
+        ]
+    )
+    categories = [InvestmentCategory.objects.get_or_create(name=name)[0] for name in CATEGORIES]
+
+    batch = []
+    for _ in range(n):
+        target = Decimal(rng.randrange(50_000, 2_000_000, 5_000))
+        batch.append(
+            InvestmentProject(
+                title=synthetic_text(rng, 5, topic_share=0.4).capitalize(),
+                description=synthetic_text(rng, 40),
+                tags=",".join(rng.choices(WORDS, k=2)),
+                location=rng.choice(LOCATIONS),
+                category=rng.choice(categories),
+                farmer=rng.choice(farmers),
+                status=rng.choices(statuses, weights)[0],
+                risk_level=rng.choice(["low", "medium", "high"]),
+                investment_type=rng.choice(["equity", "loan"]),
+                expected_roi=Decimal(rng.randrange(500, 3000)) / 100,
+                target_amount=target,
+                current_amount=(target * Decimal(rng.random())).quantize(Decimal("0.01")),
+                investors_count=rng.randrange(0, 200),
+            )
+        )
+        if len(batch) >= 5000:
+            InvestmentProject.objects.bulk_create(batch)
+            batch = []
+    InvestmentProject.objects.bulk_create(batch)
+
+    table = InvestmentProject._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # auto_now_add gave every row the same timestamp
+            cursor.execute(
+                f"UPDATE {table} SET created_at = now() - random() * interval '730 days' "
+                f"WHERE farmer_id = ANY(%s)",
+                [[f.pk for f in farmers]],
+            )
+
+    # bulk_create skips save(): build the search documents in one UPDATE
+    if full_text_enabled():
+        refresh_search_vectors(InvestmentProject.objects.filter(farmer__in=farmers))
+
+    # Funding stats with a last investment some time in the past two months
+    now = timezone.now()
+    seeded = InvestmentProject.objects.filter(farmer__in=farmers).values_list(
+        "id", "current_amount", "investors_count", "target_amount"
+    )
+    ProjectFundingStats.objects.bulk_create(
+        [
+            ProjectFundingStats(
+                project_id=pk,
+                total_invested=current,
+                investments_count=investors,
+                progress=float(current / target),
+                trend_score=(
+                    funding_stats.log_weight(current, now - timedelta(days=rng.random() * 60))
+                    if current > 0
+                    else ProjectFundingStats.NO_TREND
+                ),
+            )
+            for pk, current, investors, target in seeded.iterator(chunk_size=5000)
+        ],
+        batch_size=5000,
+    )
+
+    with connection.cursor() as cursor:
+        for model in (InvestmentProject, ProjectFundingStats, InvestmentCategory, User):
+            cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+    return farmers
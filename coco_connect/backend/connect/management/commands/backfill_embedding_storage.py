@@ -0,0 +1,47 @@
+# connect/management/commands/backfill_embedding_storage.py
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from connect.models import Idea, IdeaLegacy
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-packs stored idea embeddings into the current storage format "
+        "(settings.IDEA_EMBEDDING_DTYPE), e.g. after switching float32 -> float16."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        batch_size = opts["batch_size"]
+
+        for model in (Idea, IdeaLegacy):
+            target = np.dtype(model._meta.get_field("embedding").get_storage_dtype())
+            qs = model.objects.exclude(embedding=None).only("id", "embedding").order_by("id")
+
+            checked = repacked = 0
+            batch = []
+            for row in qs.iterator(chunk_size=batch_size):
+                checked += 1
+                if row.embedding.dtype == target:
+                    continue
+
+                # Saving goes through EmbeddingField.get_prep_value -> target dtype
+                repacked += 1
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self._flush(model, batch, opts["dry_run"])
+                    batch = []
+
+            self._flush(model, batch, opts["dry_run"])
+            self.stdout.write(
+                f"{model.__name__}: {checked} checked, {repacked} repacked as {target.name}"
+                + (" (dry run)" if opts["dry_run"] else "")
+            )
+
+    def _flush(self, model, batch, dry_run):
+        if batch and not dry_run:
+            model.objects.bulk_update(batch, ["embedding"])
@@ -0,0 +1,61 @@
+# connect/management/commands/benchmark_embedding_backends.py
+import gc
+import resource
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from connect.management.commands.benchmark_embeddings import synthetic_idea_texts
+from connect.services.embeddings import EMBEDDING_BACKENDS, encode_texts, load_model
+
+
+def rss_mb():
+    # Current resident set size from /proc (Linux); peak RSS as a fallback
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = "Compares load memory and per-text CPU latency of the embedding backends."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backends", nargs="+", choices=EMBEDDING_BACKENDS, default=list(EMBEDDING_BACKENDS))
+        parser.add_argument("--texts", type=int, default=100)
+        parser.add_argument("--batch-size", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        texts = synthetic_idea_texts(opts["texts"], seed=2)
+        batch_size = opts["batch_size"]
+
+        for backend in opts["backends"]:
+            gc.collect()
+            before = rss_mb()
+            t0 = time.perf_counter()
+            try:
+                model = load_model(backend)
+            except Exception as e:
+                self.stdout.write(f"{backend:<6} unavailable: {e}")
+                continue
+            load_s = time.perf_counter() - t0
+            memory = rss_mb() - before
+
+            encode_texts(texts[:1], model=model)  # warm-up
+
+            latencies = []
+            for start in range(0, len(texts), batch_size):
+                t0 = time.perf_counter()
+                encode_texts(texts[start:start + batch_size], model=model)
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+            ms = np.array(latencies)
+            self.stdout.write(
+                f"{backend:<6} load={load_s:.1f}s  +rss={memory:.0f}MB  "
+                f"batch={batch_size}  mean={ms.mean():.1f}ms  p95={np.percentile(ms, 95):.1f}ms"
+            )
+
+            del model
@@ -0,0 +1,69 @@
+# connect/management/commands/benchmark_embeddings.py
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from connect.services.embeddings import EmbeddingBatcher, encode_texts
+
+WORDS = (
+    "coconut husk coir fiber oil shell charcoal water milk farm export village "
+    "machine drying processing organic fertilizer cooperative market rope mat "
+    "biochar plantation harvest smallholder investment solar storage packaging"
+).split()
+
+
+def synthetic_idea_texts(n, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for i in range(n):
+        title = " ".join(rng.choices(WORDS, k=5))
+        short = " ".join(rng.choices(WORDS, k=20))
+        full = " ".join(rng.choices(WORDS, k=80))
+        texts.append(f"Title: {title} {i}\nShort Description: {short}\nFull Description: {full}")
+    return texts
+
+
+class Command(BaseCommand):
+    help = "Compares one-text-per-call encoding with the coalescing EmbeddingBatcher on CPU."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--texts", type=int, default=256)
+        parser.add_argument("--threads", type=int, default=16, help="Concurrent callers")
+        parser.add_argument("--batch-size", type=int, nargs="+", default=[8, 32])
+        parser.add_argument("--max-wait-ms", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        texts = synthetic_idea_texts(opts["texts"])
+        threads = opts["threads"]
+
+        # Load the model outside the timings
+        encode_texts(["warm up"])
+
+        t0 = time.perf_counter()
+        for text in texts:
+            encode_texts([text])
+        self._report("single (sequential)", len(texts), time.perf_counter() - t0)
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            t0 = time.perf_counter()
+            list(pool.map(lambda t: encode_texts([t]), texts))
+            self._report(f"single ({threads} threads)", len(texts), time.perf_counter() - t0)
+
+            for batch_size in opts["batch_size"]:
+                batcher = EmbeddingBatcher(max_batch_size=batch_size, max_wait_ms=opts["max_wait_ms"])
+                batcher.embed("warm up")
+
+                t0 = time.perf_counter()
+                list(pool.map(batcher.embed, texts))
+                self._report(
+                    f"batched (max {batch_size}, {threads} threads)",
+                    len(texts),
+                    time.perf_counter() - t0,
+                )
+
+    def _report(self, label, count, seconds):
+        self.stdout.write(
+            f"{label:<34} {count / seconds:8.1f} texts/s  ({seconds * 1000 / count:.1f} ms/text)"
+        )
@@ -0,0 +1,80 @@
+# connect/management/commands/benchmark_project_search.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from connect.models import InvestmentProject
+from connect.services.project_search import full_text_enabled, search_projects
+
+from ._synthetic_projects import seed_projects
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds N synthetic projects (rolled back afterwards) and compares the old "
+        "icontains search with the tsvector/GIN search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=100000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--query",
+            nargs="+",
+            default=["coconut oil", "coir", "biochar plant", "vinegar", "fernando", "cocon", "kamala"],
+        )
+        parser.add_argument("--explain", action="store_true", help="Print the plan of each full-text query")
+
+    def handle(self, *args, **opts):
+        if not full_text_enabled():
+            raise CommandError("Full-text search needs PostgreSQL.")
+
+        with transaction.atomic():
+            self._seed(opts["projects"])
+
+            for text in opts["query"]:
+                old_ms, old_count = self._time(opts["repeat"], lambda: self._icontains(text))
+                new_ms, new_count = self._time(opts["repeat"], lambda: self._full_text(text))
+                self.stdout.write(
+                    f"{text!r:<16} icontains {old_ms:8.1f} ms ({old_count} hits)   "
+                    f"full-text {new_ms:7.1f} ms ({new_count} hits)"
+                )
+                if opts["explain"]:
+                    qs = search_projects(InvestmentProject.objects.all(), text).order_by("-search_rank")[:24]
+                    self.stdout.write(qs.explain())
+
+            transaction.set_rollback(True)
+
+    def _seed(self, n):
+        t0 = time.perf_counter()
+        seed_projects(n, status_mix=[("active", 1)])
+        self.stdout.write(f"Seeded {n} projects in {time.perf_counter() - t0:.1f}s")
+
+    def _icontains(self, text):
+        # What get_projects did before: four unindexable ILIKE '%x%' filters
+        qs = InvestmentProject.objects.select_related("category", "farmer").filter(
+            Q(title__icontains=text)
+            | Q(description__icontains=text)
+            | Q(farmer__first_name__icontains=text)
+            | Q(farmer__last_name__icontains=text)
+        )
+        count = qs.count()
+        list(qs.order_by("-expected_roi", "-id")[:24])
+        return count
+
+    def _full_text(self, text):
+        qs = search_projects(InvestmentProject.objects.select_related("category", "farmer"), text)
+        count = qs.count()
+        list(qs.order_by("-search_rank", "-id")[:24])
+        return count
+
+    def _time(self, repeat, fn):
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = fn()
+            timings.append((time.perf_counter() - t0) * 1000)
+        return statistics.median(timings), result
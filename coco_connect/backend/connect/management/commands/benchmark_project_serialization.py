@@ -0,0 +1,71 @@
+# connect/management/commands/benchmark_project_serialization.py
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from connect.investment_serializers import (
+    PROJECT_LIST_VALUES,
+    InvestmentProjectListSerializer,
+    project_list_data,
+)
+from connect.models import InvestmentProject
+
+from ._synthetic_projects import seed_projects
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds N synthetic projects (rolled back afterwards) and compares "
+        "InvestmentProjectListSerializer with the values() fast path, per 1,000 projects."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        n = opts["projects"]
+
+        with transaction.atomic():
+            seed_projects(n)
+            qs = InvestmentProject.objects.order_by("-expected_roi", "-id")[:n]
+
+            serializer_rows = lambda: list(qs.select_related("category", "farmer"))
+            serializer_data = lambda objs: InvestmentProjectListSerializer(objs, many=True).data
+            values_rows = lambda: list(qs.values(*PROJECT_LIST_VALUES))
+
+            old = self._measure(opts["repeat"], serializer_rows, serializer_data)
+            new = self._measure(opts["repeat"], values_rows, project_list_data)
+
+            # Both must render the same JSON
+            old_json = JSONRenderer().render(serializer_data(serializer_rows()))
+            new_json = JSONRenderer().render(project_list_data(values_rows()))
+            if json.loads(old_json) != json.loads(new_json):
+                raise CommandError("The fast path payload differs from InvestmentProjectListSerializer")
+
+            transaction.set_rollback(True)
+
+        per_k = 1000 / n
+        self.stdout.write(f"{n} projects, median of {opts['repeat']} runs, ms per 1,000 projects:")
+        self.stdout.write(f"{'':<24}{'query':>10}{'serialize':>12}{'total':>10}")
+        for label, (query_ms, build_ms) in (("ModelSerializer", old), ("values() fast path", new)):
+            self.stdout.write(
+                f"{label:<24}{query_ms * per_k:>10.1f}{build_ms * per_k:>12.1f}{(query_ms + build_ms) * per_k:>10.1f}"
+            )
+        self.stdout.write(f"Serialization speed-up: {old[1] / new[1]:.1f}x, end to end: {sum(old) / sum(new):.1f}x")
+
+    def _measure(self, repeat, fetch, build):
+        query_ms, build_ms = [], []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            rows = fetch()
+            t1 = time.perf_counter()
+            build(rows)
+            t2 = time.perf_counter()
+            query_ms.append((t1 - t0) * 1000)
+            build_ms.append((t2 - t1) * 1000)
+        return statistics.median(query_ms), statistics.median(build_ms)
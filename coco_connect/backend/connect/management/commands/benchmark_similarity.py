@@ -0,0 +1,91 @@
+# connect/management/commands/benchmark_similarity.py
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from connect.services.embedding_index import EmbeddingIndex
+from connect.services.similarity import ExactSearch, IVFSearch
+
+
+def synthetic_embeddings(n, centers, noise, rng, chunk=100000):
+    """
+    Clustered unit vectors around `centers` (real sentence embeddings are
+    topical, not uniformly spread).
+    """
+    clusters, dim = centers.shape
+    out = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, chunk):
+        size = min(chunk, n - start)
+        labels = rng.integers(0, clusters, size)
+        block = centers[labels] + noise * rng.standard_normal((size, dim)).astype(np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        out[start:start + size] = block
+    return out
+
+
+class Command(BaseCommand):
+    help = "Benchmarks top-k recall and latency of the IVF idea search against the exact scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+        parser.add_argument("--dim", type=int, default=384)
+        parser.add_argument("--k", type=int, default=5)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+        parser.add_argument("--clusters", type=int, default=2000)
+        parser.add_argument("--noise", type=float, default=1.0)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **opts):
+        k = opts["k"]
+
+        for n in opts["sizes"]:
+            rng = np.random.default_rng(opts["seed"])
+            self.stdout.write(f"\n== {n:,} vectors x {opts['dim']} dims ==")
+
+            t0 = time.perf_counter()
+            centers = rng.standard_normal((opts["clusters"], opts["dim"])).astype(np.float32)
+            data = synthetic_embeddings(n, centers, opts["noise"], rng)
+            queries = synthetic_embeddings(opts["queries"], centers, opts["noise"], rng)
+            self.stdout.write(f"generated in {time.perf_counter() - t0:.1f}s")
+
+            ivf = IVFSearch(min_size=0)
+            index = EmbeddingIndex(backend=ivf)
+            index.load(np.arange(n), data)
+            del data
+
+            # Ground truth from the exact scan
+            exact = ExactSearch()
+            truth, exact_times = [], []
+            for q in queries:
+                t0 = time.perf_counter()
+                rows, _ = exact.search(index.matrix, q, k)
+                exact_times.append(time.perf_counter() - t0)
+                truth.append(set(rows.tolist()))
+            self._report("exact", exact_times, k, 1.0)
+
+            t0 = time.perf_counter()
+            ivf.train(index.matrix)
+            self.stdout.write(
+                f"ivf trained in {time.perf_counter() - t0:.1f}s ({len(ivf.centroids)} lists)"
+            )
+
+            for nprobe in opts["nprobe"]:
+                ivf.nprobe = nprobe
+                times, hits = [], 0
+                for q, expected in zip(queries, truth):
+                    t0 = time.perf_counter()
+                    rows, _ = ivf.search(index.matrix, q, k)
+                    times.append(time.perf_counter() - t0)
+                    hits += len(expected & set(rows.tolist()))
+                self._report(f"ivf nprobe={nprobe}", times, k, hits / (k * len(queries)))
+
+            del index
+
+    def _report(self, label, times, k, recall):
+        ms = np.array(times) * 1000
+        self.stdout.write(
+            f"{label:<16} recall@{k}={recall:.3f}  "
+            f"mean={ms.mean():.2f}ms  p95={np.percentile(ms, 95):.2f}ms"
+        )
@@ -0,0 +1,119 @@
+# connect/management/commands/benchmark_thumbnails.py
+import os
+import shutil
+import statistics
+import time
+import uuid
+from concurrent.futures import wait
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from connect.models import ImageThumbnails
+from connect.services import thumbnails
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes N synthetic photos into MEDIA_ROOT, renders their thumbnails inline "
+        "and on the worker pool, then again from the cache, and compares the bytes "
+        "of a catalogue-sized derivative with the original. Everything it creates is "
+        "deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--images", type=int, default=24)
+        parser.add_argument("--size", default="2400x1600", help="WIDTHxHEIGHT of the originals")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--width", type=int, default=320, help="Derivative width to compare sizes at")
+
+    def handle(self, *args, **opts):
+        folder = f"benchmark_thumbnails_{uuid.uuid4().hex[:8]}"
+        width, height = (int(x) for x in opts["size"].split("x"))
+        sources = self._seed(folder, opts["images"], width, height)
+        try:
+            self._run(sources, opts)
+        finally:
+            self._cleanup(folder, sources)
+
+    def _seed(self, folder, n, width, height):
+        from PIL import Image
+
+        os.makedirs(default_storage.path(folder), exist_ok=True)
+        sources = []
+        for i in range(n):
+            # Noise over gradients: compresses about like a photo, unlike flat colour
+            bands = [
+                Image.linear_gradient("L").resize((width, height)),
+                Image.effect_noise((width, height), 40 + i),
+                Image.radial_gradient("L").resize((width, height)),
+            ]
+            name = f"{folder}/photo_{i}.jpg"
+            Image.merge("RGB", bands).save(default_storage.path(name), quality=92)
+            sources.append(name)
+        return sources
+
+    def _clear_derivatives(self, sources):
+        hashes = ImageThumbnails.objects.filter(source__in=sources).values_list("content_hash", flat=True)
+        for content_hash in hashes:
+            if content_hash:
+                path = default_storage.path(thumbnails.derivative_dir(content_hash))
+                shutil.rmtree(path, ignore_errors=True)
+                if os.path.isdir(os.path.dirname(path)) and not os.listdir(os.path.dirname(path)):
+                    os.rmdir(os.path.dirname(path))
+        ImageThumbnails.objects.filter(source__in=sources).update(status="pending")
+
+    def _run(self, sources, opts):
+        n = len(sources)
+
+        t0 = time.perf_counter()
+        per_image = []
+        for source in sources:
+            t1 = time.perf_counter()
+            thumbnails.generate(source)
+            per_image.append(time.perf_counter() - t1)
+        inline = time.perf_counter() - t0
+        self.stdout.write(
+            f"Inline: {n} images in {inline:.2f}s ({statistics.median(per_image) * 1000:.0f}ms median per image, "
+            f"which an upload request would wait for)"
+        )
+
+        self._clear_derivatives(sources)
+        pool = thumbnails.ThumbnailPool(opts["workers"])
+        try:
+            wait([pool.submit(sources[0])])  # Spawn + django.setup() of the workers
+            self._clear_derivatives(sources[:1])
+
+            t0 = time.perf_counter()
+            futures = [pool.submit(source) for source in sources]
+            queued = time.perf_counter() - t0
+            wait(futures)
+            pooled = time.perf_counter() - t0
+        finally:
+            pool.shutdown()
+        self.stdout.write(
+            f"Pool ({opts['workers']} workers): {n} images in {pooled:.2f}s ({inline / pooled:.1f}x), "
+            f"{queued / n * 1000:.2f}ms per image to queue"
+        )
+
+        t0 = time.perf_counter()
+        written = sum(thumbnails.generate(source) for source in sources)
+        self.stdout.write(f"Cached: {n} images in {time.perf_counter() - t0:.2f}s ({written} files re-rendered)")
+
+        originals = [os.path.getsize(default_storage.path(source)) for source in sources]
+        self.stdout.write(f"Original: {statistics.mean(originals) / 1024:.0f} KB on average")
+        rows = ImageThumbnails.objects.filter(source__in=sources, status="ready").values_list("content_hash", "widths")
+        for fmt in thumbnails.get_formats():
+            sizes = []
+            for content_hash, widths in rows:
+                w = min((int(w) for w in widths.split(",")), key=lambda w: abs(w - opts["width"]))
+                sizes.append(os.path.getsize(default_storage.path(thumbnails.derivative_name(content_hash, w, fmt))))
+            self.stdout.write(
+                f"{opts['width']}w {fmt}: {statistics.mean(sizes) / 1024:.1f} KB on average "
+                f"({statistics.mean(originals) / statistics.mean(sizes):.0f}x smaller)"
+            )
+
+    def _cleanup(self, folder, sources):
+        self._clear_derivatives(sources)
+        ImageThumbnails.objects.filter(source__in=sources).delete()
+        shutil.rmtree(default_storage.path(folder), ignore_errors=True)
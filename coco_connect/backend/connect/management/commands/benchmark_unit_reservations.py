@@ -0,0 +1,184 @@
+# connect/management/commands/benchmark_unit_reservations.py
+import random
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from connect.models import Investment, InvestmentProject, UnitReservation
+from connect.services import unit_reservations
+from connect.services.unit_reservations import UnitsUnavailable
+
+
+class Command(BaseCommand):
+    help = (
+        "Lets N concurrent purchasers buy up one unit-based project (reserve, then "
+        "confirm/release/abandon) and checks that no unit is oversold. Reports "
+        "reservation throughput and latency. Needs PostgreSQL; everything it creates "
+        "is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--purchasers", type=int, default=64)
+        parser.add_argument("--units", type=int, default=5000, help="Units on sale")
+        parser.add_argument("--max-per-purchase", type=int, default=5)
+        parser.add_argument("--release-share", type=float, default=0.1, help="Holds given back")
+        parser.add_argument("--abandon-share", type=float, default=0.05, help="Holds left to expire")
+        parser.add_argument("--ttl", type=float, default=0.5, help="Hold time (s) of abandoned reservations")
+        parser.add_argument(
+            "--compare-lock",
+            action="store_true",
+            help="Also run a SELECT ... FOR UPDATE reservation for comparison",
+        )
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("Run this against PostgreSQL.")
+
+        tag = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create(
+            [User(username=f"unit_buyer_{tag}_{i}") for i in range(opts["purchasers"])]
+        )
+        try:
+            failures = self._run("conditional UPDATE", users, opts, self._reserve)
+            if opts["compare_lock"]:
+                failures += self._run("SELECT FOR UPDATE", users, opts, self._reserve_locked)
+        finally:
+            # Cascades to their projects, reservations and investments
+            User.objects.filter(username__startswith=f"unit_buyer_{tag}_").delete()
+
+        if failures:
+            raise CommandError("; ".join(failures))
+        self.stdout.write(self.style.SUCCESS("No units oversold."))
+
+    def _run(self, label, users, opts, reserve):
+        total = opts["units"]
+        project = InvestmentProject.objects.create(
+            title="Unit reservation benchmark",
+            description="",
+            farmer=users[0],
+            status="active",
+            investment_type="equity",
+            target_amount=Decimal(total * 100),
+            total_units=total,
+            available_units=total,
+        )
+
+        latencies, counts = [], {"confirmed": 0, "released": 0, "abandoned": 0, "sold_out": 0}
+        lock = threading.Lock()
+        start = threading.Event()
+
+        def purchaser(user, seed):
+            rng = random.Random(seed)
+            mine, done = [], {"confirmed": 0, "released": 0, "abandoned": 0, "sold_out": 0}
+            start.wait()
+            try:
+                while True:
+                    units = rng.randint(1, opts["max_per_purchase"])
+                    roll = rng.random()
+                    abandon = roll < opts["abandon_share"]
+                    t0 = time.perf_counter()
+                    try:
+                        reservation = reserve(project, user, units, opts["ttl"] if abandon else None)
+                    except UnitsUnavailable:
+                        if units == 1:
+                            done["sold_out"] += 1
+                            return
+                        continue
+                    finally:
+                        mine.append(time.perf_counter() - t0)
+
+                    if abandon:
+                        done["abandoned"] += 1
+                    elif roll < opts["abandon_share"] + opts["release_share"]:
+                        unit_reservations.release(reservation)
+                        done["released"] += 1
+                    else:
+                        unit_reservations.confirm(reservation, status="completed", payment_status="completed")
+                        done["confirmed"] += 1
+            finally:
+                connection.close()
+                with lock:
+                    latencies.extend(mine)
+                    for key, value in done.items():
+                        counts[key] += value
+
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            futures = [pool.submit(purchaser, user, i) for i, user in enumerate(users)]
+            t0 = time.perf_counter()
+            start.set()
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - t0
+
+        failures = self._check(f"{label}, after the rush", project, total)
+
+        # Let the abandoned holds run out and sweep them back
+        time.sleep(opts["ttl"])
+        while unit_reservations.expire():
+            pass
+        failures += self._check(f"{label}, after expiry", project, total, held_expected=0)
+
+        ms = sorted(x * 1000 for x in latencies)
+        self.stdout.write(
+            f"  {len(users)} purchasers, {len(ms)} reservation attempts in {elapsed:.2f}s "
+            f"({len(ms) / elapsed:.0f}/s): {counts['confirmed']} confirmed, "
+            f"{counts['released']} released, {counts['abandoned']} abandoned"
+        )
+        self.stdout.write(
+            f"  reserve latency p50 {statistics.median(ms):.1f} ms, "
+            f"p95 {ms[int(len(ms) * 0.95)]:.1f} ms, p99 {ms[int(len(ms) * 0.99)]:.1f} ms"
+        )
+        return failures
+
+    def _reserve(self, project, user, units, ttl):
+        return unit_reservations.reserve(project, user, units, ttl)
+
+    def _reserve_locked(self, project, user, units, ttl):
+        # Same bookkeeping, but read-lock-write on the project row
+        with transaction.atomic():
+            locked = InvestmentProject.objects.select_for_update().get(pk=project.pk)
+            if locked.available_units < units:
+                if unit_reservations.expire(project_id=project.pk):
+                    locked.refresh_from_db(fields=["available_units"])
+                if locked.available_units < units:
+                    raise UnitsUnavailable(f"Fewer than {units} units are available")
+            locked.available_units -= units
+            locked.save(update_fields=["available_units"])
+            return UnitReservation.objects.create(
+                project=project,
+                investor=user,
+                units=units,
+                unit_price=unit_reservations.unit_price_of(project),
+                expires_at=timezone.now() + timedelta(seconds=ttl or unit_reservations.get_ttl()),
+            )
+
+    def _check(self, label, project, total, held_expected=None):
+        project.refresh_from_db(fields=["available_units"])
+        sold = Investment.objects.filter(project=project).aggregate(n=Sum("units"))["n"] or 0
+        held = (
+            UnitReservation.objects.filter(project=project, status="held").aggregate(n=Sum("units"))["n"] or 0
+        )
+
+        wrong = []
+        if project.available_units < 0:
+            wrong.append(f"available_units {project.available_units} < 0")
+        if sold + held + project.available_units != total:
+            wrong.append(f"sold {sold} + held {held} + available {project.available_units} != {total}")
+        if held_expected is not None and held != held_expected:
+            wrong.append(f"{held} units still held")
+
+        self.stdout.write(
+            f"{'ok  ' if not wrong else 'FAIL'} {label}: sold {sold}, held {held}, "
+            f"available {project.available_units}" + (f" ({'; '.join(wrong)})" if wrong else "")
+        )
+        return [f"{label}: {'; '.join(wrong)}"] if wrong else []
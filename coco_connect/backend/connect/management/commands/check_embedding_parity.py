@@ -0,0 +1,50 @@
+# connect/management/commands/check_embedding_parity.py
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from connect.management.commands.benchmark_embeddings import synthetic_idea_texts
+from connect.services.embeddings import EMBEDDING_BACKENDS, encode_texts, load_model
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks that an alternative embedding backend (int8 / onnx) agrees with "
+        "the full-precision torch backend. Exits non-zero below --min-cosine."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("backend", choices=[b for b in EMBEDDING_BACKENDS if b != "torch"])
+        parser.add_argument("--texts", type=int, default=200)
+        parser.add_argument("--min-cosine", type=float, default=0.98)
+        parser.add_argument("--top-k", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        texts = synthetic_idea_texts(opts["texts"], seed=1)
+
+        reference = encode_texts(texts, model=load_model("torch"))
+        candidate = encode_texts(texts, model=load_model(opts["backend"]))
+
+        # Rows are normalized, so the row-wise dot product is the cosine
+        cosines = np.sum(reference * candidate, axis=1)
+        self.stdout.write(
+            f"cosine vs torch: min={cosines.min():.4f} mean={cosines.mean():.4f} "
+            f"p5={np.percentile(cosines, 5):.4f}"
+        )
+
+        # What the similarity check actually uses: do the neighbours agree?
+        k = opts["top_k"]
+        ref_scores = reference @ reference.T
+        cand_scores = candidate @ candidate.T
+        np.fill_diagonal(ref_scores, -np.inf)
+        np.fill_diagonal(cand_scores, -np.inf)
+        ref_top = np.argsort(-ref_scores, axis=1)[:, :k]
+        cand_top = np.argsort(-cand_scores, axis=1)[:, :k]
+        overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(ref_top, cand_top)])
+        self.stdout.write(f"top-{k} neighbour overlap: {overlap:.3f}")
+
+        if cosines.min() < opts["min_cosine"]:
+            raise CommandError(
+                f"{opts['backend']} backend drifts from torch: min cosine "
+                f"{cosines.min():.4f} < {opts['min_cosine']}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{opts['backend']} backend matches torch"))
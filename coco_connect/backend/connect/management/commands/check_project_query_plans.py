@@ -0,0 +1,82 @@
+# connect/management/commands/check_project_query_plans.py
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from connect.models import InvestmentProject, ProjectFundingStats
+from connect.services.pagination import keyset_page, keyset_queryset
+from connect.services.project_listing import PROJECT_PAGE_SIZE, PROJECT_SORTS, filter_projects, order_projects
+
+from ._synthetic_projects import seed_projects
+
+TABLE = InvestmentProject._meta.db_table
+# trending/closest_to_funded are driven by the funding stats indexes
+TABLES = f"(?:{TABLE}|{ProjectFundingStats._meta.db_table})"
+INDEX_RE = re.compile(
+    rf"(?:Index(?: Only)? Scan(?: Backward)? using (\w+) on {TABLES}|Bitmap Index Scan on (\w+))"
+)
+
+# (label, query params, sort) - what the Investment page sends
+CASES = [
+    *[(f"active / {sort}", {"status": "active"}, sort) for sort in PROJECT_SORTS if sort != "relevance"],
+    ("active + category / roi_desc", {"status": "active", "category": "Coir Products"}, "roi_desc"),
+    ("active + location / roi_desc", {"status": "active", "location": "Kandy"}, "roi_desc"),
+    ("active + risk / popularity", {"status": "active", "riskLevel": "high"}, "popularity"),
+    ("active + ROI range / roi_asc", {"status": "active", "minROI": "10", "maxROI": "15"}, "roi_asc"),
+    ("funded / date_newest", {"status": "funded"}, "date_newest"),
+    ("funded + location / roi_desc", {"status": "funded", "location": "Galle"}, "roi_desc"),
+]
+
+
+def check_plan(qs, ordering, cursor=None):
+    """
+    EXPLAINs one listing page. Returns (ok, indexes, plan): ok when the
+    project tables are reached through indexes only.
+    """
+    plan = keyset_queryset(qs, ordering, cursor)[: PROJECT_PAGE_SIZE + 1].explain()
+    indexes = sorted({a or b for a, b in INDEX_RE.findall(plan)})
+    ok = not re.search(rf"Seq Scan on {TABLES}\b", plan) and bool(indexes)
+    return ok, indexes, plan
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds N synthetic projects (rolled back afterwards) and checks that the "
+        "project listing queries (first and later pages) use index scans instead "
+        "of scanning the whole table. Fails on a regression."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=50000)
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan")
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("Query plans are only checked on PostgreSQL.")
+
+        failures = []
+        with transaction.atomic():
+            seed_projects(opts["projects"])
+            self.stdout.write(f"Seeded {opts['projects']} projects")
+
+            for label, params, sort in CASES:
+                qs, ordering = order_projects(filter_projects(params), sort)
+                _, cursor = keyset_page(qs, ordering, limit=PROJECT_PAGE_SIZE)
+
+                for page, page_cursor in (("page 1", None), ("page 2", cursor)):
+                    ok, indexes, plan = check_plan(qs, ordering, page_cursor)
+
+                    self.stdout.write(
+                        f"{'ok  ' if ok else 'FAIL'} {label:<32} {page}  {', '.join(indexes) or '(no index)'}"
+                    )
+                    if opts["verbose_plans"] or not ok:
+                        self.stdout.write(plan)
+                    if not ok:
+                        failures.append(f"{label} ({page})")
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError("Listing queries without an index scan: " + "; ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All project listing queries use indexes."))
@@ -0,0 +1,35 @@
+# connect/management/commands/expire_unit_reservations.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from connect.services.unit_reservations import expire
+
+
+class Command(BaseCommand):
+    help = (
+        "Returns the units of expired reservations to their projects. Buyers also "
+        "reclaim expired holds when a project looks sold out, so this only keeps "
+        "available_units current. Run it from cron, or keep it running with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--loop", action="store_true", help="Keep sweeping every --interval seconds")
+        parser.add_argument("--interval", type=float, default=60)
+
+    def handle(self, *args, **opts):
+        while True:
+            total = 0
+            while True:
+                expired = expire(batch_size=opts["batch_size"])
+                total += expired
+                if expired < opts["batch_size"]:
+                    break
+
+            if total or not opts["loop"]:
+                self.stdout.write(f"Expired {total} unit reservations")
+
+            if not opts["loop"]:
+                return
+            time.sleep(opts["interval"])
@@ -0,0 +1,48 @@
+# connect/management/commands/generate_thumbnails.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from connect.models import ImageThumbnails
+from connect.services import thumbnails
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the thumbnails of every uploaded product/news/project image that "
+        "doesn't have them yet (e.g. uploaded before thumbnails existed, or queued "
+        "when the server stopped). Files already in the cache are reused."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry images that failed before")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Check every image (renders missing sizes/formats after a settings change)",
+        )
+        parser.add_argument("--workers", type=int, default=None, help="Processes (default IMAGE_THUMBNAIL_WORKERS, 0 = inline)")
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Afterwards delete the records and files of images no longer referenced",
+        )
+
+    def handle(self, *args, **opts):
+        statuses = ["pending"]
+        if opts["retry_failed"] or opts["all"]:
+            statuses.append("failed")
+        if opts["all"]:
+            statuses.append("ready")
+
+        t0 = time.perf_counter()
+        images, written = thumbnails.generate_all(statuses=statuses, workers=opts["workers"])
+        self.stdout.write(f"Processed {images} images, wrote {written} files in {time.perf_counter() - t0:.2f}s")
+
+        failed = ImageThumbnails.objects.filter(status="failed")
+        for source, error in failed.values_list("source", "error")[:20]:
+            self.stdout.write(self.style.WARNING(f"  failed: {source}: {error}"))
+
+        if opts["prune"]:
+            records, directories = thumbnails.prune()
+            self.stdout.write(f"Pruned {records} records and {directories} cached image directories")
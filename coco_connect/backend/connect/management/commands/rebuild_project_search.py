@@ -0,0 +1,34 @@
+# connect/management/commands/rebuild_project_search.py
+from django.core.management.base import BaseCommand
+
+from connect.models import InvestmentProject
+from connect.services.project_search import full_text_enabled, refresh_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Recomputes InvestmentProject.search_vector for all projects (e.g. after changing PROJECT_SEARCH_CONFIG)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        if not full_text_enabled():
+            self.stdout.write("Full-text search needs PostgreSQL; nothing to do.")
+            return
+
+        batch_size = opts["batch_size"]
+        last_id = updated = 0
+
+        # id ranges keep each UPDATE (and its row locks) short
+        while True:
+            ids = list(
+                InvestmentProject.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            updated += refresh_search_vectors(InvestmentProject.objects.filter(id__in=ids))
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the search document of {updated} projects"))
@@ -0,0 +1,154 @@
+# connect/management/commands/reembed_ideas.py
+import json
+import os
+import time
+from collections import deque
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from connect.models import Idea
+from connect.services.embedding_cache import normalize_text
+from connect.services.embeddings import EmbeddingPool, build_idea_text, encode_texts, model_id
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes Idea.embedding for every idea (e.g. after changing the model or the "
+        "text normalization). Progress is checkpointed, so an interrupted run resumes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=256, help="Ideas per encode call")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Encoding processes (0 = encode in this process)",
+        )
+        parser.add_argument("--checkpoint", default="reembed_ideas.checkpoint.json")
+        parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+        parser.add_argument(
+            "--missing-only", action="store_true", help="Only ideas that have no embedding yet"
+        )
+
+    def handle(self, *args, **opts):
+        batch_size = max(1, opts["batch_size"])
+        workers = max(0, opts["workers"])
+        self.checkpoint = opts["checkpoint"]
+        self.state = self._load_checkpoint(opts["restart"])
+
+        qs = Idea.objects.filter(id__gt=self.state["last_id"]).order_by("id")
+        if opts["missing_only"]:
+            qs = qs.filter(embedding=None)
+
+        total = self.state["done"] + qs.count()
+        self.stdout.write(
+            f"Re-embedding {total - self.state['done']} ideas with {self.state['model']} "
+            f"({workers or 'no'} worker processes, batches of {batch_size})"
+        )
+
+        rows = qs.values_list("id", "title", "short_description", "full_description").iterator(
+            chunk_size=batch_size
+        )
+
+        pool = EmbeddingPool(workers=workers) if workers else None
+        pending = deque()
+        self.started = time.perf_counter()
+        self.written = 0
+
+        try:
+            for batch in self._batches(rows, batch_size):
+                ids = [row[0] for row in batch]
+                texts = [normalize_text(build_idea_text(*row[1:])) for row in batch]
+
+                if pool is None:
+                    self._write(ids, encode_texts(texts), total)
+                    continue
+
+                # Keep every worker busy; results are written in id order so
+                # the checkpoint never skips an unfinished batch
+                pending.append((ids, pool.submit(texts)))
+                if len(pending) >= workers * 2:
+                    ids, future = pending.popleft()
+                    self._write(ids, future.result(), total)
+
+            while pending:
+                ids, future = pending.popleft()
+                self._write(ids, future.result(), total)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+        seconds = time.perf_counter() - self.started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {self.written} ideas in {seconds:.1f}s "
+                f"({self.written / seconds if seconds else 0:.1f} rows/s)"
+            )
+        )
+
+    def _batches(self, rows, size):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _write(self, ids, vectors, total):
+        # New vectors can change which ideas are similar: queue them for the alert
+        # sweeper; updated_at makes running processes re-read them into their index
+        now = timezone.now()
+        Idea.objects.bulk_update(
+            [
+                Idea(id=idea_id, embedding=vector, needs_similarity_sweep=True, updated_at=now)
+                for idea_id, vector in zip(ids, vectors)
+            ],
+            ["embedding", "needs_similarity_sweep", "updated_at"],
+        )
+
+        self.written += len(ids)
+        self.state["done"] += len(ids)
+        self.state["last_id"] = ids[-1]
+        self._save_checkpoint()
+
+        seconds = time.perf_counter() - self.started
+        self.stdout.write(
+            f"  {self.state['done']}/{total} ideas (last id {ids[-1]}), "
+            f"{self.written / seconds if seconds else 0:.1f} rows/s"
+        )
+
+    # ----------------------------
+    # Checkpoint file
+    # ----------------------------
+    def _load_checkpoint(self, restart):
+        fresh = {"model": model_id(), "last_id": 0, "done": 0}
+        if restart or not os.path.exists(self.checkpoint):
+            return fresh
+
+        with open(self.checkpoint) as f:
+            state = json.load(f)
+
+        if state.get("model") != fresh["model"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Checkpoint was written for {state.get('model')}, starting over with {fresh['model']}"
+                )
+            )
+            return fresh
+
+        self.stdout.write(f"Resuming after idea {state['last_id']} ({state['done']} already done)")
+        return state
+
+    def _save_checkpoint(self):
+        # Write + rename so a crash mid-write can't leave a corrupt checkpoint
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.checkpoint)
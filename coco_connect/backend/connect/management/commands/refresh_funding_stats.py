@@ -0,0 +1,37 @@
+# connect/management/commands/refresh_funding_stats.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from connect.services import funding_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the per-project funding stats from the investments (fixing any "
+        "drift) and refreshes the trending ranks. With --ranks-only it just re-ranks, "
+        "which is cheap enough to keep running with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ranks-only", action="store_true", help="Skip the rebuild")
+        parser.add_argument(
+            "--sync-projects",
+            action="store_true",
+            help="Also reset InvestmentProject.current_amount/investors_count to the rebuilt totals",
+        )
+        parser.add_argument("--loop", action="store_true", help="Keep refreshing every --interval seconds")
+        parser.add_argument("--interval", type=float, default=300)
+
+    def handle(self, *args, **opts):
+        while True:
+            t0 = time.perf_counter()
+            if not opts["ranks_only"]:
+                rebuilt = funding_stats.rebuild(sync_projects=opts["sync_projects"])
+                self.stdout.write(f"Rebuilt funding stats of {rebuilt} projects")
+            ranked = funding_stats.refresh_ranks()
+            self.stdout.write(f"Ranked {ranked} trending projects in {time.perf_counter() - t0:.2f}s")
+
+            if not opts["loop"]:
+                return
+            time.sleep(opts["interval"])
@@ -0,0 +1,193 @@
+# connect/management/commands/stress_investments.py
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from connect.models import Investment, InvestmentProject, ProjectFundingStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Fires parallel investments into one hot project and checks that the "
+        "funding counters, units and funded transition add up. Needs PostgreSQL "
+        "(SQLite serializes writers). Everything it creates is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--investments", type=int, default=400)
+        parser.add_argument("--workers", type=int, default=16)
+        parser.add_argument("--amount", type=Decimal, default=Decimal("250.00"))
+        parser.add_argument(
+            "--compare-legacy",
+            action="store_true",
+            help="Also run the old read-modify-write update and report its lost updates",
+        )
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("Run this against PostgreSQL.")
+
+        tag = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create(
+            [User(username=f"stress_investor_{tag}_{i}") for i in range(opts["workers"])]
+        )
+        try:
+            failures = self._run(users, opts)
+        finally:
+            # Cascades to their projects and investments
+            User.objects.filter(username__startswith=f"stress_investor_{tag}_").delete()
+
+        if failures:
+            raise CommandError("; ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All funding counters add up."))
+
+    def _run(self, users, opts):
+        n, workers, amount = opts["investments"], opts["workers"], opts["amount"]
+        failures = []
+
+        # 1) Completed investments created concurrently; the target is reached
+        #    part-way through, so exactly one of them flips the project to funded
+        project = self._project(users[0], target=amount * (n - n // 4))
+        elapsed = self._parallel(
+            workers,
+            [
+                lambda i=i: Investment.objects.create(
+                    investor=users[i % len(users)], project_id=project.pk, amount=amount, status="completed"
+                )
+                for i in range(n)
+            ],
+        )
+        project.refresh_from_db()
+        failures += self._check(
+            "parallel investments",
+            project,
+            amount=amount * n,
+            investors=n,
+            status="funded",
+        )
+        self.stdout.write(f"  {n / elapsed:.0f} investments/s with {workers} workers")
+
+        # 2) Unit purchases: available units go down by exactly what was bought
+        project = self._project(users[0], target=amount * n * 10, total_units=n * 10)
+        self._parallel(
+            workers,
+            [
+                lambda i=i: Investment.objects.create(
+                    investor=users[i % len(users)],
+                    project_id=project.pk,
+                    amount=amount,
+                    units=3,
+                    investment_type="unit_purchase",
+                    status="completed",
+                )
+                for i in range(n)
+            ],
+        )
+        project.refresh_from_db()
+        failures += self._check(
+            "unit purchases", project, amount=amount * n, investors=n, status="active", units=n * 10 - 3 * n
+        )
+
+        # 3) The same pending investments completed by several requests at once
+        #    (e.g. a payment callback retried): each one counts once
+        project = self._project(users[0], target=amount * n * 10)
+        pending = Investment.objects.bulk_create(
+            [Investment(investor=users[i % len(users)], project=project, amount=amount) for i in range(n // 4)]
+        )
+        self._parallel(
+            workers,
+            [lambda pk=inv.pk: self._complete(pk) for inv in pending for _ in range(4)],
+        )
+        project.refresh_from_db()
+        failures += self._check(
+            "concurrent completion", project, amount=amount * len(pending), investors=len(pending), status="active"
+        )
+
+        if opts["compare_legacy"]:
+            project = self._project(users[0], target=amount * n * 10)
+            self._parallel(workers, [lambda: self._legacy_add(project.pk, amount) for _ in range(n)])
+            project.refresh_from_db()
+            lost = n - project.investors_count
+            self.stdout.write(
+                f"  legacy read-modify-write: {lost} of {n} updates lost "
+                f"(Rs.{amount * n - project.current_amount} missing)"
+            )
+
+        return failures
+
+    def _project(self, farmer, target, total_units=1000):
+        return InvestmentProject.objects.create(
+            title="Stress test project",
+            description="",
+            farmer=farmer,
+            status="active",
+            target_amount=target,
+            total_units=total_units,
+            available_units=total_units,
+        )
+
+    def _complete(self, pk):
+        investment = Investment.objects.get(pk=pk)
+        investment.status = "completed"
+        investment.save()
+
+    def _legacy_add(self, project_pk, amount):
+        # What Investment.save used to do
+        with transaction.atomic():
+            project = InvestmentProject.objects.get(pk=project_pk)
+            project.current_amount += amount
+            project.investors_count += 1
+            project.save()
+
+    def _parallel(self, workers, tasks):
+        """
+        Runs `tasks` on `workers` threads (one DB connection each), all
+        released at once. Returns the elapsed seconds.
+        """
+        start = threading.Event()
+        queue = list(reversed(tasks))
+        lock = threading.Lock()
+
+        def worker():
+            start.wait()
+            try:
+                while True:
+                    with lock:
+                        if not queue:
+                            return
+                        task = queue.pop()
+                    task()
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(worker) for _ in range(workers)]
+            t0 = time.perf_counter()
+            start.set()
+            for future in futures:
+                future.result()
+            return time.perf_counter() - t0
+
+    def _check(self, label, project, amount, investors, status, units=None):
+        expected = {"current_amount": amount, "investors_count": investors, "status": status}
+        if units is not None:
+            expected["available_units"] = units
+        if status == "funded":
+            expected["days_left"] = 0
+
+        wrong = [
+            f"{field} {getattr(project, field)} != {value}"
+            for field, value in expected.items()
+            if getattr(project, field) != value
+        ]
+        stats = ProjectFundingStats.objects.get(project=project)
+        if (stats.total_invested, stats.investments_count) != (amount, investors):
+            wrong.append(f"funding stats {stats.total_invested}/{stats.investments_count} != {amount}/{investors}")
+        self.stdout.write(f"{'ok  ' if not wrong else 'FAIL'} {label}: " + (", ".join(wrong) or "totals match"))
+        return [f"{label}: {', '.join(wrong)}"] if wrong else []
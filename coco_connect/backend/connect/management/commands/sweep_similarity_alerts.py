@@ -0,0 +1,39 @@
+# connect/management/commands/sweep_similarity_alerts.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from connect.services.similarity_alerts import get_threshold, sweep
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates SimilarityAlerts for new and edited ideas by scoring them against "
+        "the whole corpus in batches. Run it from cron, or keep it running with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=64, help="Ideas per matrix product")
+        parser.add_argument("--threshold", type=float, default=None, help="Default: IDEA_ALERT_THRESHOLD")
+        parser.add_argument("--max-per-idea", type=int, default=20)
+        parser.add_argument("--loop", action="store_true", help="Keep sweeping every --interval seconds")
+        parser.add_argument("--interval", type=float, default=30)
+
+    def handle(self, *args, **opts):
+        threshold = get_threshold() if opts["threshold"] is None else opts["threshold"]
+
+        while True:
+            t0 = time.perf_counter()
+            stats = sweep(opts["batch_size"], threshold, opts["max_per_idea"])
+            seconds = time.perf_counter() - t0
+
+            if stats["ideas"] or not opts["loop"]:
+                self.stdout.write(
+                    f"Swept {stats['ideas']} ideas in {seconds:.2f}s: "
+                    f"{stats['pairs']} similar pairs >= {threshold}, "
+                    f"{stats['alerts_removed']} outdated alerts removed"
+                )
+
+            if not opts["loop"]:
+                return
+            time.sleep(opts["interval"])
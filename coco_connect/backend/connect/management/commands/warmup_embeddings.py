@@ -0,0 +1,23 @@
+# connect/management/commands/warmup_embeddings.py
+from django.core.management.base import BaseCommand
+
+from connect.services.embeddings import warm_up
+
+
+class Command(BaseCommand):
+    help = "Loads the idea embedding model, runs a dummy encode and reports the timings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-encode",
+            action="store_true",
+            help="Only load the weights (what IDEA_EMBEDDING_WARMUP=preload does).",
+        )
+
+    def handle(self, *args, **opts):
+        timings = warm_up(encode=not opts["no_encode"])
+
+        self.stdout.write(f"model:        {timings['model']}")
+        self.stdout.write(f"load:         {timings['load_ms']:.0f} ms")
+        if "encode_ms" in timings:
+            self.stdout.write(f"first encode: {timings['encode_ms']:.0f} ms")
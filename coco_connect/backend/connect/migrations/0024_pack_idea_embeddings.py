@@ -0,0 +1,82 @@
+import connect.fields
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def pack_embeddings(apps, schema_editor):
+    """
+    Copies the JSON embedding lists into the packed binary column.
+    """
+    for model_name in ("Idea", "IdeaLegacy"):
+        model = apps.get_model("connect", model_name)
+        qs = model.objects.exclude(embedding=None).only("id", "embedding")
+
+        batch = []
+        for row in qs.iterator(chunk_size=BATCH_SIZE):
+            if not row.embedding:
+                continue
+            row.embedding_packed = row.embedding
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ["embedding_packed"])
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, ["embedding_packed"])
+
+
+def unpack_embeddings(apps, schema_editor):
+    for model_name in ("Idea", "IdeaLegacy"):
+        model = apps.get_model("connect", model_name)
+        qs = model.objects.exclude(embedding_packed=None).only("id", "embedding_packed")
+
+        batch = []
+        for row in qs.iterator(chunk_size=BATCH_SIZE):
+            row.embedding = row.embedding_packed.astype(float).tolist()
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ["embedding"])
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, ["embedding"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("connect", "0023_projectdraft_total_units"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="idea",
+            name="embedding_packed",
+            field=connect.fields.EmbeddingField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="idealegacy",
+            name="embedding_packed",
+            field=connect.fields.EmbeddingField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_embeddings, unpack_embeddings),
+        migrations.RemoveField(
+            model_name="idea",
+            name="embedding",
+        ),
+        migrations.RemoveField(
+            model_name="idealegacy",
+            name="embedding",
+        ),
+        migrations.RenameField(
+            model_name="idea",
+            old_name="embedding_packed",
+            new_name="embedding",
+        ),
+        migrations.RenameField(
+            model_name="idealegacy",
+            old_name="embedding_packed",
+            new_name="embedding",
+        ),
+    ]
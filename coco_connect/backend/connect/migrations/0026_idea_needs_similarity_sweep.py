@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connect', '0025_embeddingcache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idea',
+            name='needs_similarity_sweep',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+    ]
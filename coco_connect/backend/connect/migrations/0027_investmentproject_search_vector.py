@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-17 20:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def fill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    from connect.services.project_search import project_document
+
+    InvestmentProject = apps.get_model("connect", "InvestmentProject")
+    InvestmentProject.objects.update(search_vector=project_document())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connect', '0026_idea_needs_similarity_sweep'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='investmentproject',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_search_gin'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
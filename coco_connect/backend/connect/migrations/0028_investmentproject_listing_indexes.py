@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-17 20:40
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connect', '0027_investmentproject_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['expected_roi', 'id'], name='project_active_roi_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['created_at', 'id'], name='project_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['investors_count', 'id'], name='project_active_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(django.db.models.expressions.CombinedExpression(models.F('target_amount'), '-', models.F('current_amount')), models.F('id'), condition=models.Q(('status', 'active')), name='project_active_gap_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(fields=['status', 'category', 'expected_roi'], name='project_status_cat_roi_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(fields=['status', 'location', 'expected_roi'], name='project_status_loc_roi_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investmentproject',
+            index=models.Index(fields=['status', 'created_at'], name='project_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0 on 2026-10-17 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def create_stats_rows(apps, schema_editor):
+    """
+    One row per existing project, seeded from its counters. Trending scores
+    and ranks come from `manage.py refresh_funding_stats`.
+    """
+    InvestmentProject = apps.get_model("connect", "InvestmentProject")
+    ProjectFundingStats = apps.get_model("connect", "ProjectFundingStats")
+
+    projects = InvestmentProject.objects.values_list("id", "current_amount", "investors_count", "target_amount")
+    batch = []
+    for pk, current, investors, target in projects.iterator(chunk_size=BATCH_SIZE):
+        batch.append(
+            ProjectFundingStats(
+                project_id=pk,
+                total_invested=current,
+                investments_count=investors,
+                progress=float(current / target) if target else 0.0,
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            ProjectFundingStats.objects.bulk_create(batch)
+            batch = []
+
+    if batch:
+        ProjectFundingStats.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connect', '0029_unitreservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectFundingStats',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='funding_stats', serialize=False, to='connect.investmentproject')),
+                ('total_invested', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('investments_count', models.PositiveIntegerField(default=0)),
+                ('last_investment_at', models.DateTimeField(blank=True, null=True)),
+                ('progress', models.FloatField(default=0)),
+                ('trend_score', models.FloatField(default=-1000000000.0)),
+                ('trending_rank', models.PositiveIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Project funding stats',
+                'indexes': [models.Index(fields=['trend_score', 'project'], name='funding_stats_trend_idx'), models.Index(fields=['progress', 'project'], name='funding_stats_progress_idx')],
+            },
+        ),
+        migrations.RunPython(create_stats_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-17 23:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connect', '0031_imagethumbnails'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idea',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -1,8 +1,12 @@
 # connect/models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 from django.conf import settings
+
+from .fields import EmbeddingField
 # =================================================
 # NOTE ABOUT MERGE CLASH (IMPORTANT)
 # =================================================
@@ -33,7 +37,7 @@ class IdeaLegacy(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     # AI Embedding Vector (for similarity checking) — kept because it existed in this branch
-    embedding = models.JSONField(null=True, blank=True)
+    embedding = EmbeddingField(null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]  # newest first
@@ -218,8 +222,43 @@ class InvestmentProject(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # 🔍 Full-text search document (title, farmer, tags, location, description),
+    # rebuilt on every save (see services/project_search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="project_search_gin"),
+            # Listing sorts (services/project_listing.py) over the default
+            # status='active' listing: one partial index per sort key + id,
+            # so a page is a short (backward) index scan with a LIMIT
+            models.Index(
+                fields=["expected_roi", "id"],
+                name="project_active_roi_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                name="project_active_created_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                fields=["investors_count", "id"],
+                name="project_active_popular_idx",
+                condition=models.Q(status="active"),
+            ),
+            models.Index(
+                models.F("target_amount") - models.F("current_amount"),
+                models.F("id"),
+                name="project_active_gap_idx",
+                condition=models.Q(status="active"),
+            ),
+            # Selective filters for any status, ROI-ordered
+            models.Index(fields=["status", "category", "expected_roi"], name="project_status_cat_roi_idx"),
+            models.Index(fields=["status", "location", "expected_roi"], name="project_status_loc_roi_idx"),
+            models.Index(fields=["status", "created_at"], name="project_status_created_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -236,13 +275,49 @@ class InvestmentProject(models.Model):
 
     def funding_needed(self):
         return self.target_amount - self.current_amount
+
+    def add_funding(self, amount, units=None):
+        """
+        Adds one investment to the project's totals in a single UPDATE, so
+        concurrent investments can't overwrite each other's counts. An active
+        project that reaches its target becomes "funded" in the same statement.
+        With `units` (unit purchases without a reservation) it raises
+        UnitsUnavailable instead of taking more units than are left.
+
+        The counters on this instance are not refreshed.
+        """
+        reached = models.Q(status="active", target_amount__lte=models.F("current_amount") + amount)
+        changes = {
+            "current_amount": models.F("current_amount") + amount,
+            "investors_count": models.F("investors_count") + 1,
+            "status": models.Case(models.When(reached, then=models.Value("funded")), default=models.F("status")),
+            "days_left": models.Case(models.When(reached, then=models.Value(0)), default=models.F("days_left")),
+        }
+        projects = InvestmentProject.objects.filter(pk=self.pk)
+        if units:
+            # Never oversell: the UPDATE only matches while enough units are left
+            projects = projects.filter(available_units__gte=units)
+            changes["available_units"] = models.F("available_units") - units
+
+        if not projects.update(**changes) and units:
+            from .services.unit_reservations import UnitsUnavailable
+            raise UnitsUnavailable(f"Fewer than {units} units are available")
+
+        from .services import funding_stats
+        funding_stats.record_investment(self.pk, amount)
+
+        # update() skips post_save: invalidate what the signal receivers would
+        from .services import project_facets, response_cache
+        transaction.on_commit(project_facets.bump_version)
+        transaction.on_commit(lambda: response_cache.bump(InvestmentProject))
     
     def save(self, *args, **kwargs):
         # Auto-calculate unit price for equity projects
         if self.investment_type == 'equity' and self.total_units > 0:
             if not self.unit_price or self.unit_price == 0:
                 self.unit_price = self.target_amount / self.total_units
-            if self.available_units == 1000:  # Default value
+            # Default value on a new project; later on 1000 can be a real count
+            if self._state.adding and self.available_units == 1000:
                 self.available_units = self.total_units
             self.investment_structure = 'units'
         
@@ -252,6 +327,53 @@ class InvestmentProject(models.Model):
         
         super().save(*args, **kwargs)
 
+        # Rebuilt in SQL from the saved row (no-op outside PostgreSQL)
+        from .services.project_search import refresh_search_vectors
+        refresh_search_vectors(InvestmentProject.objects.filter(pk=self.pk))
+
+# ----------------------------
+# PROJECT FUNDING STATS (materialized from the investments)
+# ----------------------------
+class ProjectFundingStats(models.Model):
+    """
+    Per-project funding aggregates, updated whenever an investment is counted
+    on the project (services/funding_stats.py) and rebuilt from the investments by
+    `manage.py refresh_funding_stats`, which also refreshes trending_rank.
+    """
+
+    # trend_score of a project without investments (below any real score)
+    NO_TREND = -1e9
+
+    project = models.OneToOneField(
+        InvestmentProject,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="funding_stats",
+    )
+
+    total_invested = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    investments_count = models.PositiveIntegerField(default=0)
+    last_investment_at = models.DateTimeField(null=True, blank=True)
+
+    # project.current_amount / target_amount, as progress_percentage() / 100
+    progress = models.FloatField(default=0)
+    # log of the amounts invested, each decayed by its age (see funding_stats)
+    trend_score = models.FloatField(default=NO_TREND)
+    trending_rank = models.PositiveIntegerField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Project funding stats"
+        indexes = [
+            models.Index(fields=["trend_score", "project"], name="funding_stats_trend_idx"),
+            models.Index(fields=["progress", "project"], name="funding_stats_progress_idx"),
+        ]
+
+    def __str__(self):
+        return f"Funding stats of project {self.project_id}"
+
+
 # ----------------------------
 # INVESTMENT (FINAL – KEEP THIS ONE)
 # ----------------------------
@@ -323,6 +445,15 @@ class Investment(models.Model):
 
     transaction_id = models.CharField(max_length=100, blank=True, default="")
 
+    # Unit purchases made through a reservation: its units are already taken
+    reservation = models.OneToOneField(
+        "UnitReservation",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="investment",
+    )
+
     status = models.CharField(
         max_length=20,
         choices=STATUS_CHOICES,
@@ -341,42 +472,90 @@ class Investment(models.Model):
 
     def save(self, *args, **kwargs):
         is_new = self.pk is None
-        old_status = None
 
-        if not is_new:
-            old_status = (
-                Investment.objects.filter(pk=self.pk)
-                .values_list("status", flat=True)
-                .first()
-            )
+        if self.status == "completed" and not self.completed_at:
+            self.completed_at = timezone.now()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "completed_at" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "completed_at"]
+
+        with transaction.atomic():
+            if is_new:
+                became_completed = self.status == "completed"
+            elif self.status == "completed":
+                # Claims the transition: only one of several concurrent saves
+                # completing the same investment finds it not completed yet
+                became_completed = bool(
+                    Investment.objects.filter(pk=self.pk)
+                    .exclude(status="completed")
+                    .update(status="completed")
+                )
+            else:
+                became_completed = False
+
+            super().save(*args, **kwargs)
+
+            if became_completed:
+                reserved = self.reservation_id is not None
+                units = self.units if self.investment_type == "unit_purchase" and not reserved else None
+                # pk-only instance: the UPDATE doesn't need the project loaded
+                InvestmentProject(pk=self.project_id).add_funding(self.amount, units)
 
-        super().save(*args, **kwargs)
 
-        became_completed = (
-            (is_new and self.status == "completed")
-            or (old_status != "completed" and self.status == "completed")
-        )
+# ----------------------------
+# UNIT RESERVATIONS (held-units ledger)
+# ----------------------------
+class UnitReservation(models.Model):
+    """
+    Units of a unit-based project held for an investor until the purchase is
+    confirmed, released, or the hold expires. Held units are already taken
+    out of the project's available_units; released/expired ones go back.
+    """
 
-        if became_completed:
-            project = self.project
+    STATUS_CHOICES = [
+        ("held", "Held"),
+        ("confirmed", "Confirmed"),
+        ("released", "Released"),
+        ("expired", "Expired"),
+    ]
 
-            # Update funding
-            project.current_amount += self.amount
-            project.investors_count += 1
+    project = models.ForeignKey(
+        InvestmentProject,
+        on_delete=models.CASCADE,
+        related_name="unit_reservations",
+    )
+    investor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="unit_reservations",
+    )
+
+    units = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="held")
 
-            # Update units if unit-based
-            if self.units and self.investment_type == "unit_purchase":
-                project.available_units -= self.units
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
-            if not self.completed_at:
-                self.completed_at = timezone.now()
-                super().save(update_fields=["completed_at"])
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # The expiry sweep only looks at live holds
+            models.Index(
+                fields=["expires_at"],
+                name="reservation_held_expiry_idx",
+                condition=models.Q(status="held"),
+            ),
+            models.Index(fields=["project", "status"], name="reservation_project_status_idx"),
+        ]
 
-            if project.current_amount >= project.target_amount:
-                project.status = "funded"
-                project.days_left = 0
+    def __str__(self):
+        return f"{self.investor.username} → {self.project.title} → {self.units} units ({self.status})"
 
-            project.save()
+    @property
+    def amount(self):
+        return self.units * self.unit_price
 
 
 # ----------------------------
@@ -399,8 +578,14 @@ class Idea(models.Model):
     document = models.FileField(upload_to="ideas/", null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    # ✅ AI Embedding Vector (used for similarity)
-    embedding = models.JSONField(null=True, blank=True)
+    # ✅ AI Embedding Vector (used for similarity), packed float bytes
+    embedding = EmbeddingField(null=True, blank=True)
+
+    # New/edited ideas wait here for the similarity alert sweeper
+    needs_similarity_sweep = models.BooleanField(default=True, db_index=True)
+
+    # Other processes' similarity indexes catch up from here (services/embedding_index.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["-created_at"]
@@ -409,17 +594,25 @@ class Idea(models.Model):
         return self.title
 
     def build_text_for_embedding(self):
-        return f"{self.title}\n{self.short_description}\n{self.full_description}".strip()
+        # Same text as IdeaViewSet.build_text so both paths share cached embeddings
+        from .services.embeddings import build_idea_text
+        return build_idea_text(self.title, self.short_description, self.full_description)
 
     def save(self, *args, **kwargs):
         """
         Auto-generate embedding if missing.
         Keeps similarity system stable.
         """
-        if not self.embedding:
+        if self.embedding is None or len(self.embedding) == 0:
             from .services.embeddings import get_embedding
             self.embedding = get_embedding(self.build_text_for_embedding())
 
+        # (Re)check this idea against the corpus in the background
+        self.needs_similarity_sweep = True
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "needs_similarity_sweep", "updated_at"}
+
         super().save(*args, **kwargs)
 
 
@@ -463,6 +656,55 @@ class SimilarityAlert(models.Model):
         )
 
 
+# ----------------------------
+# EMBEDDING CACHE (content hash -> vector)
+# ----------------------------
+class EmbeddingCache(models.Model):
+    # sha256 of model name + normalized idea text (services.embedding_cache)
+    key = models.CharField(max_length=64, unique=True)
+    model_name = models.CharField(max_length=100)
+    embedding = EmbeddingField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.model_name} | {self.key[:12]}"
+
+
+# ----------------------------
+# IMAGE THUMBNAILS (uploaded image -> sized derivatives)
+# ----------------------------
+class ImageThumbnails(models.Model):
+    """
+    The derivatives of one uploaded image (services/thumbnails.py). Files live
+    under MEDIA_ROOT/<IMAGE_THUMBNAIL_DIR>/ keyed by the image's content hash,
+    so identical uploads share them.
+    """
+
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("ready", "Ready"),
+        ("failed", "Failed"),
+    )
+
+    # Storage name of the original ("products/x.jpg")
+    source = models.CharField(max_length=255, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    # sha256 of the original's bytes
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # Comma separated widths rendered in every format ("160,320,640")
+    widths = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Image thumbnails"
+
+    def __str__(self):
+        return f"{self.source} ({self.status})"
+
+
 #---------------------------------
 #   Auth Log
 #---------------------------------
@@ -1,8 +1,12 @@
 # connect/serializers.py
 from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.fields import SkipField
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .models import ProjectDraftMaterial
+from .services import thumbnails
 
 
 # Keep everything from both branches
@@ -37,7 +41,8 @@ class IdeaSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Idea
-        fields = "__all__"
+        # needs_similarity_sweep is the alert sweeper's bookkeeping, not API data
+        exclude = ["needs_similarity_sweep"]
         # embedding is read-only (backend handles it)
         read_only_fields = [
             "author",
@@ -101,12 +106,81 @@ class SimilarityAlertSerializer(serializers.ModelSerializer):
         ]
 
 
+# ==================================================
+# values() PAYLOAD HELPERS
+# ==================================================
+def format_datetime(value, tz):
+    """
+    A datetime as DRF's DateTimeField renders it (in `tz`, "Z" for UTC), for
+    payloads built from values() rows instead of serializers.
+    """
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+# ==================================================
+# IMAGE THUMBNAILS (srcset)
+# ==================================================
+class ImageSrcsetField(serializers.Field):
+    """
+    The srcset per format of an image field's thumbnails ({"webp": ..., "jpeg": ...}),
+    or None until they're rendered. Pass the image field as `source`.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        kwargs.setdefault("allow_null", True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        prefetched = self.context.get("image_srcsets")
+        if prefetched is not None:
+            return prefetched.get(value.name)
+        return thumbnails.srcset(value.name)
+
+
+class ThumbnailListSerializer(serializers.ListSerializer):
+    """
+    Looks up the srcsets of a whole list in one query instead of one per item
+    (use as Meta.list_serializer_class next to ImageSrcsetField).
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+
+        sources = []
+        for field in self.child.fields.values():
+            if not isinstance(field, ImageSrcsetField):
+                continue
+            for item in items:
+                try:
+                    image = field.get_attribute(item)
+                except SkipField:
+                    continue
+                if image:
+                    sources.append(image.name)
+        self.context["image_srcsets"] = thumbnails.lookup(sources)
+
+        return super().to_representation(items)
+
+
 # ==================================================
 # NEWS SERIALIZER
 # ==================================================
 class NewsSerializer(serializers.ModelSerializer):
+    image_srcset = ImageSrcsetField(source="image")
+
     class Meta:
         model = News
+        list_serializer_class = ThumbnailListSerializer
         fields = [
             "id",
             "title",
@@ -114,6 +188,7 @@ class NewsSerializer(serializers.ModelSerializer):
             "date",
             "status",
             "image",
+            "image_srcset",
             "likes",
             "created_at",
             "updated_at",
@@ -0,0 +1,35 @@
+# connect/services/cache_versions.py
+
+import uuid
+
+from django.core.cache import cache
+
+# Version stamps for cached data: entries are keyed on the stamp they were
+# built from, and a bump replaces the stamp so they become unreachable
+# everywhere (they then expire on their own). Stamps are random rather than
+# counters: one the cache evicted and recreated never brings back entries
+# cached under an older one.
+
+
+def new_stamp():
+    return uuid.uuid4().hex
+
+
+def bump(*keys):
+    cache.set_many({key: new_stamp() for key in keys}, None)
+
+
+def get_versions(keys):
+    """
+    {key: stamp} for the version keys; missing ones get a fresh stamp.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_stamp(), None)
+            versions[key] = cache.get(key)
+    return versions
+
+
+def get_version(key):
+    return get_versions([key])[key]
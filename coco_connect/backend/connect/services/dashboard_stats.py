@@ -0,0 +1,129 @@
+# connect/services/dashboard_stats.py
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from . import cache_versions
+
+# Each dashboard has a version stamp (see cache_versions), bumped when a model it counts changes
+# (see model_changed); cached numbers carry the stamp they were built from.
+# The short TTL bounds staleness for other processes with a local cache.
+VERSION_KEY = "connect:dashboard_stats:version:{name}"
+STATS_KEY = "connect:dashboard_stats:{name}:v{version}:{variant}"
+
+# model label -> the dashboards that count it
+DASHBOARDS = {
+    "connect.investmentproject": ("platform",),
+    "connect.investment": ("platform",),
+    "auth.user": ("platform",),
+    "connect.authlog": ("auth_logs",),
+}
+
+
+def get_timeout():
+    return getattr(settings, "DASHBOARD_STATS_CACHE_TIMEOUT", 30)
+
+
+def bump(name):
+    cache_versions.bump(VERSION_KEY.format(name=name))
+
+
+def build_platform_stats():
+    """
+    The platform totals in one query: an aggregate per table, cross-joined.
+    """
+    from django.contrib.auth.models import User
+    from connect.models import Investment, InvestmentProject
+
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT p.total, p.active, i.total, i.invested, u.total
+            FROM (
+                SELECT COUNT(*) AS total, COUNT(CASE WHEN status = %s THEN 1 END) AS active
+                FROM {qn(InvestmentProject._meta.db_table)}
+            ) p
+            CROSS JOIN (
+                SELECT COUNT(*) AS total, SUM(CASE WHEN status = %s THEN amount END) AS invested
+                FROM {qn(Investment._meta.db_table)}
+            ) i
+            CROSS JOIN (SELECT COUNT(*) AS total FROM {qn(User._meta.db_table)}) u
+            """,
+            ["active", "completed"],
+        )
+        total_projects, active_projects, total_investments, invested, total_users = cursor.fetchone()
+
+    return {
+        "total_projects": total_projects,
+        "active_projects": active_projects,
+        "total_investments": total_investments,
+        "total_invested_amount": float(invested or 0),
+        "total_users": total_users,
+    }
+
+
+def build_auth_log_stats(days):
+    """
+    Login/logout counts of the last `days` days in one conditional aggregate.
+    """
+    from connect.models import AuthLog
+
+    start = timezone.now() - timezone.timedelta(days=days)
+    counts = AuthLog.objects.filter(created_at__gte=start).aggregate(
+        total=Count("id"),
+        login_success=Count("id", filter=Q(action="LOGIN", status="SUCCESS")),
+        login_failed=Count("id", filter=Q(action="LOGIN", status="FAILED")),
+        logout_success=Count("id", filter=Q(action="LOGOUT", status="SUCCESS")),
+    )
+    return {"days": days, **counts}
+
+
+def _cached(name, variant, build):
+    """
+    Returns (data, timings): the cached dashboard, built on a miss. The
+    timings (ms) split the cache lookup, query and cache store.
+    """
+    timings = {}
+    t0 = time.perf_counter()
+    version = cache_versions.get_version(VERSION_KEY.format(name=name))
+    key = STATS_KEY.format(name=name, version=version, variant=variant)
+    data = cache.get(key)
+    t1 = time.perf_counter()
+    timings["cache_get_ms"] = round((t1 - t0) * 1000, 3)
+    timings["cached"] = data is not None
+
+    if data is None:
+        data = build()
+        t2 = time.perf_counter()
+        cache.set(key, data, get_timeout())
+        timings["query_ms"] = round((t2 - t1) * 1000, 3)
+        timings["cache_set_ms"] = round((time.perf_counter() - t2) * 1000, 3)
+
+    timings["total_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    return data, timings
+
+
+def get_platform_stats():
+    return _cached("platform", "all", build_platform_stats)
+
+
+def get_auth_log_stats(days):
+    return _cached("auth_logs", days, lambda: build_auth_log_stats(days))
+
+
+# -------------------------------------------------
+# Signal receiver (wired up in ConnectConfig.ready())
+# -------------------------------------------------
+def model_changed(sender, signal=None, created=False, **kwargs):
+    # Only the number of users is shown: logins and profile edits don't count
+    if sender._meta.label_lower == "auth.user" and signal is post_save and not created:
+        return
+    for name in DASHBOARDS.get(sender._meta.label_lower, ()):
+        transaction.on_commit(lambda name=name: bump(name))
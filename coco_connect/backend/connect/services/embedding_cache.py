@@ -0,0 +1,106 @@
+# connect/services/embedding_cache.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+
+def normalize_text(text):
+    """
+    Collapses whitespace so cosmetic edits map to the same cache entry.
+    """
+    return " ".join((text or "").split())
+
+
+def cache_key(text, model_name):
+    raw = f"{model_name}\0{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU map (key -> float32 vector).
+    """
+
+    def __init__(self, maxsize=2048):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_memory = None
+
+
+def get_memory_cache():
+    global _memory
+    if _memory is None:
+        _memory = LRUCache(getattr(settings, "IDEA_EMBEDDING_CACHE_SIZE", 2048))
+    return _memory
+
+
+def _db_enabled():
+    return getattr(settings, "IDEA_EMBEDDING_DB_CACHE", True)
+
+
+def get_cached(key):
+    """
+    Memory tier first, then the DB tier (which refills memory).
+    """
+    memory = get_memory_cache()
+    vector = memory.get(key)
+    if vector is not None:
+        return vector
+
+    if not _db_enabled():
+        return None
+
+    from connect.models import EmbeddingCache
+
+    vector = EmbeddingCache.objects.filter(key=key).values_list("embedding", flat=True).first()
+    if vector is not None:
+        vector = np.asarray(vector, dtype=np.float32)
+        memory.set(key, vector)
+    return vector
+
+
+def set_cached(key, model_name, vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    get_memory_cache().set(key, vector)
+
+    if not _db_enabled():
+        return
+
+    from connect.models import EmbeddingCache
+
+    # ignore_conflicts: a concurrent request may have stored the same text
+    # first, and an IntegrityError would break the caller's transaction.
+    EmbeddingCache.objects.bulk_create(
+        [EmbeddingCache(key=key, model_name=model_name, embedding=vector)],
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,417 @@
+# connect/services/embedding_index.py
+
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+
+from .similarity import ExactSearch, get_search_backend
+
+# Catching up also re-reads ideas saved this long before the last change seen,
+# in case their transaction committed after a later one
+CATCH_UP_OVERLAP = timedelta(seconds=5)
+
+
+class EmbeddingIndex:
+    """
+    In-memory matrix of idea embeddings.
+
+    All vectors live in one contiguous float32 matrix (one row per idea) with a
+    parallel id array, so a query is a single matrix-vector product instead of
+    a Python loop over rows. Rows are L2-normalized on insert, which makes the
+    dot product equal to cosine similarity.
+
+    Which rows get scored is decided by a search backend from
+    services.similarity (exact scan or IVF approximate search).
+    """
+
+    def __init__(self, dim=None, capacity=1024, backend=None):
+        self.dim = dim
+        self.backend = backend or ExactSearch()
+        self._capacity = capacity
+        self._size = 0
+        self._matrix = None
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._positions = {}  # idea id -> row
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, idea_id):
+        return idea_id in self._positions
+
+    @property
+    def matrix(self):
+        """View of the live rows (no copy)."""
+        if self._matrix is None:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return self._matrix[: self._size]
+
+    @property
+    def ids(self):
+        return self._ids[: self._size]
+
+    def _prepare(self, vector):
+        """
+        Returns a normalized float32 row, or None when the vector can't be
+        indexed (empty, zero, or a different dimension than the index).
+        """
+        if vector is None:
+            return None
+
+        v = np.asarray(vector, dtype=np.float32).ravel()
+        if v.size == 0:
+            return None
+
+        if self.dim is None:
+            self.dim = int(v.size)
+        elif v.size != self.dim:
+            return None
+
+        norm = np.linalg.norm(v)
+        if norm == 0.0:
+            return None
+
+        return v / norm
+
+    def _ensure_capacity(self, needed):
+        if self._matrix is None:
+            self._capacity = max(self._capacity, needed)
+            self._matrix = np.zeros((self._capacity, self.dim), dtype=np.float32)
+            self._ids = np.empty(self._capacity, dtype=np.int64)
+            return
+
+        if needed <= self._capacity:
+            return
+
+        # Grow geometrically so appends stay amortized O(1)
+        new_capacity = max(needed, self._capacity * 2)
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        ids = np.empty(new_capacity, dtype=np.int64)
+        ids[: self._size] = self._ids[: self._size]
+
+        self._matrix = matrix
+        self._ids = ids
+        self._capacity = new_capacity
+
+    def build(self, rows):
+        """
+        Replaces the index contents from an iterable of (idea_id, vector).
+        """
+        with self._lock:
+            self._size = 0
+            self._positions = {}
+            self._matrix = None
+            self.dim = None
+            self.backend.reset()
+
+            for idea_id, vector in rows:
+                self.upsert(idea_id, vector)
+
+    def load(self, ids, matrix):
+        """
+        Bulk replacement from an id array and an (n, dim) matrix.
+        Much faster than build() for large corpora; rows must be non-zero.
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+
+        with self._lock:
+            n, self.dim = matrix.shape
+            self._capacity = max(n, 1)
+            self._matrix = np.empty((self._capacity, self.dim), dtype=np.float32)
+            np.divide(matrix, norms, out=self._matrix[:n])
+            self._ids = np.asarray(ids, dtype=np.int64).copy()
+            self._size = n
+            self._positions = {int(i): pos for pos, i in enumerate(self._ids)}
+            self.backend.reset()
+
+    def train(self):
+        """
+        Trains the search backend on the current rows when it asks for it
+        (IVF clustering). Slow on big corpora: call it before the index is
+        shared, never on a lookup.
+        """
+        with self._lock:
+            if self.backend.needs_training(self._size):
+                self.backend.train(self.matrix)
+
+    def upsert(self, idea_id, vector):
+        """
+        Adds or replaces one idea. Unusable vectors remove the idea instead,
+        so an edited idea never keeps a stale row.
+        """
+        with self._lock:
+            v = self._prepare(vector)
+            if v is None:
+                self.remove(idea_id)
+                return False
+
+            pos = self._positions.get(idea_id)
+            if pos is None:
+                self._ensure_capacity(self._size + 1)
+                pos = self._size
+                self._size += 1
+                self._ids[pos] = idea_id
+                self._positions[idea_id] = pos
+
+            self._matrix[pos] = v
+            self.backend.add(pos, v)
+            return True
+
+    def remove(self, idea_id):
+        """
+        Removes one idea by moving the last row into its slot.
+        """
+        with self._lock:
+            pos = self._positions.pop(idea_id, None)
+            if pos is None:
+                return False
+
+            self.backend.remove(pos)
+
+            last = self._size - 1
+            if pos != last:
+                moved_id = int(self._ids[last])
+                self._matrix[pos] = self._matrix[last]
+                self._ids[pos] = moved_id
+                self._positions[moved_id] = pos
+                self.backend.move(last, pos)
+
+            self._size = last
+            return True
+
+    def search(self, query, k=5, exclude_id=None):
+        """
+        Returns up to k (idea_id, score) pairs, best first.
+        Scores are cosine similarities clamped to [0, 1].
+        """
+        with self._lock:
+            q = self._prepare(query) if self.dim is not None else None
+            if q is None or self._size == 0 or k <= 0:
+                return []
+
+            exclude_pos = self._positions.get(exclude_id) if exclude_id else None
+            rows, scores = self.backend.search(self.matrix, q, k, exclude_pos)
+
+            return [
+                (int(self._ids[row]), float(np.clip(score, 0.0, 1.0)))
+                for row, score in zip(rows, scores)
+                if row != exclude_pos
+            ]
+
+    def vectors(self, idea_ids):
+        """
+        Returns (ids, rows) for the given ideas that are in the index,
+        rows being copies of their normalized vectors.
+        """
+        with self._lock:
+            found = [i for i in idea_ids if i in self._positions]
+            positions = [self._positions[i] for i in found]
+            return np.asarray(found, dtype=np.int64), self.matrix[positions].copy()
+
+    def pairs_above(self, queries, threshold, chunk=65536):
+        """
+        Scores every query row against the whole corpus (exactly, one matrix
+        product per `chunk` corpus rows) and returns (query_rows, idea_ids,
+        scores) for all pairs with cosine similarity >= threshold.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        query_rows, idea_ids, scores = [], [], []
+
+        with self._lock:
+            matrix = self.matrix
+            for start in range(0, self._size, chunk):
+                block = queries @ matrix[start : start + chunk].T
+                rows, cols = np.nonzero(block >= threshold)
+                query_rows.append(rows)
+                idea_ids.append(self._ids[start + cols])
+                scores.append(block[rows, cols])
+
+        if not query_rows:
+            return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+        return np.concatenate(query_rows), np.concatenate(idea_ids), np.concatenate(scores)
+
+
+# -------------------------------------------------
+# Process-wide index for Idea.embedding
+# -------------------------------------------------
+# Each process keeps its own index. Saves/deletes made here are applied right
+# away (signal receivers below); changes made by other processes (web
+# workers, the sweeper, reembed_ideas) are picked up from the database: the
+# newest Idea.updated_at and the number of embedded ideas tell whether
+# anything changed, and only the changed rows are re-read.
+_index = None
+_index_state = None  # {"latest", "count"} the index was brought up to
+_index_ids = set()  # ids of the embedded ideas as of _index_state
+_checked_at = 0.0
+_index_lock = threading.Lock()
+# Held by the background rebuild while it runs (at most one at a time)
+_rebuild_lock = threading.Lock()
+
+
+def get_refresh_interval():
+    return getattr(settings, "IDEA_INDEX_REFRESH_SECONDS", 2)
+
+
+def _db_state():
+    from connect.models import Idea
+
+    return Idea.objects.aggregate(
+        latest=Max("updated_at"),
+        count=Count("id", filter=Q(embedding__isnull=False)),
+    )
+
+
+def _build_index():
+    """
+    Loads a new, trained index from the DB. Returns (index, ids, state).
+    """
+    from connect.models import Idea
+
+    state = _db_state()
+    ids = set()
+
+    def rows():
+        for idea_id, embedding in Idea.objects.exclude(embedding=None).values_list("id", "embedding").iterator(
+            chunk_size=2000
+        ):
+            ids.add(idea_id)
+            yield idea_id, embedding
+
+    index = EmbeddingIndex(backend=get_search_backend())
+    index.build(rows())
+    index.train()
+    return index, ids, state
+
+
+def _load_index():
+    global _index, _index_state, _index_ids
+    _index, _index_ids, _index_state = _build_index()
+
+
+def _rebuild_in_background():
+    """
+    Retrains the search backend of a grown corpus (see IVFSearch) by building
+    a fresh index in a thread and swapping it in; lookups keep using the
+    current one meanwhile and the swap is followed by a catch-up.
+    """
+    if not _rebuild_lock.acquire(blocking=False):
+        return
+
+    def run():
+        global _index, _index_state, _index_ids, _checked_at
+        try:
+            index, ids, state = _build_index()
+            with _index_lock:
+                _index, _index_ids, _index_state = index, ids, state
+                _checked_at = 0.0
+        finally:
+            connection.close()
+            _rebuild_lock.release()
+
+    try:
+        threading.Thread(target=run, name="embedding-index-rebuild", daemon=True).start()
+    except Exception:
+        _rebuild_lock.release()
+        raise
+
+
+def _apply(rows):
+    for idea_id, embedding in rows:
+        _index.upsert(idea_id, embedding)
+        if embedding is None:
+            _index_ids.discard(idea_id)
+        else:
+            _index_ids.add(idea_id)
+
+
+def _catch_up(state):
+    """
+    Brings the index from _index_state to `state` by re-reading the ideas
+    saved since, plus (when the count says some are missing) an id scan for
+    deleted and late-committed ones. Returns False when vectors changed
+    dimension (a new model): the index then has to be rebuilt.
+    """
+    from connect.models import Idea
+
+    global _index_state, _index_ids
+
+    changed = Idea.objects.all()
+    if _index_state["latest"] is not None:
+        changed = changed.filter(updated_at__gte=_index_state["latest"] - CATCH_UP_OVERLAP)
+    rows = list(changed.values_list("id", "embedding").iterator(chunk_size=2000))
+    if _index.dim is not None and any(e is not None and e.size and e.size != _index.dim for _, e in rows):
+        return False
+    _apply(rows)
+
+    if len(_index_ids) != state["count"]:
+        ids = set(Idea.objects.exclude(embedding=None).values_list("id", flat=True).iterator(chunk_size=10000))
+        for idea_id in _index_ids - ids:
+            _index.remove(idea_id)
+        _index_ids &= ids
+        missing = list(ids - _index_ids)
+        for start in range(0, len(missing), 2000):
+            _apply(Idea.objects.filter(id__in=missing[start : start + 2000]).values_list("id", "embedding"))
+
+    _index_state = state
+    return True
+
+
+def get_index():
+    """
+    Returns the idea embedding index, loading it from the DB on first use.
+    At most every IDEA_INDEX_REFRESH_SECONDS it checks whether other processes
+    changed ideas and applies just those changes.
+    """
+    global _checked_at
+
+    if _index is not None and time.monotonic() - _checked_at < get_refresh_interval():
+        return _index
+
+    with _index_lock:
+        if _index is None or time.monotonic() - _checked_at >= get_refresh_interval():
+            state = _db_state()
+            if _index is None or (state != _index_state and not _catch_up(state)):
+                _load_index()
+            elif _index.backend.needs_training(len(_index)):
+                _rebuild_in_background()
+            _checked_at = time.monotonic()
+        return _index
+
+
+def reset_index():
+    global _index, _index_state, _index_ids
+    with _index_lock:
+        _index, _index_state, _index_ids = None, None, set()
+
+
+# -------------------------------------------------
+# Signal receivers (wired up in ConnectConfig.ready)
+# -------------------------------------------------
+def idea_saved(sender, instance, **kwargs):
+    idea_id, embedding = instance.pk, instance.embedding
+
+    def apply():
+        # Only this process's copy; others catch up from the DB (get_index)
+        if _index is not None:
+            _index.upsert(idea_id, embedding)
+
+    # Only touch the index once the row is really in the DB
+    transaction.on_commit(apply)
+
+
+def idea_deleted(sender, instance, **kwargs):
+    idea_id = instance.pk
+
+    def apply():
+        if _index is not None:
+            _index.remove(idea_id)
+
+    transaction.on_commit(apply)
@@ -1,30 +1,405 @@
 # connect/services/embeddings.py
 
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from functools import lru_cache
+
 import numpy as np
+from django.apps import apps
+from django.conf import settings
+
+from connect.apps import POOL_WORKER_ENV
+
+from .embedding_cache import cache_key, get_cached, normalize_text, set_cached
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# CPU inference backends (settings.IDEA_EMBEDDING_BACKEND):
+#   "torch" -> full-precision PyTorch (original behaviour)
+#   "int8"  -> PyTorch with Linear layers dynamically quantized to int8
+#   "onnx"  -> ONNX Runtime (needs `optimum[onnxruntime]`); point
+#              IDEA_EMBEDDING_ONNX_FILE at e.g. "onnx/model_qint8_avx2.onnx"
+#              to use one of the pre-quantized exports
+EMBEDDING_BACKENDS = ("torch", "int8", "onnx")
+
+
+def get_backend_name():
+    return getattr(settings, "IDEA_EMBEDDING_BACKEND", "torch") or "torch"
+
+
+def model_id(backend=None):
+    """
+    Identifies which vectors a backend produces (part of the cache key).
+    Backends differ slightly numerically, so they don't share cache entries.
+    """
+    backend = backend or get_backend_name()
+    return MODEL_NAME if backend == "torch" else f"{MODEL_NAME}:{backend}"
+
+
+def load_model(backend="torch"):
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(MODEL_NAME)
+
+    if backend == "int8":
+        import torch
+
+        model = SentenceTransformer(MODEL_NAME, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    if backend == "onnx":
+        onnx_file = getattr(settings, "IDEA_EMBEDDING_ONNX_FILE", "")
+        model_kwargs = {"file_name": onnx_file} if onnx_file else None
+        return SentenceTransformer(MODEL_NAME, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
 
 @lru_cache(maxsize=1)
 def _get_model():
-    from sentence_transformers import SentenceTransformer
-    return SentenceTransformer("all-MiniLM-L6-v2")
+    return load_model(get_backend_name())
+
+
+def encode_texts(texts, model=None):
+    """
+    Encodes many texts in one model call.
+    Returns a float32 array of shape (len(texts), dim), rows L2-normalized.
+    """
+    model = model or _get_model()
+    return model.encode(
+        list(texts),
+        batch_size=max(1, len(texts)),
+        convert_to_numpy=True,
+        normalize_embeddings=True,  # IMPORTANT
+    ).astype(np.float32, copy=False)
+
+
+def warm_up(encode=True):
+    """
+    Loads the model and (optionally) runs one dummy encode so the first real
+    request doesn't pay for it. Returns timings in milliseconds.
+
+    encode=False only loads the weights: use it before forking workers
+    (gunicorn --preload), since torch thread pools started in the parent
+    don't survive fork().
+    """
+    t0 = time.perf_counter()
+    _get_model()
+    timings = {"model": model_id(), "load_ms": (time.perf_counter() - t0) * 1000}
+
+    if encode:
+        t0 = time.perf_counter()
+        encode_texts(["CocoConnect warm-up"])
+        timings["encode_ms"] = (time.perf_counter() - t0) * 1000
+
+    return timings
+
+
+# -------------------------------------------------
+# Worker processes + overload protection
+# -------------------------------------------------
+class EmbeddingOverloaded(Exception):
+    """
+    Too many embedding requests are already waiting (or the workers didn't
+    answer in time). Views turn this into a 503.
+    """
+
+
+def _init_pool_worker():
+    os.environ[POOL_WORKER_ENV] = "1"
+    if not apps.ready:
+        # Spawned workers start from a clean interpreter
+        import django
+
+        django.setup()
+    warm_up()
+
+
+class EmbeddingPool:
+    """
+    Runs encode_texts in dedicated processes so inference doesn't compete with
+    request handling for the web worker's GIL and CPU.
+
+    Workers are spawned so each gets its own model and torch threads, or
+    forked (start_method="fork") from a process that preloaded the weights
+    without encoding, to share them copy-on-write. The executor is recreated
+    per process and after a worker crash.
+    """
+
+    def __init__(self, workers=1, timeout=30, start_method="spawn"):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.start_method = start_method
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_pool_worker,
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def start(self, wait=False):
+        """
+        Spawns the workers now (each loads the model) instead of on first use.
+        """
+        futures = [self._get_executor().submit(os.getpid) for _ in range(self.workers)]
+        if wait:
+            for future in futures:
+                future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def submit(self, texts):
+        """
+        Queues one encode_texts call; returns a Future resolving to the array.
+        """
+        return self._get_executor().submit(encode_texts, list(texts))
+
+    def encode(self, texts):
+        for _ in range(2):
+            executor = self._get_executor()
+            try:
+                return executor.submit(encode_texts, list(texts)).result(timeout=self.timeout)
+            except FutureTimeoutError:
+                raise EmbeddingOverloaded(f"Embedding workers didn't answer within {self.timeout}s")
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory): retry once on a fresh pool
+                self._discard(executor)
+        raise EmbeddingOverloaded("Embedding workers crashed")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool_enabled():
+    return getattr(settings, "IDEA_EMBEDDING_WORKERS", 0) > 0
+
+
+def pool_start_method():
+    # "preload" loads the weights in the web process so forked workers share them
+    preload = getattr(settings, "IDEA_EMBEDDING_WARMUP", "") == "preload"
+    if preload and "fork" in multiprocessing.get_all_start_methods():
+        return "fork"
+    return "spawn"
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = EmbeddingPool(
+                    workers=getattr(settings, "IDEA_EMBEDDING_WORKERS", 1),
+                    timeout=getattr(settings, "IDEA_EMBEDDING_TIMEOUT", 30),
+                    start_method=pool_start_method(),
+                )
+    return _pool
+
+
+def run_encode(texts):
+    """
+    encode_texts in the worker pool when one is configured, else in-process.
+    """
+    if pool_enabled():
+        return get_pool().encode(texts)
+    return encode_texts(texts)
+
+
+_pending = None
+
+
+@contextmanager
+def pending_slot():
+    """
+    Bounds the embedding requests waiting in this process
+    (IDEA_EMBEDDING_MAX_PENDING): extra callers fail fast with
+    EmbeddingOverloaded instead of blocking more web threads.
+    """
+    global _pending
+    if _pending is None:
+        with _pool_lock:
+            if _pending is None:
+                _pending = threading.BoundedSemaphore(
+                    max(1, getattr(settings, "IDEA_EMBEDDING_MAX_PENDING", 64))
+                )
+
+    if not _pending.acquire(blocking=False):
+        raise EmbeddingOverloaded("Too many embedding requests in progress")
+    try:
+        yield
+    finally:
+        _pending.release()
+
+
+# -------------------------------------------------
+# Request coalescing
+# -------------------------------------------------
+class EmbeddingBatcher:
+    """
+    Collects texts from concurrent callers and encodes them as one batch.
+
+    The first queued text opens a window of `max_wait_ms`; everything that
+    arrives in that window (up to `max_batch_size` texts) is encoded with a
+    single model call and each caller gets its own row back.
+
+    `workers` consumer threads take turns collecting batches, so with a
+    worker pool a new batch is formed and encoded while earlier ones are
+    still running (one thread per pool process keeps all of them busy).
+    """
+
+    def __init__(self, encode=encode_texts, max_batch_size=32, max_wait_ms=5, workers=1):
+        self.encode = encode
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self.workers = max(1, workers)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._collect_lock = threading.Lock()
+        self._threads = []
+        self._pid = None
+
+    def _alive(self):
+        return self._pid == os.getpid() and all(thread.is_alive() for thread in self._threads)
+
+    def _ensure_worker(self):
+        # Threads don't survive fork(): restart the workers in each child process
+        if self._threads and self._alive():
+            return
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._collect_lock = threading.Lock()
+                self._threads = []
+                self._pid = os.getpid()
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            for _ in range(self.workers - len(self._threads)):
+                thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, text):
+        """
+        Queues one text and returns a Future resolving to its vector (ndarray).
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text, timeout=None):
+        return self.submit(text).result(timeout=timeout)
+
+    def _collect(self):
+        # One thread fills a batch at a time; the others are encoding
+        with self._collect_lock:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                vectors = self.encode([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = EmbeddingBatcher(
+                    encode=run_encode,
+                    max_batch_size=getattr(settings, "IDEA_EMBEDDING_BATCH_SIZE", 32),
+                    max_wait_ms=getattr(settings, "IDEA_EMBEDDING_MAX_WAIT_MS", 5),
+                    # One batch in flight per pool process; in-process, one at a time
+                    workers=get_pool().workers if pool_enabled() else 1,
+                )
+    return _batcher
+
+
+def build_idea_text(title, short_desc, full_desc):
+    # Combines both styles ("Title: …" and plain join) in a stable way
+    title = title or ""
+    short_desc = short_desc or ""
+    full_desc = full_desc or ""
+    return f"Title: {title}\nShort Description: {short_desc}\nFull Description: {full_desc}".strip()
 
 
 def get_embedding(text: str):
     """
     Returns a normalized embedding vector (list[float]).
     Safe for empty input and consistent for cosine similarity.
+    Texts seen before are served from the embedding cache.
+    Raises EmbeddingOverloaded when the embedding workers are saturated.
     """
 
-    if not text or not text.strip():
+    text = normalize_text(text)
+    if not text:
         return []
 
-    model = _get_model()
+    key = cache_key(text, model_id())
+    embedding = get_cached(key)
+    if embedding is not None:
+        return embedding.tolist()
 
-    # Generate embedding
-    embedding = model.encode(
-        text.strip(),
-        convert_to_numpy=True,
-        normalize_embeddings=True,  # IMPORTANT
-    )
+    # Generate embedding (coalesced with concurrent requests when enabled)
+    with pending_slot():
+        if getattr(settings, "IDEA_EMBEDDING_BATCHING", True):
+            embedding = get_batcher().embed(text)
+        else:
+            embedding = run_encode([text])[0]
 
+    set_cached(key, model_id(), embedding)
     return embedding.tolist()
@@ -0,0 +1,271 @@
+# connect/services/funding_stats.py
+
+import math
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Abs, Cast, Coalesce, Exp, Greatest, Least, Ln, NullIf
+from django.utils import timezone
+
+# "Trending" is the money invested with each amount halved every half-life.
+# It's stored as log(sum(amount * 2 ** ((t - EPOCH) / half_life))): relative
+# to EPOCH instead of now, so scores only change when money comes in (and can
+# be indexed), while their order equals the order of the decayed sums.
+EPOCH = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+
+# Investments are credited to their project when they complete
+# (Investment.save -> InvestmentProject.add_funding)
+COUNTED_STATUSES = ("completed",)
+
+# ?by= of the leaderboard -> stats ordering (the stats indexes match these)
+LEADERBOARDS = {
+    "trending": ("-trend_score", "-project_id"),
+    "closest_to_funded": ("-progress", "-project_id"),
+}
+
+
+def half_life_days():
+    return getattr(settings, "PROJECT_TRENDING_HALF_LIFE_DAYS", 7)
+
+
+def _half_lives(at):
+    return (at - EPOCH).total_seconds() / (half_life_days() * 86400)
+
+
+def log_weight(amount, at):
+    return math.log(float(amount)) + _half_lives(at) * math.log(2)
+
+
+def recent_funding(trend_score, now=None):
+    """
+    The decayed amount behind a trend_score at `now`: every investment counts
+    fully when made and half as much each half-life later.
+    """
+    from connect.models import ProjectFundingStats
+
+    if trend_score <= ProjectFundingStats.NO_TREND / 2:
+        return 0.0
+    return math.exp(trend_score - _half_lives(now or timezone.now()) * math.log(2))
+
+
+def leaderboard(by="trending", limit=10, now=None):
+    """
+    The top active projects by LEADERBOARDS[by], as JSON-ready dicts.
+    """
+    from connect.models import ProjectFundingStats
+
+    now = now or timezone.now()
+    stats = ProjectFundingStats.objects.filter(project__status="active")
+    if by == "trending":
+        stats = stats.filter(trend_score__gt=ProjectFundingStats.NO_TREND / 2)
+    elif by == "closest_to_funded":
+        # Fully funded projects (which can stay "active") have nothing left to close
+        stats = stats.filter(progress__lt=1)
+    rows = stats.order_by(*LEADERBOARDS[by]).values(
+        "project_id",
+        "project__title",
+        "project__location",
+        "project__category__name",
+        "project__target_amount",
+        "total_invested",
+        "investments_count",
+        "last_investment_at",
+        "progress",
+        "trend_score",
+    )[:limit]
+
+    return [
+        {
+            "rank": position,
+            "id": row["project_id"],
+            "title": row["project__title"],
+            "location": row["project__location"],
+            "category": row["project__category__name"] or "",
+            "target_amount": float(row["project__target_amount"]),
+            "total_invested": float(row["total_invested"]),
+            "investments_count": row["investments_count"],
+            "progress_percentage": round(row["progress"] * 100, 2),
+            "recent_funding": round(recent_funding(row["trend_score"], now), 2),
+            "last_investment_at": row["last_investment_at"],
+        }
+        for position, row in enumerate(rows, start=1)
+    ]
+
+
+def _log_add(score, weight):
+    # log(exp(score) + exp(weight)) without overflow; exp() is clamped so
+    # PostgreSQL doesn't raise an underflow for far-apart values
+    return Greatest(score, weight) + Ln(Value(1.0) + Exp(-Least(Abs(score - weight), Value(50.0))))
+
+
+def _progress(current, target):
+    return Coalesce(
+        Cast(current, FloatField()) / NullIf(Cast(target, FloatField()), Value(0.0)),
+        Value(0.0),
+    )
+
+
+def _project_progress():
+    # The stats row's project as stored: the same ratio as
+    # InvestmentProject.progress_percentage() (current_amount / target_amount)
+    from connect.models import InvestmentProject
+
+    project = InvestmentProject.objects.filter(pk=OuterRef("project_id"))
+    return Subquery(project.annotate(ratio=_progress(F("current_amount"), F("target_amount"))).values("ratio")[:1])
+
+
+def ensure_rows(project_ids):
+    from connect.models import ProjectFundingStats
+
+    ProjectFundingStats.objects.bulk_create(
+        [ProjectFundingStats(project_id=pk) for pk in project_ids],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def record_investment(project_id, amount, at=None):
+    """
+    Adds one investment to the project's stats in a single UPDATE (called by
+    InvestmentProject.add_funding, inside its transaction).
+    """
+    from connect.models import ProjectFundingStats
+
+    at = at or timezone.now()
+    changes = {
+        "total_invested": F("total_invested") + amount,
+        "investments_count": F("investments_count") + 1,
+        "last_investment_at": at,
+        # add_funding already updated the project row in this transaction
+        "progress": _project_progress(),
+        "updated_at": at,
+    }
+    if amount > 0:
+        changes["trend_score"] = _log_add(F("trend_score"), Value(log_weight(amount, at)))
+
+    rows = ProjectFundingStats.objects.filter(project_id=project_id)
+    if not rows.update(**changes):
+        # Projects inserted without save() (bulk_create) have no row yet
+        ensure_rows([project_id])
+        rows.update(**changes)
+
+
+def project_saved(sender, instance, created=False, **kwargs):
+    """
+    Every project gets a stats row; progress follows current/target_amount edits.
+    """
+    from connect.models import ProjectFundingStats
+
+    if created:
+        ensure_rows([instance.pk])
+    ProjectFundingStats.objects.filter(project_id=instance.pk).update(progress=_project_progress())
+
+
+def rebuild(sync_projects=False, batch_size=2000):
+    """
+    Recomputes every project's stats from its completed investments, fixing
+    any drift. With `sync_projects` the counters on InvestmentProject
+    (current_amount, investors_count) are reset to the same totals. Returns
+    projects updated.
+    """
+    from connect.models import Investment, InvestmentProject, ProjectFundingStats
+
+    with transaction.atomic():
+        projects = list(InvestmentProject.objects.values_list("id", "target_amount", "current_amount"))
+        targets = {pk: target for pk, target, _ in projects}
+        current = {pk: amount for pk, _, amount in projects}
+        ensure_rows(targets)
+
+        totals = {pk: [Decimal("0"), 0, None, []] for pk in targets}
+        investments = (
+            Investment.objects.filter(status__in=COUNTED_STATUSES)
+            .values_list("project_id", "amount", "created_at", "completed_at")
+            .iterator(chunk_size=batch_size)
+        )
+        for project_id, amount, created_at, completed_at in investments:
+            at = completed_at or created_at
+            row = totals[project_id]
+            row[0] += amount
+            row[1] += 1
+            row[2] = at if row[2] is None else max(row[2], at)
+            if amount > 0:
+                row[3].append(log_weight(amount, at))
+
+        stats = []
+        for pk, (total, count, last_at, weights) in totals.items():
+            top = max(weights, default=None)
+            funded = total if sync_projects else current[pk]
+            stats.append(
+                ProjectFundingStats(
+                    project_id=pk,
+                    total_invested=total,
+                    investments_count=count,
+                    last_investment_at=last_at,
+                    progress=float(funded / targets[pk]) if targets[pk] else 0.0,
+                    trend_score=(
+                        top + math.log(sum(math.exp(w - top) for w in weights))
+                        if weights
+                        else ProjectFundingStats.NO_TREND
+                    ),
+                )
+            )
+        ProjectFundingStats.objects.bulk_update(
+            stats,
+            ["total_invested", "investments_count", "last_investment_at", "progress", "trend_score"],
+            batch_size=batch_size,
+        )
+
+        if sync_projects:
+            drifted = [
+                InvestmentProject(pk=pk, current_amount=total, investors_count=count)
+                for pk, (total, count, _, _) in totals.items()
+            ]
+            InvestmentProject.objects.bulk_update(
+                drifted, ["current_amount", "investors_count"], batch_size=batch_size
+            )
+
+    from . import project_facets, response_cache
+    transaction.on_commit(project_facets.bump_version)
+    transaction.on_commit(lambda: response_cache.bump(InvestmentProject))
+    return len(stats)
+
+
+def refresh_ranks():
+    """
+    Stores each active project's position on the trending leaderboard
+    (others get NULL). Returns the number of ranked projects.
+    """
+    from connect.models import InvestmentProject, ProjectFundingStats
+
+    stats_table = ProjectFundingStats._meta.db_table
+    project_table = InvestmentProject._meta.db_table
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {stats_table} SET trending_rank = NULL
+            WHERE trending_rank IS NOT NULL
+            """
+        )
+        cursor.execute(
+            f"""
+            UPDATE {stats_table} SET trending_rank = ranked.position
+            FROM (
+                SELECT s.project_id,
+                       ROW_NUMBER() OVER (ORDER BY s.trend_score DESC, s.project_id DESC) AS position
+                FROM {stats_table} s
+                JOIN {project_table} p ON p.id = s.project_id
+                WHERE p.status = 'active' AND s.trend_score > %s
+            ) AS ranked
+            WHERE {stats_table}.project_id = ranked.project_id
+            """,
+            [ProjectFundingStats.NO_TREND / 2],
+        )
+        ranked = cursor.rowcount
+
+    from . import response_cache
+    transaction.on_commit(lambda: response_cache.bump(InvestmentProject))
+    return ranked
@@ -0,0 +1,98 @@
+# connect/services/pagination.py
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_limit(value, default=24, maximum=100):
+    try:
+        return max(1, min(int(value), maximum))
+    except (TypeError, ValueError):
+        return default
+
+
+def _output_field(queryset, name):
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    return queryset.model._meta.get_field(name)
+
+
+def _after(ordering, values):
+    """
+    WHERE clause for "rows after `values`" in `ordering`:
+    (a > x) OR (a = x AND b > y) OR ...
+    """
+    condition = Q()
+    equal = {}
+    for key, value in zip(ordering, values):
+        name = key.lstrip("-")
+        lookup = "lt" if key.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
+def keyset_queryset(queryset, ordering, cursor=None):
+    """
+    `queryset` ordered by `ordering`, starting after the row in `cursor`.
+    """
+    queryset = queryset.order_by(*ordering)
+    if not cursor:
+        return queryset
+
+    names = [key.lstrip("-") for key in ordering]
+    values = decode_cursor(cursor)
+    if len(values) != len(names):
+        raise InvalidCursor("Cursor doesn't match this sort order")
+    try:
+        values = [_output_field(queryset, n).to_python(v) for n, v in zip(names, values)]
+    except ValidationError:
+        raise InvalidCursor("Invalid cursor")
+    return queryset.filter(_after(ordering, values))
+
+
+def keyset_page(queryset, ordering, cursor=None, limit=24):
+    """
+    Returns (rows, next_cursor) for one page of `queryset`.
+
+    `ordering` lists fields or annotations ("-" = descending); the last one
+    must be unique (e.g. "-id") so every row has a stable position. Each page
+    is an indexed range scan, no matter how deep into the list it is.
+    next_cursor is None on the last page.
+    """
+    queryset = keyset_queryset(queryset, ordering, cursor)
+    names = [key.lstrip("-") for key in ordering]
+
+    rows = list(queryset[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, dict):  # values() querysets
+        return rows, encode_cursor([last[n] for n in names])
+    return rows, encode_cursor([getattr(last, n) for n in names])
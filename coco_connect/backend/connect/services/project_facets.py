@@ -0,0 +1,129 @@
+# connect/services/project_facets.py
+
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Floor
+
+from . import cache_versions
+
+# Bumped on every project/category save/delete; cached facets carry the
+# version stamp they were built from, so a bump invalidates them everywhere.
+FACETS_VERSION_KEY = "connect:project_facets:version"
+FACETS_KEY = "connect:project_facets:v{version}"
+
+
+def roi_bucket_width():
+    return getattr(settings, "PROJECT_ROI_BUCKET", 5)
+
+
+def _current_version():
+    return cache_versions.get_version(FACETS_VERSION_KEY)
+
+
+def bump_version():
+    cache_versions.bump(FACETS_VERSION_KEY)
+
+
+def _slug(name):
+    return name.lower().replace(" ", "-")
+
+
+def build_facets():
+    """
+    Computes the raw facet data with two queries: the categories, and one
+    GROUP BY over projects (status, category, location, risk, ROI bucket)
+    whose rows are small enough to cache and re-aggregate per request.
+    """
+    from connect.models import InvestmentCategory, InvestmentProject
+
+    width = roi_bucket_width()
+
+    categories = [
+        {"id": c["id"], "name": c["name"], "slug": _slug(c["name"]), "description": c["description"]}
+        for c in InvestmentCategory.objects.order_by("name").values("id", "name", "description")
+    ]
+
+    rows = (
+        InvestmentProject.objects.order_by()
+        .annotate(roi_bucket=Floor(F("expected_roi") / width))
+        .values("status", "category_id", "location", "risk_level", "roi_bucket")
+        .annotate(n=Count("id"))
+    )
+    groups = [
+        (
+            row["status"],
+            row["category_id"],
+            (row["location"] or "").strip(),
+            row["risk_level"],
+            int(row["roi_bucket"]),
+            row["n"],
+        )
+        for row in rows
+    ]
+
+    return {"categories": categories, "groups": groups, "roi_bucket": width}
+
+
+def get_raw_facets():
+    version = _current_version()
+    key = FACETS_KEY.format(version=version)
+
+    data = cache.get(key)
+    if data is None:
+        data = build_facets()
+        cache.set(key, data, getattr(settings, "PROJECT_FACETS_CACHE_TIMEOUT", 600))
+    return data
+
+
+def get_facets(status=None, counts=False):
+    """
+    Filter dropdown values for projects: categories, locations, risk levels
+    and an ROI histogram. Counts (projects per value, optionally only with
+    the given status) are included when `counts` is set; the histogram
+    always has them.
+    """
+    from connect.models import InvestmentProject
+
+    data = get_raw_facets()
+    groups = [g for g in data["groups"] if status is None or g[0] == status]
+
+    by_category, by_location, by_risk, by_bucket = Counter(), Counter(), Counter(), Counter()
+    for _, category_id, location, risk, bucket, n in groups:
+        by_category[category_id] += n
+        by_location[location] += n
+        by_risk[risk] += n
+        by_bucket[bucket] += n
+
+    # Locations come from every project, like the old distinct() query
+    locations = sorted({g[2] for g in data["groups"] if g[2]})
+    width = data["roi_bucket"]
+
+    facets = {
+        "categories": [dict(c) for c in data["categories"]],
+        "locations": locations,
+        "risk_levels": [{"value": value, "label": label} for value, label in InvestmentProject.RISK_CHOICES],
+        "roi_histogram": [
+            {"min": bucket * width, "max": (bucket + 1) * width, "count": by_bucket[bucket]}
+            for bucket in sorted(by_bucket)
+        ],
+    }
+
+    if counts:
+        for category in facets["categories"]:
+            category["count"] = by_category[category["id"]]
+        facets["locations"] = [{"name": name, "count": by_location[name]} for name in locations]
+        for risk in facets["risk_levels"]:
+            risk["count"] = by_risk[risk["value"]]
+
+    return facets
+
+
+# -------------------------------------------------
+# Signal receivers (wired up in ConnectConfig.ready)
+# -------------------------------------------------
+def facets_changed(sender, **kwargs):
+    transaction.on_commit(bump_version)
@@ -0,0 +1,125 @@
+# connect/services/project_listing.py
+
+import decimal
+
+from django.db import connection
+from django.db.models import DecimalField, ExpressionWrapper, F
+from django.db.models.functions import Round
+
+from .pagination import keyset_page, parse_limit
+from .project_search import search_projects
+
+# Every order ends on id so the (cursor) position of a project is unique.
+# The partial indexes on InvestmentProject (status='active') and the
+# ProjectFundingStats indexes (trending, closest_to_funded) match these.
+PROJECT_SORTS = {
+    "roi_desc": ("-expected_roi", "-id"),
+    "roi_asc": ("expected_roi", "id"),
+    "date_newest": ("-created_at", "-id"),
+    "date_oldest": ("created_at", "id"),
+    "popularity": ("-investors_count", "-id"),
+    "funding_needed": ("-funding_gap", "-id"),
+    "trending": ("-trend_score", "-id"),
+    "closest_to_funded": ("-funding_progress", "-id"),
+    "relevance": ("-search_rank", "-id"),  # only with ?search=
+}
+PROJECT_PAGE_SIZE = 24
+MAX_PROJECT_PAGE_SIZE = 100
+
+
+def funding_gap():
+    # Same expression as the project_active_gap_idx index
+    gap = F("target_amount") - F("current_amount")
+    if connection.vendor == "sqlite":
+        # SQLite subtracts in floating point (300000 - 71285.77 =
+        # 228714.22999...), which never equals the cursor value again
+        gap = Round(gap, 2)
+    return ExpressionWrapper(gap, output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+def filter_projects(params):
+    """
+    The project listing filters (get_projects query params).
+    """
+    from connect.models import InvestmentCategory, InvestmentProject
+
+    projects_qs = InvestmentProject.objects.select_related("category", "farmer").all()
+
+    category = params.get("category", "")
+    if category and category != "All Categories":
+        # Resolved to ids up front: filtering on category_id lets the
+        # (status, category, expected_roi) index drive the query instead of
+        # a join on the category name
+        category_ids = list(InvestmentCategory.objects.filter(name=category).values_list("id", flat=True))
+        projects_qs = projects_qs.filter(category_id__in=category_ids)
+
+    location = params.get("location", "")
+    if location and location != "All Locations":
+        projects_qs = projects_qs.filter(location=location)
+
+    min_roi = params.get("minROI", "0")
+    max_roi = params.get("maxROI", "50")
+    try:
+        projects_qs = projects_qs.filter(expected_roi__gte=decimal.Decimal(min_roi))
+        projects_qs = projects_qs.filter(expected_roi__lte=decimal.Decimal(max_roi))
+    except Exception:
+        pass
+
+    risk_level = params.get("riskLevel", "")
+    if risk_level:
+        projects_qs = projects_qs.filter(risk_level=risk_level)
+
+    investment_type = params.get("investmentType", "")
+    if investment_type and investment_type != "all":
+        projects_qs = projects_qs.filter(investment_type=investment_type)
+
+    # Full-text search (GIN index on search_vector), ranked for sortBy=relevance
+    search = params.get("search", "")
+    if search:
+        projects_qs = search_projects(projects_qs, search)
+
+    status_q = params.get("status", "")
+    if status_q:
+        projects_qs = projects_qs.filter(status=status_q)
+
+    return projects_qs
+
+
+def order_projects(queryset, sort_by, default_sort="date_newest"):
+    """
+    Returns (queryset, ordering) for a sortBy value; sorting runs in SQL.
+    """
+    ordering = PROJECT_SORTS.get(sort_by) or PROJECT_SORTS[default_sort]
+    if "-search_rank" in ordering and "search_rank" not in queryset.query.annotations:
+        ordering = PROJECT_SORTS[default_sort]
+
+    if "-funding_gap" in ordering:
+        # Named funding_gap so it doesn't shadow InvestmentProject.funding_needed()
+        queryset = queryset.annotate(funding_gap=funding_gap())
+
+    if "-trend_score" in ordering or "-funding_progress" in ordering:
+        # Every project has a stats row; the inner join (isnull=False) lets the
+        # stats index drive the sort
+        queryset = queryset.filter(funding_stats__isnull=False).annotate(
+            trend_score=F("funding_stats__trend_score"),
+            funding_progress=F("funding_stats__progress"),
+        )
+
+    return queryset, ordering
+
+
+def paginate_projects(params, queryset, sort_by, default_sort="date_newest", values=None):
+    """
+    One page of projects in `sort_by` order (?limit=, ?cursor=).
+    Sorting and paging both run in SQL. Returns (projects, next_cursor).
+
+    With `values` (field names) the page holds values() dicts instead of
+    model instances.
+    """
+    queryset, ordering = order_projects(queryset, sort_by, default_sort)
+    if values:
+        # The sort keys are needed for the cursor
+        sort_keys = [key.lstrip("-") for key in ordering if key.lstrip("-") not in values]
+        queryset = queryset.values(*values, *sort_keys)
+    limit = parse_limit(params.get("limit"), PROJECT_PAGE_SIZE, MAX_PROJECT_PAGE_SIZE)
+    return keyset_page(queryset, ordering, params.get("cursor"), limit)
@@ -0,0 +1,103 @@
+# connect/services/project_search.py
+
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Cast, Coalesce, Concat
+
+# Words of at least one letter/digit; everything else in the query is dropped,
+# so user input can be passed to to_tsquery safely.
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def get_config():
+    return getattr(settings, "PROJECT_SEARCH_CONFIG", "english")
+
+
+def full_text_enabled():
+    return connection.vendor == "postgresql"
+
+
+def project_document():
+    """
+    tsvector expression for a project, usable in UPDATE statements:
+    title + farmer name (A), tags + location (B), description (C).
+    """
+    from django.contrib.auth.models import User
+
+    farmer_name = Subquery(
+        User.objects.filter(pk=OuterRef("farmer_id"))
+        .annotate(full_name=Concat("first_name", Value(" "), "last_name", output_field=TextField()))
+        .values("full_name")[:1]
+    )
+    config = get_config()
+
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector(Coalesce(farmer_name, Value(""), output_field=TextField()), weight="A", config=config)
+        + SearchVector("tags", "location", weight="B", config=config)
+        + SearchVector("description", weight="C", config=config)
+    )
+
+
+def refresh_search_vectors(queryset):
+    """
+    Recomputes search_vector for the given projects in one UPDATE.
+    """
+    if not full_text_enabled():
+        return 0
+    return queryset.update(search_vector=project_document())
+
+
+def build_query(text):
+    """
+    AND of all words, each matched as a prefix ("coco pea" -> coco:* & pea:*),
+    so results show up while the user is still typing. None if no words.
+    """
+    words = WORD_RE.findall(text or "")
+    if not words:
+        return None
+    raw = " & ".join(f"{word}:*" for word in words)
+    return SearchQuery(raw, search_type="raw", config=get_config())
+
+
+def search_projects(queryset, text):
+    """
+    Filters projects matching `text`, annotated with `search_rank`
+    (higher = better match) for relevance ordering.
+    """
+    if not full_text_enabled():
+        # Non-PostgreSQL databases (no tsvector): plain substring match
+        queryset = queryset.filter(
+            Q(title__icontains=text)
+            | Q(description__icontains=text)
+            | Q(farmer__first_name__icontains=text)
+            | Q(farmer__last_name__icontains=text)
+        )
+        return queryset.annotate(search_rank=Value(0.0))
+
+    query = build_query(text)
+    if query is None:
+        return queryset.annotate(search_rank=Value(0.0))
+
+    # ts_rank returns real; as double precision the value survives the round
+    # trip through a pagination cursor exactly
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+    )
+
+
+def farmer_saved(sender, instance, update_fields=None, **kwargs):
+    """
+    Farmer names are part of the project document: refresh their projects
+    (skipped for login bookkeeping, which only touches last_login).
+    """
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+
+    from connect.models import InvestmentProject
+
+    refresh_search_vectors(InvestmentProject.objects.filter(farmer_id=instance.pk))
@@ -0,0 +1,114 @@
+# connect/services/response_cache.py
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+from . import cache_versions
+
+# Every watched model has a version stamp (see cache_versions), replaced on
+# save/delete. Cached responses are keyed on the stamps of the models they
+# were built from.
+VERSION_KEY = "connect:response_cache:version:{label}"
+RESPONSE_KEY = "connect:response_cache:{digest}"
+
+
+def get_timeout():
+    return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+
+def _version_key(model):
+    return VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def bump(*models):
+    cache_versions.bump(*(_version_key(model) for model in models))
+
+
+def _digest(request, models):
+    """
+    Identifies one cached response: URL with its query params in a fixed
+    order plus the version stamps of `models`.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache_versions.get_versions(keys)
+
+    query = sorted((name, sorted(request.GET.getlist(name))) for name in request.GET)
+    parts = [request.scheme, request.get_host(), request.path, repr(query)]
+    parts += [f"{key}={versions[key]}" for key in keys]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def _etag(content):
+    # From the body, not the cache key: a process that missed a bump (the
+    # cache may be process-local) must not hand out an old ETag for new data
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def _not_modified(request, etag):
+    return etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+
+
+def _finish(response, etag):
+    response["ETag"] = etag
+    # Browsers keep the body but revalidate it (If-None-Match) every time
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def cached_view(*models):
+    """
+    Caches the rendered GET responses of a public view that reads from
+    `models` and answers matching If-None-Match requests with 304. Hits don't
+    touch the database.
+
+    Only for responses that are the same for every visitor. Put it outside
+    @api_view, or use method_decorator(..., name="dispatch") on API views.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return view(request, *args, **kwargs)
+
+            key = RESPONSE_KEY.format(digest=_digest(request, models))
+
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, etag = cached
+                if _not_modified(request, etag):
+                    return _finish(HttpResponseNotModified(), etag)
+                return _finish(HttpResponse(content, content_type=content_type), etag)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming:
+                return response
+
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+            etag = _etag(response.content)
+            cache.set(key, (response.content, response["Content-Type"], etag), get_timeout())
+            if _not_modified(request, etag):
+                return _finish(HttpResponseNotModified(), etag)
+            return _finish(response, etag)
+
+        return wrapper
+
+    return decorator
+
+
+# -------------------------------------------------
+# Signal receivers (wired up in the apps' ready())
+# -------------------------------------------------
+def model_changed(sender, update_fields=None, **kwargs):
+    # Login bookkeeping (last_login) doesn't show up in any cached response
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    transaction.on_commit(lambda: bump(sender))
@@ -6,7 +6,7 @@ def cosine_similarity(v1, v2):
     Safe against empty vectors and zero division.
     """
 
-    if not v1 or not v2:
+    if v1 is None or v2 is None or len(v1) == 0 or len(v2) == 0:
         return 0.0
 
     v1 = np.asarray(v1, dtype=np.float32)
@@ -25,3 +25,218 @@ def cosine_similarity(v1, v2):
 
     # Clamp for numerical stability
     return float(np.clip(similarity, 0.0, 1.0))
+
+
+def top_k(scores, k):
+    """
+    Returns indices of the k highest scores, best first.
+    """
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        idx = np.argpartition(scores, -k)[-k:]
+    else:
+        idx = np.arange(n)
+    return idx[np.argsort(scores[idx])[::-1]]
+
+
+# =================================================
+# SEARCH BACKENDS (used by services.embedding_index)
+# =================================================
+# A backend only decides WHICH rows of the embedding matrix get scored.
+# Rows are addressed by position; the matrix itself is owned by the index,
+# which tells the backend when rows are added, moved or removed.
+
+class ExactSearch:
+    """
+    Brute-force scan: scores every row. Always 100% recall.
+    """
+
+    name = "exact"
+
+    def add(self, pos, vector):
+        pass
+
+    def move(self, src, dst):
+        pass
+
+    def remove(self, pos):
+        pass
+
+    def reset(self):
+        pass
+
+    def needs_training(self, n):
+        return False
+
+    def train(self, matrix):
+        pass
+
+    def search(self, matrix, query, k, exclude_pos=None):
+        scores = matrix @ query
+        if exclude_pos is not None:
+            scores[exclude_pos] = -np.inf
+        idx = top_k(scores, k)
+        return idx, scores[idx]
+
+
+class IVFSearch(ExactSearch):
+    """
+    Inverted-file ANN search.
+
+    Rows are clustered around `nlist` centroids (spherical k-means); a query
+    only scores the rows of its `nprobe` closest clusters. `nprobe` is the
+    recall-vs-latency knob: higher scans more rows and finds more true
+    neighbours. Below `min_size` rows, and until trained, the exact scan is
+    used. Training is up to the owner (EmbeddingIndex.train(), when
+    needs_training() says the corpus is big enough or has grown
+    `retrain_factor` times); search() never trains.
+    """
+
+    name = "ivf"
+
+    def __init__(self, nprobe=16, nlist=None, min_size=50000, train_size=50000,
+                 iterations=10, retrain_factor=4, seed=0):
+        self.nprobe = nprobe
+        self.nlist = nlist
+        self.min_size = min_size
+        self.train_size = train_size
+        self.iterations = iterations
+        self.retrain_factor = retrain_factor
+        self.seed = seed
+        self.reset()
+
+    def reset(self):
+        self.centroids = None
+        self._lists = []          # cluster -> np.ndarray of row positions
+        self._assign = {}         # row position -> cluster
+        self._trained_size = 0
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    # ---------- training ----------
+    def _kmeans(self, sample, nlist):
+        rng = np.random.default_rng(self.seed)
+        centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+
+        for _ in range(self.iterations):
+            labels = self._nearest(sample, centroids)
+            counts = np.bincount(labels, minlength=nlist)
+
+            # Per-cluster sums via one sort + reduceat (np.add.at is far slower)
+            order = np.argsort(labels, kind="stable")
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            empty = counts == 0
+            sums = np.zeros_like(centroids)
+            sums[~empty] = np.add.reduceat(sample[order], starts[~empty], axis=0)
+
+            if empty.any():
+                # Re-seed empty clusters with random points
+                sums[empty] = sample[rng.choice(sample.shape[0], int(empty.sum()))]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        return centroids
+
+    @staticmethod
+    def _nearest(rows, centroids, batch=8192):
+        labels = np.empty(rows.shape[0], dtype=np.int64)
+        for start in range(0, rows.shape[0], batch):
+            block = rows[start:start + batch] @ centroids.T
+            labels[start:start + batch] = block.argmax(axis=1)
+        return labels
+
+    def train(self, matrix):
+        n = matrix.shape[0]
+        nlist = self.nlist or max(1, int(np.sqrt(n)))
+        nlist = min(nlist, n)
+
+        rng = np.random.default_rng(self.seed)
+        if n > self.train_size:
+            sample = matrix[rng.choice(n, self.train_size, replace=False)]
+        else:
+            sample = matrix
+
+        self.centroids = self._kmeans(sample, nlist)
+
+        labels = self._nearest(matrix, self.centroids)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(nlist + 1))
+        self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+        self._assign = dict(zip(range(n), labels.tolist()))
+        self._trained_size = n
+
+    def needs_training(self, n):
+        if n < self.min_size:
+            return False
+        return not self.is_trained or n >= self._trained_size * self.retrain_factor
+
+    # ---------- incremental maintenance ----------
+    def add(self, pos, vector):
+        if not self.is_trained:
+            return
+        old = self._assign.get(pos)
+        cluster = int(np.argmax(self.centroids @ vector))
+        if old == cluster:
+            return
+        if old is not None:
+            self._lists[old] = self._lists[old][self._lists[old] != pos]
+        self._lists[cluster] = np.append(self._lists[cluster], pos)
+        self._assign[pos] = cluster
+
+    def remove(self, pos):
+        cluster = self._assign.pop(pos, None)
+        if cluster is not None:
+            self._lists[cluster] = self._lists[cluster][self._lists[cluster] != pos]
+
+    def move(self, src, dst):
+        cluster = self._assign.pop(src, None)
+        if cluster is None:
+            return
+        rows = self._lists[cluster]
+        rows[rows == src] = dst
+        self._assign[dst] = cluster
+
+    # ---------- query ----------
+    def search(self, matrix, query, k, exclude_pos=None):
+        n = matrix.shape[0]
+        if n < self.min_size or not self.is_trained:
+            return super().search(matrix, query, k, exclude_pos)
+
+        nprobe = min(self.nprobe, len(self._lists))
+        probe = top_k(self.centroids @ query, nprobe)
+        candidates = np.concatenate([self._lists[c] for c in probe])
+        if exclude_pos is not None:
+            candidates = candidates[candidates != exclude_pos]
+
+        scores = matrix[candidates] @ query
+        idx = top_k(scores, k)
+        return candidates[idx], scores[idx]
+
+
+SEARCH_BACKENDS = {
+    ExactSearch.name: ExactSearch,
+    IVFSearch.name: IVFSearch,
+}
+
+
+def get_search_backend(name=None, **options):
+    """
+    Builds the configured search backend (settings.IDEA_SIMILARITY_BACKEND).
+    """
+    from django.conf import settings
+
+    name = name or getattr(settings, "IDEA_SIMILARITY_BACKEND", "exact")
+    if name not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown similarity backend: {name}")
+
+    if name == IVFSearch.name:
+        options.setdefault("nprobe", getattr(settings, "IDEA_ANN_NPROBE", 16))
+        options.setdefault("min_size", getattr(settings, "IDEA_ANN_MIN_SIZE", 50000))
+
+    return SEARCH_BACKENDS[name](**options)
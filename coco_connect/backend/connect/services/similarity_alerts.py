@@ -0,0 +1,133 @@
+# connect/services/similarity_alerts.py
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .embedding_index import get_index
+
+
+def get_threshold():
+    return getattr(settings, "IDEA_ALERT_THRESHOLD", 0.65)
+
+
+def _top_per_query(query_rows, idea_ids, scores, limit):
+    """
+    Keeps the `limit` best pairs of each query row.
+    """
+    order = np.lexsort((-scores, query_rows))
+    query_rows, idea_ids, scores = query_rows[order], idea_ids[order], scores[order]
+
+    # rank of each pair inside its query's group
+    starts = np.r_[0, np.flatnonzero(np.diff(query_rows)) + 1]
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(query_rows)]))
+    keep = (np.arange(len(query_rows)) - group_start) < limit
+
+    return query_rows[keep], idea_ids[keep], scores[keep]
+
+
+def sweep_batch(idea_ids, threshold=None, max_per_idea=20):
+    """
+    Recomputes the alerts of a batch of ideas against the whole corpus.
+
+    For every pair above the threshold (different authors) the older idea is
+    the ORIGINAL (its owner gets the alert) and the newer one the similar
+    idea. Alerts of these ideas that no longer match are removed unless the
+    owner already reported or dismissed them.
+
+    Returns (matching pairs, alerts removed).
+    """
+    from connect.models import Idea, SimilarityAlert
+
+    threshold = get_threshold() if threshold is None else threshold
+    index = get_index()
+
+    with transaction.atomic():
+        # Clear the flag first: an idea edited while we work gets flagged again
+        Idea.objects.filter(id__in=idea_ids).update(needs_similarity_sweep=False)
+
+        rows = list(
+            Idea.objects.filter(id__in=idea_ids).values_list("id", "author_id", "created_at", "embedding")
+        )
+        for idea_id, _, _, embedding in rows:
+            index.upsert(idea_id, embedding)
+
+        query_ids, queries = index.vectors([row[0] for row in rows])
+
+        pairs = {}
+        still_similar = set()
+        if len(query_ids):
+            query_rows, match_ids, scores = index.pairs_above(queries, threshold)
+            not_self = match_ids != query_ids[query_rows]
+            query_rows, match_ids, scores = query_rows[not_self], match_ids[not_self], scores[not_self]
+
+            # Existing alerts stay while their pair is above the threshold,
+            # even when it's outside this idea's top max_per_idea
+            still_similar = set(zip(query_ids[query_rows].tolist(), match_ids.tolist()))
+            query_rows, match_ids, scores = _top_per_query(query_rows, match_ids, scores, max_per_idea)
+
+            # Authors/dates of everything involved (ideas deleted meanwhile drop out)
+            meta = {row[0]: (row[1], row[2]) for row in rows}
+            missing = set(match_ids.tolist()) - meta.keys()
+            meta.update(
+                (row[0], (row[1], row[2]))
+                for row in Idea.objects.filter(id__in=missing).values_list("id", "author_id", "created_at")
+            )
+
+            matches = zip(query_ids[query_rows].tolist(), match_ids.tolist(), scores.tolist())
+            for query_id, match_id, score in matches:
+                if match_id not in meta or meta[query_id][0] == meta[match_id][0]:
+                    continue
+
+                original, newer = sorted((query_id, match_id), key=lambda i: (meta[i][1], i))
+                pairs[(original, newer)] = round(min(score, 1.0), 3)
+
+        existing = SimilarityAlert.objects.filter(
+            Q(idea_id__in=idea_ids) | Q(similar_idea_id__in=idea_ids),
+            is_reported=False,
+            is_dismissed=False,
+        ).values_list("id", "idea_id", "similar_idea_id")
+        stale = [
+            alert_id
+            for alert_id, a, b in existing
+            if (a, b) not in still_similar and (b, a) not in still_similar
+        ]
+        removed = SimilarityAlert.objects.filter(id__in=stale).delete()[0] if stale else 0
+
+        # Pairs that already have an alert are left alone (incl. its score)
+        SimilarityAlert.objects.bulk_create(
+            [
+                SimilarityAlert(idea_id=original, similar_idea_id=newer, similarity_score=score)
+                for (original, newer), score in pairs.items()
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    return len(pairs), removed
+
+
+def sweep(batch_size=64, threshold=None, max_per_idea=20):
+    """
+    Processes every idea flagged with needs_similarity_sweep (new or edited).
+    Returns {"ideas", "pairs", "alerts_removed"}.
+    """
+    from connect.models import Idea
+
+    stats = {"ideas": 0, "pairs": 0, "alerts_removed": 0}
+
+    while True:
+        # Batches are re-queried: sweep_batch clears the flag of what it handled
+        idea_ids = list(
+            Idea.objects.filter(needs_similarity_sweep=True)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not idea_ids:
+            return stats
+
+        pairs, removed = sweep_batch(idea_ids, threshold, max_per_idea)
+        stats["ideas"] += len(idea_ids)
+        stats["pairs"] += pairs
+        stats["alerts_removed"] += removed
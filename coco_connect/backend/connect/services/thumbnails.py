@@ -0,0 +1,440 @@
+# connect/services/thumbnails.py
+
+import hashlib
+import math
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urljoin
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from connect.apps import POOL_WORKER_ENV
+
+# Uploaded images that get thumbnails: model label -> image field
+THUMBNAILED = {
+    "products.product": "image",
+    "products.newsitem": "image",
+    "connect.news": "image",
+    "connect.investmentproject": "image",
+}
+
+# IMAGE_THUMBNAIL_FORMATS entries -> (file extension, Pillow save options)
+FORMATS = {
+    "webp": ("webp", {"method": 4}),
+    "jpeg": ("jpg", {"optimize": True, "progressive": True}),
+}
+
+# Derivative directories younger than this are left alone by prune(): a
+# worker may still be rendering into one before its record is saved
+PRUNE_GRACE_SECONDS = 3600
+
+EXIF_ORIENTATION = 0x0112
+
+
+def get_widths():
+    return tuple(sorted(set(getattr(settings, "IMAGE_THUMBNAIL_WIDTHS", (160, 320, 640, 1280)))))
+
+
+def get_formats():
+    return tuple(getattr(settings, "IMAGE_THUMBNAIL_FORMATS", ("webp", "jpeg")))
+
+
+def get_quality():
+    return getattr(settings, "IMAGE_THUMBNAIL_QUALITY", 80)
+
+
+def get_workers():
+    return getattr(settings, "IMAGE_THUMBNAIL_WORKERS", 2)
+
+
+def thumbnail_dir():
+    return getattr(settings, "IMAGE_THUMBNAIL_DIR", "thumbs").strip("/")
+
+
+def thumbnailed_models():
+    return [(apps.get_model(label), field) for label, field in THUMBNAILED.items()]
+
+
+def derivative_dir(content_hash):
+    return f"{thumbnail_dir()}/{content_hash[:2]}/{content_hash}"
+
+
+def derivative_name(content_hash, width, fmt):
+    return f"{derivative_dir(content_hash)}/{width}.{FORMATS[fmt][0]}"
+
+
+def target_widths(width):
+    # Never upscale: configured widths above the original's collapse into it
+    return sorted({min(w, width) for w in get_widths()})
+
+
+def media_url(name):
+    return urljoin(getattr(settings, "BACKEND_PUBLIC_URL", "").rstrip("/") + "/", default_storage.url(name))
+
+
+# -------------------------------------------------
+# Rendering (runs in the worker processes)
+# -------------------------------------------------
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _display_size(image):
+    # EXIF orientations 5-8 are rotated by 90 degrees
+    width, height = image.size
+    if image.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8):
+        return height, width
+    return width, height
+
+
+def _prepare(image):
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    if image.mode in ("LA", "PA") or "transparency" in image.info:
+        return image.convert("RGBA")
+    return image.convert("RGB")
+
+
+def _flatten(image):
+    # JPEG has no alpha channel: transparent areas become white
+    from PIL import Image
+
+    if image.mode != "RGBA":
+        return image
+    flat = Image.new("RGB", image.size, (255, 255, 255))
+    flat.paste(image, mask=image.getchannel("A"))
+    return flat
+
+
+def _save(image, name, fmt):
+    # Written under a temporary name and renamed, so readers (and workers
+    # rendering identical content) never see a partial file
+    path = default_storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        image.save(tmp, format=fmt.upper(), quality=get_quality(), **FORMATS[fmt][1])
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def render(path, content_hash):
+    """
+    Writes the derivatives of the image at `path` that aren't on disk yet.
+    Returns (width, height, widths, written): the original's size, the
+    widths available and the number of files written.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as image:
+        width, height = _display_size(image)
+        widths = target_widths(width)
+        missing = [
+            (w, fmt)
+            for w in widths
+            for fmt in get_formats()
+            if not os.path.exists(default_storage.path(derivative_name(content_hash, w, fmt)))
+        ]
+        if not missing:
+            return width, height, widths, 0
+
+        # JPEGs are decoded at a reduced scale when that's still large enough
+        scale = max(w for w, _ in missing) / width
+        image.draft("RGB", (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+        image = _prepare(ImageOps.exif_transpose(image))
+
+        for w in sorted({w for w, _ in missing}, reverse=True):
+            size = (w, max(1, round(height * w / width)))
+            resized = image if image.size == size else image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            for fmt in get_formats():
+                if (w, fmt) in missing:
+                    _save(_flatten(resized) if fmt == "jpeg" else resized, derivative_name(content_hash, w, fmt), fmt)
+
+    return width, height, widths, len(missing)
+
+
+def generate(source, bump=True):
+    """
+    Renders the thumbnails of one stored image (storage name) and records
+    them. Returns the number of files written.
+
+    bump=False leaves invalidating cached listings to the caller: pool
+    workers pass it, since their cache isn't the web process's.
+    """
+    from connect.models import ImageThumbnails
+
+    row, _ = ImageThumbnails.objects.get_or_create(source=source)
+    try:
+        path = default_storage.path(source)
+        row.content_hash = hash_file(path)
+        row.width, row.height, widths, written = render(path, row.content_hash)
+    except Exception as e:
+        row.status, row.error = "failed", f"{type(e).__name__}: {e}"
+        row.save()
+        return 0
+
+    row.widths = ",".join(str(w) for w in widths)
+    row.status, row.error = "ready", ""
+    row.save()
+
+    if bump:
+        bump_listings()
+    return written
+
+
+def bump_listings():
+    # Cached listings were built without the new srcsets
+    from . import response_cache
+
+    response_cache.bump(*(model for model, _ in thumbnailed_models()))
+
+
+# -------------------------------------------------
+# Worker pool
+# -------------------------------------------------
+def _init_pool_worker():
+    # Spawned workers start from a clean interpreter; ConnectConfig.ready()
+    # mustn't start the embedding warm-up in them
+    os.environ[POOL_WORKER_ENV] = "1"
+    import django
+
+    django.setup()
+
+
+class ThumbnailPool:
+    """
+    Renders thumbnails in spawned processes, so decoding/resizing/encoding
+    doesn't take CPU (and the GIL) from the web worker that took the upload.
+    Cached listings are invalidated here once a render is done. The executor
+    is recreated per process (fork) and after a worker crash.
+    """
+
+    def __init__(self, workers=2):
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_pool_worker,
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def submit(self, source):
+        """
+        Queues generate(source); returns its Future.
+        """
+        executor = self._get_executor()
+        try:
+            future = executor.submit(generate, source, False)
+        except BrokenProcessPool:
+            # A worker died (e.g. on an image too big for memory): start over
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            future = self._get_executor().submit(generate, source, False)
+        future.add_done_callback(_rendered)
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+
+
+def _rendered(future):
+    if not future.cancelled() and future.exception() is None:
+        bump_listings()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThumbnailPool(workers=get_workers())
+    return _pool
+
+
+def schedule(source):
+    """
+    Hands `source` to the worker pool, or renders it right away when
+    IMAGE_THUMBNAIL_WORKERS is 0. Images still "pending" after a restart are
+    picked up by `manage.py generate_thumbnails`.
+    """
+    if get_workers() > 0:
+        get_pool().submit(source)
+    else:
+        generate(source)
+
+
+# -------------------------------------------------
+# srcset lookups
+# -------------------------------------------------
+def _srcset(row):
+    widths = [int(w) for w in row["widths"].split(",") if w]
+    return {
+        fmt: ", ".join(f"{media_url(derivative_name(row['content_hash'], w, fmt))} {w}w" for w in widths)
+        for fmt in get_formats()
+    }
+
+
+def lookup(sources):
+    """
+    {source: srcset} for the storage names whose thumbnails are ready, in one
+    query. A srcset maps each format to an <img srcset> value
+    ("https://.../160.webp 160w, https://.../320.webp 320w").
+    """
+    from connect.models import ImageThumbnails
+
+    sources = {source for source in sources if source}
+    if not sources:
+        return {}
+    rows = ImageThumbnails.objects.filter(source__in=sources, status="ready").values(
+        "source", "content_hash", "widths"
+    )
+    return {row["source"]: _srcset(row) for row in rows}
+
+
+def srcset(source):
+    return lookup([source]).get(source)
+
+
+# -------------------------------------------------
+# Backfill / cleanup (manage.py generate_thumbnails)
+# -------------------------------------------------
+def referenced_sources():
+    """
+    Every image name the THUMBNAILED fields refer to.
+    """
+    sources = set()
+    for model, field in thumbnailed_models():
+        names = model.objects.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""})
+        sources.update(names.values_list(field, flat=True).iterator(chunk_size=5000))
+    return sources
+
+
+def generate_all(statuses=("pending",), workers=None, batch_size=1000):
+    """
+    Records every referenced image, then renders those in `statuses` on
+    `workers` processes (in-process with 0). Returns (images, files written).
+    """
+    from connect.models import ImageThumbnails
+
+    sources = referenced_sources()
+    ImageThumbnails.objects.bulk_create(
+        [ImageThumbnails(source=source) for source in sources], batch_size=batch_size, ignore_conflicts=True
+    )
+    todo = [
+        source
+        for source in ImageThumbnails.objects.filter(status__in=statuses).values_list("source", flat=True).iterator()
+        if source in sources
+    ]
+
+    workers = get_workers() if workers is None else workers
+    if workers <= 0:
+        return len(todo), sum(generate(source) for source in todo)
+
+    pool = ThumbnailPool(workers)
+    try:
+        futures = [pool.submit(source) for source in todo]
+        return len(todo), sum(future.result() for future in as_completed(futures))
+    finally:
+        pool.shutdown()
+
+
+def prune():
+    """
+    Deletes the records of images nothing refers to any more, then the
+    derivative directories no record points at. Returns (records, directories).
+    """
+    from connect.models import ImageThumbnails
+
+    cutoff = time.time() - PRUNE_GRACE_SECONDS
+    sources = referenced_sources()
+    stale = [
+        pk
+        for pk, source, updated_at in ImageThumbnails.objects.values_list("pk", "source", "updated_at").iterator()
+        if source not in sources and updated_at.timestamp() < cutoff
+    ]
+    for i in range(0, len(stale), 1000):
+        ImageThumbnails.objects.filter(pk__in=stale[i : i + 1000]).delete()
+
+    hashes = set(ImageThumbnails.objects.exclude(content_hash="").values_list("content_hash", flat=True))
+    root = default_storage.path(thumbnail_dir())
+    removed = 0
+    if os.path.isdir(root):
+        for prefix in os.scandir(root):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.is_dir() and entry.name not in hashes and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    removed += 1
+            if not os.listdir(prefix.path):
+                os.rmdir(prefix.path)
+    return len(stale), removed
+
+
+# -------------------------------------------------
+# Signal receivers (wired up in ConnectConfig/ProductsConfig.ready())
+# -------------------------------------------------
+def _image_name(instance, field):
+    # The raw attribute: a deferred field isn't loaded (no query), and a
+    # plain name hasn't been wrapped in a FieldFile yet
+    value = instance.__dict__.get(field)
+    return getattr(value, "name", value) or ""
+
+
+def image_loaded(sender, instance, **kwargs):
+    # Remembered so image_saved can tell whether a save changed the image
+    instance._thumbnail_source = _image_name(instance, THUMBNAILED[sender._meta.label_lower])
+
+
+def image_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    from connect.models import ImageThumbnails
+
+    field = THUMBNAILED[sender._meta.label_lower]
+    if update_fields is not None and field not in update_fields:
+        return
+    name = _image_name(instance, field)
+    if not created and name == getattr(instance, "_thumbnail_source", None):
+        return
+    instance._thumbnail_source = name
+    if not name:
+        return
+
+    # The same file may already be recorded (another row, or a re-save)
+    _, created = ImageThumbnails.objects.get_or_create(source=name)
+    if created:
+        # After commit: the worker reads the file and this row from another process
+        transaction.on_commit(lambda: schedule(name))
@@ -0,0 +1,169 @@
+# connect/services/unit_reservations.py
+
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class UnitsUnavailable(Exception):
+    pass
+
+
+class ReservationNotHeld(Exception):
+    """
+    The reservation was already confirmed or released, or it has expired.
+    """
+
+
+def get_ttl():
+    return getattr(settings, "UNIT_RESERVATION_TTL", 900)
+
+
+def unit_price_of(project):
+    if project.unit_price:
+        return project.unit_price
+    if not project.total_units:
+        return Decimal("0")
+    return (project.target_amount / project.total_units).quantize(Decimal("0.01"))
+
+
+def _take_units(project_id, units):
+    from connect.models import InvestmentProject
+
+    # Matches (and row-locks) the project only while enough units are left
+    return (
+        InvestmentProject.objects.filter(pk=project_id, status="active", available_units__gte=units)
+        .update(available_units=F("available_units") - units)
+    )
+
+
+def _return_units(project_id, units):
+    from connect.models import InvestmentProject
+
+    InvestmentProject.objects.filter(pk=project_id).update(available_units=F("available_units") + units)
+
+
+def reserve(project, investor, units, ttl=None):
+    """
+    Holds `units` of an active project for `investor` for `ttl` seconds.
+    The units are taken with one conditional UPDATE, so parallel buyers
+    can't oversell. When the project looks sold out, its expired holds are
+    reclaimed first. Raises UnitsUnavailable.
+    """
+    from connect.models import UnitReservation
+
+    if units < 1:
+        raise ValueError("units must be at least 1")
+
+    with transaction.atomic():
+        reservation = UnitReservation.objects.create(
+            project=project,
+            investor=investor,
+            units=units,
+            unit_price=unit_price_of(project),
+            expires_at=timezone.now() + timedelta(seconds=ttl or get_ttl()),
+        )
+
+        # Every buyer queues on the project row: take it last, so its lock
+        # is only held until COMMIT
+        taken = _take_units(project.pk, units)
+        if not taken and expire(project_id=project.pk):
+            taken = _take_units(project.pk, units)
+        if not taken:
+            # Rolls back the reservation row
+            raise UnitsUnavailable(f"Fewer than {units} units are available")
+
+        return reservation
+
+
+def _claim(reservation, status, live_only=False):
+    """
+    Moves a held reservation to `status`. Only one caller can win it.
+    """
+    from connect.models import UnitReservation
+
+    held = UnitReservation.objects.filter(pk=reservation.pk, status="held")
+    if live_only:
+        held = held.filter(expires_at__gt=timezone.now())
+    if not held.update(status=status):
+        return False
+    reservation.status = status
+    return True
+
+
+def confirm(reservation, **investment_fields):
+    """
+    Turns a live hold into a unit_purchase Investment. The units stay taken,
+    and Investment.save counts the money once the investment is completed.
+    Raises ReservationNotHeld.
+    """
+    from connect.models import Investment
+
+    project = reservation.project
+    fields = {
+        **investment_fields,
+        "investor_id": reservation.investor_id,
+        "project": project,
+        "reservation": reservation,
+        "investment_type": "unit_purchase",
+        "investment_structure": "units",
+        "units": reservation.units,
+        "unit_price": reservation.unit_price,
+        "amount": reservation.amount,
+        "total_units": project.total_units,
+        "ownership_percentage": (
+            Decimal(reservation.units * 100) / project.total_units if project.total_units else None
+        ),
+    }
+
+    with transaction.atomic():
+        if not _claim(reservation, "confirmed", live_only=True):
+            raise ReservationNotHeld("This reservation has expired or was already used")
+        return Investment.objects.create(**fields)
+
+
+def release(reservation):
+    """
+    Gives held units back to the project. False if it wasn't held anymore.
+    """
+    with transaction.atomic():
+        if not _claim(reservation, "released"):
+            return False
+        _return_units(reservation.project_id, reservation.units)
+    return True
+
+
+def expire(project_id=None, batch_size=500):
+    """
+    Returns the units of holds past their expiry to their projects (all
+    projects, or one). Returns how many reservations expired.
+    """
+    from connect.models import UnitReservation
+
+    with transaction.atomic():
+        due = UnitReservation.objects.filter(status="held", expires_at__lte=timezone.now())
+        if project_id is not None:
+            due = due.filter(project_id=project_id)
+
+        # Holds being confirmed/released right now are locked: leave them
+        rows = list(
+            due.select_for_update(skip_locked=True).values_list("id", "project_id", "units")[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        UnitReservation.objects.filter(id__in=[row[0] for row in rows]).update(status="expired")
+
+        units_per_project = Counter()
+        for _, row_project_id, units in rows:
+            units_per_project[row_project_id] += units
+        # Fixed order, so two sweeps can't deadlock on project rows
+        for row_project_id, units in sorted(units_per_project.items()):
+            _return_units(row_project_id, units)
+
+    return len(rows)
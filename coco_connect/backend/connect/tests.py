@@ -1,3 +1,650 @@
-from django.test import TestCase
+import threading
+from decimal import Decimal
+from importlib.util import find_spec
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from .fields import _HEADER, pack_embedding, unpack_embedding
+
+from .management.commands._synthetic_projects import seed_projects
+from .management.commands.benchmark_embeddings import synthetic_idea_texts
+from .management.commands.check_project_query_plans import CASES, check_plan
+from .models import (
+    Idea,
+    ImageThumbnails,
+    Investment,
+    InvestmentCategory,
+    InvestmentProject,
+    News,
+    ProjectFundingStats,
+)
+from .serializers import IdeaSerializer
+from .services import dashboard_stats, embedding_index, embeddings, funding_stats, project_facets, thumbnails
+from .services.embedding_index import EmbeddingIndex
+from .services.embeddings import EmbeddingBatcher, encode_texts, get_batcher, load_model
+from .services.unit_reservations import UnitsUnavailable
+from .services.pagination import InvalidCursor, encode_cursor, keyset_page, keyset_queryset, parse_limit
+from .services.project_listing import PROJECT_PAGE_SIZE, filter_projects, order_projects
+
+
+# ==================================================
+# PROJECT LISTING QUERY PLANS (PostgreSQL only)
+# ==================================================
+@skipUnless(connection.vendor == "postgresql", "Query plans are only checked on PostgreSQL")
+class ProjectListingQueryPlanTests(TestCase):
+    # Index each sort of the active listing is expected to walk
+    ACTIVE_SORT_INDEXES = {
+        "roi_desc": "project_active_roi_idx",
+        "roi_asc": "project_active_roi_idx",
+        "date_newest": "project_active_created_idx",
+        "date_oldest": "project_active_created_idx",
+        "popularity": "project_active_popular_idx",
+        "funding_needed": "project_active_gap_idx",
+        "trending": "funding_stats_trend_idx",
+        "closest_to_funded": "funding_stats_progress_idx",
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        # Big enough that a sequential scan would be the cheaper plan without the indexes
+        seed_projects(5000)
+
+    def test_active_sorts_use_their_index(self):
+        for sort, index in self.ACTIVE_SORT_INDEXES.items():
+            with self.subTest(sort=sort):
+                qs, ordering = order_projects(filter_projects({"status": "active"}), sort)
+                ok, indexes, plan = check_plan(qs, ordering)
+                self.assertTrue(ok, plan)
+                self.assertIn(index, indexes, plan)
+
+    def test_category_filter_uses_its_index(self):
+        # The category name is resolved to ids first, so no join on the name
+        qs, ordering = order_projects(filter_projects({"status": "active", "category": "Coir Products"}), "roi_desc")
+        ok, indexes, plan = check_plan(qs, ordering)
+        self.assertTrue(ok, plan)
+        self.assertIn("project_status_cat_roi_idx", indexes, plan)
+
+    def test_listing_pages_avoid_sequential_scans(self):
+        for label, params, sort in CASES:
+            qs, ordering = order_projects(filter_projects(params), sort)
+            _, cursor = keyset_page(qs, ordering, limit=PROJECT_PAGE_SIZE)
+            for page, page_cursor in (("page 1", None), ("page 2", cursor)):
+                with self.subTest(case=label, page=page):
+                    ok, _, plan = check_plan(qs, ordering, page_cursor)
+                    self.assertTrue(ok, plan)
+
+
+# ==================================================
+# CONCURRENT INVESTMENTS (PostgreSQL only: SQLite serializes writers)
+# ==================================================
+def run_parallel(tasks, workers=8):
+    """
+    Runs `tasks` on `workers` threads (one DB connection each), all released
+    at once; re-raises the first failure.
+    """
+    queue = list(reversed(tasks))
+    lock = threading.Lock()
+    start = threading.Barrier(workers)
+    errors = []
+
+    def worker():
+        start.wait()
+        try:
+            while True:
+                with lock:
+                    if not queue:
+                        return
+                    task = queue.pop()
+                task()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+@skipUnless(connection.vendor == "postgresql", "Needs concurrent writers (PostgreSQL)")
+class InvestmentFundingConcurrencyTests(TransactionTestCase):
+    AMOUNT = Decimal("250.00")
+
+    def setUp(self):
+        self.investors = User.objects.bulk_create([User(username=f"investor_{i}") for i in range(8)])
+        self.farmer = User.objects.create(username="farmer")
+
+    def project(self, target, total_units=1000):
+        return InvestmentProject.objects.create(
+            title="Hot project",
+            description="",
+            farmer=self.farmer,
+            status="active",
+            target_amount=target,
+            total_units=total_units,
+            available_units=total_units,
+        )
+
+    def invest(self, project, i, **fields):
+        return lambda: Investment.objects.create(
+            investor=self.investors[i % len(self.investors)], project_id=project.pk, amount=self.AMOUNT, **fields
+        )
+
+    def assertFunding(self, project, count):
+        project.refresh_from_db()
+        self.assertEqual(project.current_amount, self.AMOUNT * count)
+        self.assertEqual(project.investors_count, count)
+        stats = ProjectFundingStats.objects.get(project=project)
+        self.assertEqual((stats.total_invested, stats.investments_count), (self.AMOUNT * count, count))
+        return project
+
+    def test_parallel_investments_add_up_and_fund_the_project(self):
+        # The target is reached part-way through the 40 investments
+        project = self.project(target=self.AMOUNT * 30)
+        run_parallel([self.invest(project, i, status="completed") for i in range(40)])
+
+        project = self.assertFunding(project, 40)
+        self.assertEqual(project.status, "funded")
+        self.assertEqual(project.days_left, 0)
+
+    def test_target_not_reached_stays_active(self):
+        project = self.project(target=self.AMOUNT * 41)
+        run_parallel([self.invest(project, i, status="completed") for i in range(40)])
+
+        self.assertEqual(self.assertFunding(project, 40).status, "active")
+
+    def test_completing_the_same_investment_concurrently_counts_it_once(self):
+        project = self.project(target=self.AMOUNT * 100)
+        pending = [self.invest(project, i)() for i in range(10)]
+
+        def complete(pk):
+            investment = Investment.objects.get(pk=pk)
+            investment.status = "completed"
+            investment.save()
+
+        run_parallel([lambda pk=investment.pk: complete(pk) for investment in pending for _ in range(4)])
+        self.assertEqual(self.assertFunding(project, 10).status, "active")
+
+    def test_unit_purchases_never_oversell(self):
+        # 12 buyers of 3 units each, but only 30 units
+        project = self.project(target=self.AMOUNT * 1000, total_units=30)
+        sold, refused = [], []
+
+        def buy(i):
+            try:
+                self.invest(project, i, units=3, investment_type="unit_purchase", status="completed")()
+                sold.append(i)
+            except UnitsUnavailable:
+                refused.append(i)
+
+        run_parallel([lambda i=i: buy(i) for i in range(12)])
+
+        self.assertEqual((len(sold), len(refused)), (10, 2))
+        project = self.assertFunding(project, 10)
+        self.assertEqual(project.available_units, 0)
+
+
+# ==================================================
+# PACKED EMBEDDINGS (fields.EmbeddingField)
+# ==================================================
+class PackedEmbeddingTests(SimpleTestCase):
+    def setUp(self):
+        self.vector = np.random.default_rng(0).normal(size=384).astype(np.float32)
+
+    def test_float32_round_trip_is_exact(self):
+        data = pack_embedding(self.vector.tolist())
+        self.assertEqual(len(data), _HEADER.size + 384 * 4)
+        unpacked = unpack_embedding(data)
+        self.assertEqual(unpacked.dtype, np.float32)
+        np.testing.assert_array_equal(unpacked, self.vector)
+
+    def test_float16_halves_the_size(self):
+        data = pack_embedding(self.vector, "float16")
+        self.assertEqual(len(data), _HEADER.size + 384 * 2)
+        np.testing.assert_allclose(unpack_embedding(data), self.vector, atol=1e-3, rtol=1e-3)
+
+    def test_missing_and_empty_vectors_pack_to_none(self):
+        self.assertIsNone(pack_embedding(None))
+        self.assertIsNone(pack_embedding([]))
+        self.assertIsNone(unpack_embedding(None))
+
+    def test_unknown_format_is_rejected(self):
+        data = bytearray(pack_embedding(self.vector))
+        data[0] = 99
+        with self.assertRaises(ValueError):
+            unpack_embedding(bytes(data))
+
+
+class EmbeddingFieldTests(TestCase):
+    def test_idea_embedding_round_trips_through_the_database(self):
+        vector = np.random.default_rng(1).normal(size=384).astype(np.float32)
+        author = User.objects.create(username="author")
+        idea = Idea.objects.create(
+            author=author, title="t", short_description="s", full_description="f", embedding=vector.tolist()
+        )
+
+        stored = Idea.objects.values_list("embedding", flat=True).get(pk=idea.pk)
+        self.assertIsInstance(stored, np.ndarray)
+        np.testing.assert_array_equal(stored, vector)
+        self.assertEqual(Idea._meta.get_field("embedding").value_to_string(idea), vector.tolist())
+
+
+# ==================================================
+# IDEA EMBEDDING INDEX
+# ==================================================
+def unit_vectors(n, dim=32, seed=0):
+    rows = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+class EmbeddingIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.vectors = unit_vectors(200)
+        self.index = EmbeddingIndex(capacity=16)
+        self.index.build((i + 1, v) for i, v in enumerate(self.vectors))
+
+    def brute_force(self, query, k):
+        scores = self.vectors @ query
+        order = np.argsort(-scores)[:k]
+        return [int(i) + 1 for i in order]
+
+    def test_search_matches_a_brute_force_scan(self):
+        query = unit_vectors(1, seed=1)[0]
+        results = self.index.search(query, k=5)
+        self.assertEqual([idea_id for idea_id, _ in results], self.brute_force(query, 5))
+        self.assertTrue(all(0.0 <= score <= 1.0 for _, score in results))
+
+    def test_search_excludes_the_idea_itself(self):
+        results = self.index.search(self.vectors[9], k=3, exclude_id=10)
+        self.assertNotIn(10, [idea_id for idea_id, _ in results])
+        self.assertEqual(len(results), 3)
+
+    def test_vectors_are_normalized_on_insert(self):
+        self.index.upsert(500, self.vectors[0] * 7)
+        np.testing.assert_allclose(self.index.vectors([500])[1][0], self.vectors[0], atol=1e-6)
+
+    def test_upsert_replaces_and_remove_keeps_rows_contiguous(self):
+        self.index.upsert(1, self.vectors[50])
+        self.assertEqual(len(self.index), 200)
+        self.assertTrue(self.index.remove(2))
+        self.assertFalse(self.index.remove(2))
+
+        self.assertEqual(len(self.index), 199)
+        self.assertNotIn(2, self.index)
+        # The last row moved into the freed slot and still finds itself
+        self.assertEqual(self.index.search(self.vectors[199], k=1)[0][0], 200)
+        self.assertEqual(sorted(self.index.ids.tolist()), [1, *range(3, 201)])
+
+    def test_unusable_vectors_remove_the_idea(self):
+        for vector in (None, [], np.zeros(32), np.ones(16)):
+            self.index.upsert(3, self.vectors[2])
+            self.assertFalse(self.index.upsert(3, vector))
+            self.assertNotIn(3, self.index)
+
+
+@override_settings(IDEA_INDEX_REFRESH_SECONDS=0, IDEA_SIMILARITY_BACKEND="exact")
+class SharedEmbeddingIndexTests(TestCase):
+    """
+    Changes made by other processes reach get_index() through the database.
+    Inside a TestCase nothing commits, so the signal receivers (on_commit)
+    never touch the index: every change here looks like another process's.
+    """
+
+    def setUp(self):
+        embedding_index.reset_index()
+        self.addCleanup(embedding_index.reset_index)
+        self.author = User.objects.create(username="author")
+        self.vectors = iter(unit_vectors(50))
+        self.ideas = [self.create_idea() for _ in range(10)]
+
+    def create_idea(self):
+        return Idea.objects.create(
+            author=self.author, title="t", short_description="s", full_description="f", embedding=next(self.vectors)
+        )
+
+    def test_catches_up_with_inserts_updates_and_deletes(self):
+        index = embedding_index.get_index()
+        self.assertEqual(len(index), 10)
+
+        added = self.create_idea()
+        edited = self.ideas[0]
+        edited.embedding = next(self.vectors)
+        edited.save()
+        Idea.objects.filter(pk=self.ideas[1].pk).delete()
+
+        self.assertIs(embedding_index.get_index(), index)
+        self.assertIn(added.pk, index)
+        self.assertNotIn(self.ideas[1].pk, index)
+        np.testing.assert_allclose(index.vectors([edited.pk])[1][0], edited.embedding, atol=1e-6)
+
+    def test_unchanged_database_costs_one_query(self):
+        embedding_index.get_index()
+        with self.assertNumQueries(1):
+            embedding_index.get_index()
+
+    def test_new_dimension_rebuilds_the_index(self):
+        index = embedding_index.get_index()
+        for idea in Idea.objects.all():
+            idea.embedding = unit_vectors(1, dim=16, seed=idea.pk)[0]
+            idea.save()
+
+        rebuilt = embedding_index.get_index()
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual((rebuilt.dim, len(rebuilt)), (16, 10))
+
+
+class EmbeddingIndexRebuildTests(SimpleTestCase):
+    def test_concurrent_triggers_start_one_rebuild(self):
+        self.addCleanup(embedding_index.reset_index)
+        calls, release = [], threading.Event()
+
+        def build():
+            calls.append(1)
+            release.wait(5)
+            return EmbeddingIndex(), set(), {"latest": None, "count": 0}
+
+        start = threading.Barrier(8)
+
+        def trigger():
+            start.wait()
+            embedding_index._rebuild_in_background()
+
+        with mock.patch.object(embedding_index, "_build_index", build):
+            threads = [threading.Thread(target=trigger) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            release.set()
+            # Finished (lock free again) before the patch is undone
+            self.assertTrue(embedding_index._rebuild_lock.acquire(timeout=5))
+            embedding_index._rebuild_lock.release()
+
+        self.assertEqual(len(calls), 1)
+
+
+# ==================================================
+# KEYSET PAGINATION
+# ==================================================
+class KeysetPaginationTests(TestCase):
+    ORDERING = ("-expected_roi", "-id")
+
+    @classmethod
+    def setUpTestData(cls):
+        farmer = User.objects.create(username="farmer")
+        # Few distinct ROIs: most pages end in the middle of a tie
+        for i in range(23):
+            InvestmentProject.objects.create(
+                title=f"p{i}", description="", farmer=farmer, target_amount=1000, expected_roi=Decimal(i % 4 * 5)
+            )
+
+    def walk(self, queryset, limit):
+        pages, cursor = [], None
+        while True:
+            rows, cursor = keyset_page(queryset, self.ORDERING, cursor, limit=limit)
+            pages.append(rows)
+            if cursor is None:
+                return pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        expected = list(InvestmentProject.objects.order_by(*self.ORDERING).values_list("id", flat=True))
+        for limit in (1, 4, 5, 23, 50):
+            with self.subTest(limit=limit):
+                pages = self.walk(InvestmentProject.objects.all(), limit)
+                self.assertEqual([p.id for page in pages for p in page], expected)
+                self.assertTrue(all(len(page) == limit for page in pages[:-1]))
+
+    def test_values_querysets_page_the_same(self):
+        pages = self.walk(InvestmentProject.objects.values("id", "expected_roi"), 4)
+        expected = list(InvestmentProject.objects.order_by(*self.ORDERING).values_list("id", flat=True))
+        self.assertEqual([row["id"] for page in pages for row in page], expected)
+
+    def test_bad_cursors_are_rejected(self):
+        queryset = InvestmentProject.objects.all()
+        for cursor in ("not base64!", encode_cursor(["5"]), encode_cursor(["abc", "1"])):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                keyset_queryset(queryset, self.ORDERING, cursor)
+
+    def test_parse_limit_clamps(self):
+        self.assertEqual(parse_limit(None), 24)
+        self.assertEqual(parse_limit("x"), 24)
+        self.assertEqual(parse_limit("0"), 1)
+        self.assertEqual(parse_limit("500"), 100)
+        self.assertEqual(parse_limit("10"), 10)
+
+
+# ==================================================
+# EMBEDDING BACKEND PARITY (needs the models)
+# ==================================================
+@skipUnless(find_spec("sentence_transformers"), "sentence_transformers is not installed")
+class EmbeddingBackendParityTests(SimpleTestCase):
+    MIN_COSINE = 0.98
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.texts = synthetic_idea_texts(50, seed=1)
+        cls.reference = encode_texts(cls.texts, model=load_model("torch"))
+
+    def assert_matches_torch(self, backend):
+        candidate = encode_texts(self.texts, model=load_model(backend))
+        # Rows are normalized, so the row-wise dot product is the cosine
+        cosines = np.sum(self.reference * candidate, axis=1)
+        self.assertGreaterEqual(cosines.min(), self.MIN_COSINE)
+
+    def test_int8_matches_torch(self):
+        self.assert_matches_torch("int8")
+
+    @skipUnless(find_spec("optimum"), "optimum is not installed")
+    def test_onnx_matches_torch(self):
+        self.assert_matches_torch("onnx")
+
+
+# ==================================================
+# EMBEDDING BATCHER
+# ==================================================
+class EmbeddingBatcherTests(SimpleTestCase):
+    def test_batches_overlap_with_two_workers(self):
+        # Each batch waits for the other one: only passes if both encode at once
+        both_running = threading.Barrier(2, timeout=5)
+        first_started = threading.Event()
+
+        def encode(texts):
+            first_started.set()
+            both_running.wait()
+            return [np.array([len(text)]) for text in texts]
+
+        batcher = EmbeddingBatcher(encode=encode, max_wait_ms=0, workers=2)
+        first = batcher.submit("a")
+        # Queued once the first batch is already encoding
+        first_started.wait(5)
+        second = batcher.submit("bb")
+        self.assertEqual(first.result(timeout=10)[0], 1)
+        self.assertEqual(second.result(timeout=10)[0], 2)
+
+    def test_one_batch_per_window(self):
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def encode(texts):
+            calls.append(list(texts))
+            started.set()
+            release.wait(5)
+            return [np.zeros(1) for _ in texts]
+
+        batcher = EmbeddingBatcher(encode=encode, max_wait_ms=200, workers=2)
+        futures = [batcher.submit(text) for text in "abc"]
+        started.wait(5)
+        release.set()
+        for future in futures:
+            future.result(timeout=10)
+        self.assertEqual(calls, [["a", "b", "c"]])
+
+    @override_settings(IDEA_EMBEDDING_WORKERS=2)
+    def test_one_consumer_per_pool_worker(self):
+        with mock.patch.object(embeddings, "_batcher", None), mock.patch.object(embeddings, "_pool", None):
+            self.assertEqual(get_batcher().workers, 2)
+
+
+# ==================================================
+# CACHE VERSION STAMPS
+# ==================================================
+class FacetsCacheVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def category_names(self):
+        return [c["name"] for c in project_facets.get_raw_facets()["categories"]]
+
+    def test_bump_invalidates_facets(self):
+        self.assertEqual(self.category_names(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            InvestmentCategory.objects.create(name="Oil")
+        self.assertEqual(self.category_names(), ["Oil"])
+
+    def test_evicted_version_never_serves_older_facets(self):
+        self.category_names()
+        with self.captureOnCommitCallbacks(execute=True):
+            InvestmentCategory.objects.create(name="Oil")
+        self.category_names()
+        # A counter would restart and reach the first version's key again
+        cache.delete(project_facets.FACETS_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            InvestmentCategory.objects.create(name="Coir")
+        self.assertEqual(self.category_names(), ["Coir", "Oil"])
+
+
+class DashboardCacheVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def total_users(self):
+        return dashboard_stats.get_platform_stats()[0]["total_users"]
+
+    def test_evicted_version_never_serves_older_stats(self):
+        self.assertEqual(self.total_users(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create(username="first")
+        self.assertEqual(self.total_users(), 1)
+        cache.delete(dashboard_stats.VERSION_KEY.format(name="platform"))
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create(username="second")
+        self.assertEqual(self.total_users(), 2)
+
+
+# ==================================================
+# FUNDING STATS
+# ==================================================
+class FundingStatsProgressTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.investor = User.objects.create(username="investor")
+        farmer = User.objects.create(username="farmer")
+        # Money raised before the stats existed: only current_amount has it
+        cls.project = InvestmentProject.objects.create(
+            title="Coir", description="", farmer=farmer, target_amount=1000, current_amount=300, status="active"
+        )
+
+    def invest(self, amount, status="completed"):
+        return Investment.objects.create(investor=self.investor, project=self.project, amount=amount, status=status)
+
+    def stats(self):
+        return ProjectFundingStats.objects.get(project=self.project)
+
+    def assert_matches_project(self):
+        self.project.refresh_from_db()
+        self.assertAlmostEqual(self.stats().progress * 100, float(self.project.progress_percentage()))
+
+    def test_progress_follows_current_amount(self):
+        self.assert_matches_project()
+        self.invest(200)
+        self.assertEqual(self.stats().total_invested, 200)
+        self.assert_matches_project()
+
+    def test_rebuild_counts_completed_investments_only(self):
+        self.invest(200)
+        self.invest(100, status="pending")
+        funding_stats.rebuild()
+        stats = self.stats()
+        self.assertEqual((stats.total_invested, stats.investments_count), (200, 1))
+        self.assert_matches_project()
+
+    def test_funded_projects_leave_closest_to_funded(self):
+        self.invest(700)
+        # Reaching the target makes it "funded"; one that stays active is left out too
+        InvestmentProject.objects.filter(pk=self.project.pk).update(status="active")
+        self.assertEqual(funding_stats.leaderboard("closest_to_funded"), [])
+
+
+# ==================================================
+# IDEA API
+# ==================================================
+class IdeaSerializerTests(TestCase):
+    def test_similarity_sweep_flag_is_not_exposed(self):
+        author = User.objects.create(username="author")
+        idea = Idea.objects.create(
+            author=author, title="Coir mats", short_description="", full_description="", embedding=[1.0, 0.0]
+        )
+
+        serializer = IdeaSerializer(idea, data={"title": "Coir rugs", "needs_similarity_sweep": False}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data, {"title": "Coir rugs"})
+        self.assertNotIn("needs_similarity_sweep", IdeaSerializer(idea).data)
+
+
+# ==================================================
+# THUMBNAILS
+# ==================================================
+class ImageSavedTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(thumbnails, "schedule")
+        self.schedule = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def save(self, news, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            news.save(**kwargs)
+
+    def scheduled(self):
+        return [call.args[0] for call in self.schedule.call_args_list]
+
+    def test_new_image_is_scheduled_once(self):
+        news = News(title="Harvest", date="2026-10-01", image="news/a.jpg")
+        self.save(news)
+        self.assertEqual(self.scheduled(), ["news/a.jpg"])
+        self.assertTrue(ImageThumbnails.objects.filter(source="news/a.jpg").exists())
+
+    def test_unrelated_edits_skip_thumbnails(self):
+        self.save(News(title="Harvest", date="2026-10-01", image="news/a.jpg"))
+        self.schedule.reset_mock()
+
+        news = News.objects.get()
+        news.title = "Harvest report"
+        with self.assertNumQueries(1):
+            self.save(news)
+        self.save(news, update_fields=["title"])
+        deferred = News.objects.defer("image").get()
+        self.save(deferred)
+        self.assertEqual(self.scheduled(), [])
+
+    def test_changed_image_is_scheduled(self):
+        self.save(News(title="Harvest", date="2026-10-01", image="news/a.jpg"))
+        news = News.objects.get()
+        news.image = "news/b.jpg"
+        self.save(news)
+        self.assertEqual(self.scheduled(), ["news/a.jpg", "news/b.jpg"])
+
+    def test_recorded_source_is_not_scheduled_again(self):
+        ImageThumbnails.objects.create(source="news/a.jpg", status="ready")
+        self.save(News(title="Harvest", date="2026-10-01", image="news/a.jpg"))
+        self.assertEqual(self.scheduled(), [])
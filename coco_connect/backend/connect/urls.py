@@ -114,9 +114,22 @@ urlpatterns = [
     path("projects/", views.get_projects, name="get_projects"),
     path("projects/<int:project_id>/", views.get_project_detail, name="get_project_detail"),
     path("make-investment/", views.make_investment, name="make_investment"),
+    path("projects/<int:project_id>/reserve-units/", views.reserve_units, name="reserve_units"),
+    path(
+        "unit-reservations/<int:reservation_id>/confirm/",
+        views.confirm_unit_reservation,
+        name="confirm_unit_reservation",
+    ),
+    path(
+        "unit-reservations/<int:reservation_id>/release/",
+        views.release_unit_reservation,
+        name="release_unit_reservation",
+    ),
     path("my-investments/", views.my_investments, name="my_investments"),
     path("categories/", views.get_categories, name="get_categories"),
     path("locations/", views.get_locations, name="get_locations"),
+    path("projects/facets/", views.get_project_facets, name="get_project_facets"),
+    path("projects/leaderboard/", views.get_project_leaderboard, name="get_project_leaderboard"),
     path("stats/", views.get_platform_stats, name="get_platform_stats"),
     path( "create-demo-projects/",views.create_demo_projects,name="create_demo_projects", ),
 
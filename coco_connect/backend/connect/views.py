@@ -3,15 +3,22 @@ from django.contrib.auth.models import User, Group
 from django.contrib.auth import authenticate, login as auth_login
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
-from django.db.models import Q, Sum
+from django.db.models import Q
 from django.utils import timezone
 from django.conf import settings
 from django.db import transaction
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from .permissions import IsOwner
-from .services.embeddings import get_embedding
-from .services.similarity import cosine_similarity
+from .services.embeddings import EmbeddingOverloaded, get_embedding, build_idea_text
+from .services.embedding_index import get_index as get_embedding_index
+from .services import dashboard_stats, funding_stats, thumbnails
+from .services.pagination import InvalidCursor, parse_limit
+from .services.project_listing import filter_projects, paginate_projects
+from .services.project_facets import get_facets
+from .services.response_cache import cached_view
+from .services import unit_reservations
+from .services.unit_reservations import ReservationNotHeld, UnitsUnavailable
 from .serializers import AuthLogSerializer
 from .models import AuthLog
 
@@ -50,6 +57,7 @@ from .models import (
     Product,
     News,
     SimilarityAlert,
+    UnitReservation,
 )
 from products.models import Order
 from .serializers import (
@@ -63,6 +71,9 @@ from .investment_serializers import (
     InvestmentProjectListSerializer,
     InvestmentCreateSerializer,
     MyInvestmentSerializer,
+    UnitReservationSerializer,
+    PROJECT_LIST_VALUES,
+    project_list_data,
 )
 from django.contrib.auth.models import Group
 from django.views.decorators.csrf import csrf_exempt
@@ -995,30 +1006,22 @@ class IdeaViewSet(ModelViewSet):
         return [IsAuthenticatedOrReadOnly()]
 
     def build_text(self, title, short_desc, full_desc):
-        # Combines both styles ("Title: …" and plain join) in a stable way
-        title = title or ""
-        short_desc = short_desc or ""
-        full_desc = full_desc or ""
-        return f"Title: {title}\nShort Description: {short_desc}\nFull Description: {full_desc}".strip()
+        return build_idea_text(title, short_desc, full_desc)
 
     def find_similar(self, embedding, exclude_id=None):
         """
         Returns top 5 similar ideas, including Idea objects for alerts + UI.
         """
-        matches = []
-        qs = Idea.objects.exclude(embedding=None)
+        hits = get_embedding_index().search(embedding, k=5, exclude_id=exclude_id)
 
-        if exclude_id:
-            qs = qs.exclude(id=exclude_id)
+        # Only the top hits are loaded from the DB (ideas deleted meanwhile are skipped)
+        ideas = Idea.objects.select_related("author").in_bulk([idea_id for idea_id, _ in hits])
 
-        for idea in qs:
-            score = cosine_similarity(embedding, idea.embedding)
-            if score is None:
-                continue
-            matches.append({"idea": idea, "score": float(score)})
-
-        matches.sort(key=lambda x: x["score"], reverse=True)
-        return matches[:5]
+        return [
+            {"idea": ideas[idea_id], "score": score}
+            for idea_id, score in hits
+            if idea_id in ideas
+        ]
 
     def serialize_matches(self, matches):
         return [
@@ -1033,7 +1036,16 @@ class IdeaViewSet(ModelViewSet):
             for m in matches
         ]
 
-    @transaction.atomic
+    def overloaded_response(self):
+        return Response(
+            {
+                "type": "BUSY",
+                "message": "The similarity check is busy right now. Please try again in a moment.",
+            },
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "5"},
+        )
+
     def create(self, request, *args, **kwargs):
         title = request.data.get("title", "") or ""
         short_desc = request.data.get("short_description", "") or ""
@@ -1046,7 +1058,10 @@ class IdeaViewSet(ModelViewSet):
             "yes",
         ]
 
-        embedding = get_embedding(self.build_text(title, short_desc, full_desc))
+        try:
+            embedding = get_embedding(self.build_text(title, short_desc, full_desc))
+        except EmbeddingOverloaded:
+            return self.overloaded_response()
 
         matches = self.find_similar(embedding)
         best_score = matches[0]["score"] if matches else 0.0
@@ -1082,28 +1097,20 @@ class IdeaViewSet(ModelViewSet):
             )
 
         # 🟢 CREATE
+        # Only the writes run in the transaction (the embedding is computed above)
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        new_idea = serializer.save(
-            author=request.user,
-            embedding=embedding,
-        )
-
-        add_group(request.user, "Idea Creator")
+        with transaction.atomic():
+            new_idea = serializer.save(
+                author=request.user,
+                embedding=embedding,
+            )
 
-        # Create alerts when forced publish within warning zone
-        if self.WARNING_THRESHOLD <= best_score < self.BLOCK_THRESHOLD:
-            for m in matches:
-                old_idea = m["idea"]
-                if old_idea.author_id == request.user.id:
-                    continue
+            add_group(request.user, "Idea Creator")
 
-                SimilarityAlert.objects.get_or_create(
-                    idea=old_idea,          # ORIGINAL
-                    similar_idea=new_idea,  # NEW
-                    defaults={"similarity_score": round(m["score"], 3)},
-                )
+        # SimilarityAlerts for the owners of similar ideas are created by the
+        # background sweeper (manage.py sweep_similarity_alerts), not here
 
         return Response(self.get_serializer(new_idea).data, status=status.HTTP_201_CREATED)
 
@@ -1114,7 +1121,10 @@ class IdeaViewSet(ModelViewSet):
         short_desc = request.data.get("short_description", instance.short_description)
         full_desc = request.data.get("full_description", instance.full_description)
 
-        embedding = get_embedding(self.build_text(title, short_desc, full_desc))
+        try:
+            embedding = get_embedding(self.build_text(title, short_desc, full_desc))
+        except EmbeddingOverloaded:
+            return self.overloaded_response()
 
         matches = self.find_similar(embedding, exclude_id=instance.id)
         best_score = matches[0]["score"] if matches else 0.0
@@ -1142,7 +1152,10 @@ class IdeaViewSet(ModelViewSet):
         short_desc = request.data.get("short_description", instance.short_description)
         full_desc = request.data.get("full_description", instance.full_description)
 
-        embedding = get_embedding(self.build_text(title, short_desc, full_desc))
+        try:
+            embedding = get_embedding(self.build_text(title, short_desc, full_desc))
+        except EmbeddingOverloaded:
+            return self.overloaded_response()
 
         matches = self.find_similar(embedding, exclude_id=instance.id)
         best_score = matches[0]["score"] if matches else 0.0
@@ -1304,9 +1317,92 @@ def make_investment(request):
 
         return Response({'success': False, 'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
+    except UnitsUnavailable as e:
+        return Response({'success': False, 'error': str(e)}, status=status.HTTP_409_CONFLICT)
     except Exception as e:
         return Response({'success': False, 'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+# =================================================
+# UNIT RESERVATIONS (hold units, then pay)
+# =================================================
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def reserve_units(request, project_id):
+    """
+    Holds units of a unit-based project for UNIT_RESERVATION_TTL seconds;
+    confirm the reservation to turn it into an investment.
+    """
+    try:
+        units = int(request.data.get('units', 0))
+    except (TypeError, ValueError):
+        units = 0
+    if units < 1:
+        return Response({'success': False, 'error': 'Minimum 1 unit required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        project = InvestmentProject.objects.get(id=project_id)
+    except InvestmentProject.DoesNotExist:
+        return Response({'success': False, 'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        reservation = unit_reservations.reserve(project, request.user, units)
+    except UnitsUnavailable as e:
+        return Response({'success': False, 'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    return Response(
+        {'success': True, 'reservation': UnitReservationSerializer(reservation).data},
+        status=status.HTTP_201_CREATED,
+    )
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def confirm_unit_reservation(request, reservation_id):
+    try:
+        reservation = UnitReservation.objects.select_related('project').get(
+            id=reservation_id, investor=request.user
+        )
+    except UnitReservation.DoesNotExist:
+        return Response({'success': False, 'error': 'Reservation not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    txid = "INV-" + timezone.now().strftime("%Y%m%d-%H%M%S") + "-" + "".join(
+        random.choices(string.ascii_uppercase + string.digits, k=6)
+    )
+    try:
+        investment = unit_reservations.confirm(
+            reservation,
+            payment_method=request.data.get('payment_method', 'payhere'),
+            notes=request.data.get('notes', ''),
+            transaction_id=txid,
+            status='completed',
+            payment_status='completed',
+        )
+    except ReservationNotHeld as e:
+        return Response({'success': False, 'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    add_group(request.user, "Investor")
+
+    return Response({
+        'success': True,
+        'message': 'Investment successful!',
+        'investment': MyInvestmentSerializer(investment).data,
+        'ownership_percentage': investment.ownership_percentage
+    }, status=status.HTTP_201_CREATED)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def release_unit_reservation(request, reservation_id):
+    try:
+        reservation = UnitReservation.objects.get(id=reservation_id, investor=request.user)
+    except UnitReservation.DoesNotExist:
+        return Response({'success': False, 'error': 'Reservation not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    if not unit_reservations.release(reservation):
+        return Response(
+            {'success': False, 'error': 'This reservation was already used, released or has expired'},
+            status=status.HTTP_409_CONFLICT,
+        )
+    return Response({'success': True, 'reservation': UnitReservationSerializer(reservation).data})
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def get_projects_api(request):
@@ -1324,49 +1420,28 @@ def get_projects_api(request):
         
         # ... (rest of your filtering code remains the same) ...
         
-        # Handle funding_needed sorting
-        if sort_by == 'funding_needed':
-            projects_list = list(queryset)
-            projects_list.sort(key=lambda p: float(p.target_amount - p.current_amount), reverse=True)
-        else:
-            projects_list = list(queryset)
-        
-        # ROBUST FIX: Add missing fields with proper error handling
-        for project in projects_list:
-            try:
-                # Check if total_units exists as a database field
-                if not hasattr(project, 'total_units') or project.total_units is None:
-                    project.total_units = 1000
-                if not hasattr(project, 'available_units') or project.available_units is None:
-                    project.available_units = 1000
-                if not hasattr(project, 'unit_price') or project.unit_price is None:
-                    project.unit_price = project.target_amount / 1000 if project.target_amount > 0 else 0
-                if not hasattr(project, 'investment_structure') or project.investment_structure is None:
-                    project.investment_structure = 'fixed'
-                if not hasattr(project, 'farmer_name') or project.farmer_name is None:
-                    project.farmer_name = f"{project.farmer.first_name} {project.farmer.last_name}".strip()
-                if not hasattr(project, 'farmer_experience') or project.farmer_experience is None:
-                    project.farmer_experience = 0
-                if not hasattr(project, 'farmer_rating') or project.farmer_rating is None:
-                    project.farmer_rating = 4.5
-            except Exception as e:
-                print(f"Error setting defaults for project {project.id}: {e}")
-                # Set defaults anyway
-                project.total_units = 1000
-                project.available_units = 1000
-                project.unit_price = project.target_amount / 1000 if hasattr(project, 'target_amount') and project.target_amount > 0 else 0
-                project.investment_structure = 'fixed'
-        
-        serializer = InvestmentProjectListSerializer(projects_list, many=True)
+        total = queryset.count()
+
+        # Sorting (incl. funding_needed) and paging happen in SQL; the page is
+        # read as plain values() rows and turned into the list payload directly
+        try:
+            rows, next_cursor = paginate_projects(
+                request.GET, queryset, sort_by, values=PROJECT_LIST_VALUES
+            )
+        except InvalidCursor as e:
+            return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Get unique categories and locations for filters
-        categories = InvestmentCategory.objects.values_list('name', flat=True).distinct()
-        locations = InvestmentProject.objects.values_list('location', flat=True).distinct()
+        # Filter dropdown values (cached, see services/project_facets.py)
+        facets = get_facets()
+        categories = sorted({c['name'] for c in facets['categories']})
+        locations = facets['locations']
         
         return Response({
             'success': True,
-            'projects': serializer.data,
-            'total': len(projects_list),
+            'projects': project_list_data(rows),
+            'total': total,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
             'categories': list(categories),
             'locations': list(locations)
         })
@@ -1384,63 +1459,20 @@ def get_projects_api(request):
 # EXISTING INVESTMENT ENDPOINTS (keep for backward compatibility)
 # =================================================
 
+@cached_view(InvestmentProject, InvestmentCategory, User)
 @csrf_exempt
 def get_projects(request):
     try:
-        projects_qs = InvestmentProject.objects.select_related("category", "farmer").all()
-
-        category = request.GET.get("category", "")
-        if category and category != "All Categories":
-            projects_qs = projects_qs.filter(category__name=category)
+        projects_qs = filter_projects(request.GET)
+        search = request.GET.get("search", "")
 
-        location = request.GET.get("location", "")
-        if location and location != "All Locations":
-            projects_qs = projects_qs.filter(location=location)
+        total = projects_qs.count()
 
-        min_roi = request.GET.get("minROI", "0")
-        max_roi = request.GET.get("maxROI", "50")
+        sort_by = request.GET.get("sortBy") or ("relevance" if search else "roi_desc")
         try:
-            projects_qs = projects_qs.filter(expected_roi__gte=decimal.Decimal(min_roi))
-            projects_qs = projects_qs.filter(expected_roi__lte=decimal.Decimal(max_roi))
-        except Exception:
-            pass
-
-        risk_level = request.GET.get("riskLevel", "")
-        if risk_level:
-            projects_qs = projects_qs.filter(risk_level=risk_level)
-
-        investment_type = request.GET.get("investmentType", "")
-        if investment_type and investment_type != "all":
-            projects_qs = projects_qs.filter(investment_type=investment_type)
-
-        search = request.GET.get("search", "")
-        if search:
-            projects_qs = projects_qs.filter(
-                Q(title__icontains=search)
-                | Q(description__icontains=search)
-                | Q(farmer__first_name__icontains=search)
-                | Q(farmer__last_name__icontains=search)
-            )
-
-        status_q = request.GET.get("status", "")
-        if status_q:
-            projects_qs = projects_qs.filter(status=status_q)
-
-        sort_by = request.GET.get("sortBy", "roi_desc")
-        if sort_by == "roi_desc":
-            projects_qs = projects_qs.order_by("-expected_roi")
-        elif sort_by == "roi_asc":
-            projects_qs = projects_qs.order_by("expected_roi")
-        elif sort_by == "date_newest":
-            projects_qs = projects_qs.order_by("-created_at")
-        elif sort_by == "date_oldest":
-            projects_qs = projects_qs.order_by("created_at")
-        elif sort_by == "popularity":
-            projects_qs = projects_qs.order_by("-investors_count")
-
-        projects_list = list(projects_qs)
-        if sort_by == "funding_needed":
-            projects_list.sort(key=lambda p: float(p.funding_needed()), reverse=True)
+            projects_list, next_cursor = paginate_projects(request.GET, projects_qs, sort_by)
+        except InvalidCursor as e:
+            return JsonResponse({"success": False, "error": str(e)}, status=400)
 
         projects_data = []
         for project in projects_list:
@@ -1469,7 +1501,15 @@ def get_projects(request):
                 }
             )
 
-        return JsonResponse({"success": True, "projects": projects_data, "total": len(projects_data)})
+        return JsonResponse(
+            {
+                "success": True,
+                "projects": projects_data,
+                "total": total,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+        )
 
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)}, status=500)
@@ -1503,6 +1543,8 @@ def get_project_detail(request, project_id):
                     "days_left": project.days_left,
                     "progress_percentage": float(project.progress_percentage()),
                     "funding_needed": float(project.funding_needed()),
+                    "image": thumbnails.media_url(project.image.name) if project.image else None,
+                    "image_srcset": thumbnails.srcset(project.image.name) if project.image else None,
                 },
             }
         )
@@ -1605,51 +1647,59 @@ def my_investments(request):
         )
     return Response(data)
 
+@cached_view(InvestmentCategory, InvestmentProject)
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def get_categories(request):
-    qs = InvestmentCategory.objects.all().order_by("name")
-    return Response([{"id": c.id, "name": c.name, "slug": getattr(c, 'slug', c.name.lower().replace(' ', '-')), "description": c.description} for c in qs])
+    # ?counts=1 adds the number of projects per category (?status= narrows it)
+    counts = request.GET.get("counts") in ("1", "true")
+    facets = get_facets(status=request.GET.get("status") or None, counts=counts)
+    return Response(facets["categories"])
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_locations(request):
-    # Minimal: derive locations from projects (no separate Location model needed)
-    qs = InvestmentProject.objects.all()
+    # Derived from projects (no separate Location model needed), cached
+    counts = request.GET.get("counts") in ("1", "true")
+    facets = get_facets(status=request.GET.get("status") or None, counts=counts)
+    return Response(facets["locations"])
 
-    values = []
-    for field in ["location", "district", "city", "area"]:
-        try:
-            values = list(qs.values_list(field, flat=True))
-            break
-        except Exception:
-            continue
+@cached_view(InvestmentCategory, InvestmentProject)
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def get_project_facets(request):
+    """
+    All project filter values in one call: categories, locations, risk levels
+    and an ROI histogram; ?counts=1 adds per-value project counts.
+    """
+    counts = request.GET.get("counts") in ("1", "true")
+    return Response(get_facets(status=request.GET.get("status") or None, counts=counts))
 
-    cleaned = sorted({v.strip() for v in values if isinstance(v, str) and v.strip()})
-    return Response(cleaned)
+@cached_view(InvestmentProject, InvestmentCategory)
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def get_project_leaderboard(request):
+    """
+    Top active projects from the materialized funding stats:
+    ?by=trending (recent investment, default) or closest_to_funded, ?limit= (max 50).
+    """
+    by = request.GET.get("by") or "trending"
+    if by not in funding_stats.LEADERBOARDS:
+        return Response(
+            {"error": f"by must be one of: {', '.join(funding_stats.LEADERBOARDS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    limit = parse_limit(request.GET.get("limit"), 10, 50)
+    return Response({"by": by, "projects": funding_stats.leaderboard(by, limit)})
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_platform_stats(request):
-    total_projects = InvestmentProject.objects.count()
-    active_projects = InvestmentProject.objects.filter(status="active").count()
-
-    total_investments = Investment.objects.count()
-    total_invested_amount = Investment.objects.filter(status="completed").aggregate(
-        total=Sum("amount")
-    )["total"] or decimal.Decimal("0")
-
-    total_users = User.objects.count()
-
-    return Response(
-        {
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "total_investments": total_investments,
-            "total_invested_amount": float(total_invested_amount),
-            "total_users": total_users,
-        }
-    )
+    # One query, cached for a few seconds (services/dashboard_stats.py)
+    data, timings = dashboard_stats.get_platform_stats()
+    if settings.DEBUG:
+        data = {**data, "timings": timings}
+    return Response(data)
 
 
 @api_view(["POST"])
@@ -1850,17 +1900,9 @@ def admin_auth_logs_stats(request):
         days = 7
     days = max(1, min(days, 365))
 
-    start = timezone.now() - timezone.timedelta(days=days)
-
-    qs = AuthLog.objects.filter(created_at__gte=start)
-
-    data = {
-        "days": days,
-        "total": qs.count(),
-        "login_success": qs.filter(action="LOGIN", status="SUCCESS").count(),
-        "login_failed": qs.filter(action="LOGIN", status="FAILED").count(),
-        "logout_success": qs.filter(action="LOGOUT", status="SUCCESS").count(),
-    }
+    data, timings = dashboard_stats.get_auth_log_stats(days)
+    if settings.DEBUG:
+        data = {**data, "timings": timings}
     return Response(data)
 
 
@@ -0,0 +1,57 @@
+# products/apps.py
+from django.apps import AppConfig
+
+
+class ProductsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "products"
+
+    def ready(self):
+        # Cached public listings (connect/services/response_cache.py) go stale with these
+        from django.db.models.signals import post_init, post_save, post_delete, pre_delete
+        from connect.services import response_cache
+        from .models import Category, NewsItem, Product, ProductType
+
+        for model in (Product, Category, ProductType, NewsItem):
+            for signal, event in ((post_save, "saved"), (post_delete, "deleted")):
+                signal.connect(
+                    response_cache.model_changed,
+                    sender=model,
+                    dispatch_uid=f"products.response_cache.{model.__name__}_{event}",
+                )
+
+        # Precomputed listing fields (services/product_cards.py)
+        from django.contrib.auth.models import User
+        from .services import product_cards
+
+        for model, receiver in (
+            (Product, product_cards.product_saved),
+            (Category, product_cards.category_saved),
+            (ProductType, product_cards.product_type_saved),
+            (User, product_cards.author_saved),
+        ):
+            post_save.connect(
+                receiver,
+                sender=model,
+                dispatch_uid=f"products.product_cards.{model.__name__}_saved",
+            )
+        pre_delete.connect(
+            product_cards.product_type_deleting,
+            sender=ProductType,
+            dispatch_uid="products.product_cards.ProductType_deleting",
+        )
+
+        # Uploaded images get thumbnails (connect/services/thumbnails.py)
+        from connect.services import thumbnails
+
+        for model in (Product, NewsItem):
+            post_init.connect(
+                thumbnails.image_loaded,
+                sender=model,
+                dispatch_uid=f"products.thumbnails.{model.__name__}_loaded",
+            )
+            post_save.connect(
+                thumbnails.image_saved,
+                sender=model,
+                dispatch_uid=f"products.thumbnails.{model.__name__}_saved",
+            )
@@ -0,0 +1,101 @@
+# products/management/commands/benchmark_product_cards.py
+import random
+import statistics
+import time
+import uuid
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+
+from connect.services.pagination import keyset_page
+from products.models import Category, Product, ProductType
+from products.serializers import PRODUCT_LIST_VALUES, ProductSerializer, product_list_data
+from products.services import product_cards
+from products.services.catalogue import plan_catalogue
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds N products (rolled back afterwards) and times one catalogue page of "
+        "--page-size products built by ProductSerializer (method fields, one "
+        "absolute URL per row) against product_list_data() over values() rows with "
+        "the precomputed cards. Checks both payloads are identical."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=10_000)
+        parser.add_argument("--page-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        # The serializer builds image URLs from the request's host: use the same
+        # one as BACKEND_PUBLIC_URL so the two payloads can be compared
+        public = urlsplit(getattr(settings, "BACKEND_PUBLIC_URL", "http://localhost:8000"))
+        request = RequestFactory().get(
+            "/api/products/", HTTP_HOST=public.netloc, secure=(public.scheme == "https")
+        )
+
+        with transaction.atomic():
+            self._seed(opts["products"])
+            t0 = time.perf_counter()
+            written = product_cards.refresh()
+            self.stdout.write(
+                f"Seeded {opts['products']} products, {written} cards in {time.perf_counter() - t0:.2f}s"
+            )
+
+            queryset, ordering = plan_catalogue({})
+            limit = opts["page_size"]
+
+            def serializer_page():
+                products, _ = keyset_page(queryset, ordering, limit=limit)
+                return ProductSerializer(products, many=True, context={"request": request}).data
+
+            def values_page():
+                rows, _ = keyset_page(queryset.values(*PRODUCT_LIST_VALUES, "created_at"), ordering, limit=limit)
+                return product_list_data(rows)
+
+            old, new = serializer_page(), values_page()
+            if [dict(item) for item in old] != new:
+                raise CommandError("product_list_data() differs from ProductSerializer")
+
+            rows = len(new)
+            for label, build in (("ProductSerializer", serializer_page), ("values() + cards", values_page)):
+                times = []
+                for _ in range(opts["repeat"]):
+                    t0 = time.perf_counter()
+                    build()
+                    times.append(time.perf_counter() - t0)
+                ms = statistics.median(times) * 1000
+                self.stdout.write(f"{label:<18} {rows} products: {ms:8.1f} ms ({ms * 1000 / rows:.1f} us/product)")
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Payloads match."))
+
+    def _seed(self, n):
+        rng = random.Random(0)
+        tag = uuid.uuid4().hex[:8]
+        categories = [Category.objects.create(name=f"Bench {tag} {i}", slug=f"bench-{tag}-{i}") for i in range(6)]
+        types = [ProductType.objects.create(name=f"Bench {tag} {i}") for i in range(3)] + [None]
+        authors = User.objects.bulk_create([User(username=f"card_seller_{tag}_{i}") for i in range(200)])
+
+        Product.objects.bulk_create(
+            [
+                Product(
+                    author=rng.choice(authors),
+                    name=f"Product {i}",
+                    description="Synthetic catalogue product",
+                    price=Decimal(rng.randrange(100, 100_000)) / 100,
+                    category=rng.choice(categories),
+                    product_type=rng.choice(types),
+                    image=f"products/synthetic_{i % 500}.jpg" if i % 10 else None,
+                )
+                for i in range(n)
+            ],
+            batch_size=5000,
+        )
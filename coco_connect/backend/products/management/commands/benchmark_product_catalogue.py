@@ -0,0 +1,206 @@
+# products/management/commands/benchmark_product_catalogue.py
+import random
+import re
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+
+from connect.services import response_cache
+from products.models import Category, Product, ProductCard, ProductType
+from products.serializers import PRODUCT_LIST_VALUES, ProductSerializer, product_list_data
+from products.services import product_cards
+from products.services.catalogue import catalogue_page, plan_catalogue
+
+CATEGORIES = ["coconut-oil", "coir-products", "fresh-produce", "processed-foods", "equipment", "organic"]
+TYPES = ["Raw Materials", "Processed Goods", "Equipment"]
+
+# (label, query params) - what the product page sends
+SHAPES = [
+    ("all / relevance", {}),
+    ("all / price_low_high", {"sort": "price_low_high"}),
+    ("category / relevance", {"category": "coir-products"}),
+    ("category / price_low_high", {"category": "coir-products", "sort": "price_low_high"}),
+    ("category + type / price_high_low", {"category": "organic", "type": "Raw Materials", "sort": "price_high_low"}),
+    (
+        "category + type + price_max / price_low_high",
+        {"category": "equipment", "type": "Equipment", "price_max": "250", "sort": "price_low_high"},
+    ),
+    ("type / price_low_high", {"type": "Processed Goods", "sort": "price_low_high"}),
+    ("price_max / price_high_low", {"price_max": "100", "sort": "price_high_low"}),
+]
+
+INDEX_RE = re.compile(r"(?:Index(?: Only)? Scan(?: Backward)? using (\w+)|Bitmap Index Scan on (\w+))")
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds N products (500k by default), then times the paginated catalogue "
+        "(query + payload, as the list endpoint builds it) per filter/sort shape, first and deep pages, and "
+        "under concurrent load. Prints the indexes each shape uses on PostgreSQL. "
+        "Everything it creates is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=500_000)
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=2000, help="Pages fetched in the load phase")
+        parser.add_argument("--deep", type=int, default=20, help="Pages followed per shape")
+        parser.add_argument(
+            "--compare-legacy",
+            action="store_true",
+            help="Also time the old unpaginated list for the filtered shapes",
+        )
+
+    def handle(self, *args, **opts):
+        tag = uuid.uuid4().hex[:8]
+        t0 = time.perf_counter()
+        authors = self._seed(tag, opts["products"])
+        self.stdout.write(f"Seeded {opts['products']} products in {time.perf_counter() - t0:.1f}s")
+
+        try:
+            self._run(opts)
+        finally:
+            self._cleanup(authors)
+
+    def _seed(self, tag, n):
+        rng = random.Random(0)
+        categories = [Category.objects.get_or_create(slug=slug, defaults={"name": slug})[0] for slug in CATEGORIES]
+        types = [ProductType.objects.get_or_create(name=name)[0] for name in TYPES]
+        authors = User.objects.bulk_create([User(username=f"catalogue_seller_{tag}_{i}") for i in range(200)])
+
+        batch = []
+        for i in range(n):
+            batch.append(
+                Product(
+                    author=rng.choice(authors),
+                    name=f"Product {i}",
+                    description="Synthetic catalogue product",
+                    price=Decimal(rng.randrange(100, 100_000)) / 100,
+                    category=rng.choice(categories),
+                    product_type=rng.choice(types),
+                    image=f"products/synthetic_{i % 500}.jpg",
+                )
+            )
+            if len(batch) >= 10_000:
+                Product.objects.bulk_create(batch)
+                batch = []
+        Product.objects.bulk_create(batch)
+        product_cards.refresh(Product.objects.filter(author__in=authors), batch_size=10_000)
+
+        table = Product._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # auto_now_add gave every row (nearly) the same timestamp
+                cursor.execute(
+                    f"UPDATE {table} SET created_at = now() - random() * interval '365 days' "
+                    f"WHERE author_id = ANY(%s)",
+                    [[a.pk for a in authors]],
+                )
+            cursor.execute(f"ANALYZE {table}")
+        return authors
+
+    def _cleanup(self, authors):
+        # Raw DELETEs: the ORM would collect 500k objects for the cascade
+        seeded = f"SELECT id FROM {Product._meta.db_table} WHERE author_id IN ({', '.join(['%s'] * len(authors))})"
+        with connection.cursor() as cursor:
+            for table, column in ((ProductCard._meta.db_table, "product_id"), (Product._meta.db_table, "id")):
+                cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({seeded})", [a.pk for a in authors])
+        User.objects.filter(pk__in=[a.pk for a in authors]).delete()
+        response_cache.bump(Product)
+
+    def _page(self, params):
+        t0 = time.perf_counter()
+        rows, next_cursor = catalogue_page(params, values=PRODUCT_LIST_VALUES)
+        product_list_data(rows)
+        return time.perf_counter() - t0, next_cursor
+
+    def _run(self, opts):
+        self.stdout.write(f"{'shape':<46} {'page 1':>9} {'deep p50':>9} {'deep max':>9}  indexes")
+        cursors = {}
+        for label, params in SHAPES:
+            first, cursor = self._page(params)
+            deep, cursors[label] = [], [None]
+            for _ in range(opts["deep"]):
+                if not cursor:
+                    break
+                cursors[label].append(cursor)
+                elapsed, cursor = self._page({**params, "cursor": cursor})
+                deep.append(elapsed)
+
+            self.stdout.write(
+                f"{label:<46} {first * 1000:>7.1f}ms "
+                f"{statistics.median(deep or [0]) * 1000:>7.1f}ms {max(deep or [0]) * 1000:>7.1f}ms  "
+                f"{self._indexes(params)}"
+            )
+
+        self._load(cursors, opts)
+
+        if opts["compare_legacy"]:
+            self.stdout.write("Legacy (whole filtered list, serialized):")
+            request = RequestFactory().get("/api/products/", HTTP_HOST="localhost")
+            for label, params in SHAPES[4:6]:
+                t0 = time.perf_counter()
+                qs = Product.objects.select_related("category", "product_type", "author").filter(
+                    category__slug=params["category"], product_type__name=params["type"]
+                )
+                if "price_max" in params:
+                    qs = qs.filter(price__lte=Decimal(params["price_max"]))
+                rows = ProductSerializer(qs.order_by("price"), many=True, context={"request": request}).data
+                self.stdout.write(f"  {label:<44} {len(rows)} rows in {(time.perf_counter() - t0) * 1000:.0f}ms")
+
+    def _load(self, cursors, opts):
+        # Random shapes at random depths, fetched by --workers threads at once
+        rng = random.Random(1)
+        tasks = []
+        for _ in range(opts["requests"]):
+            label, params = rng.choice(SHAPES)
+            cursor = rng.choice(cursors[label])
+            tasks.append({**params, "cursor": cursor} if cursor else params)
+
+        latencies, lock = [], threading.Lock()
+        start = threading.Event()
+
+        def worker(chunk):
+            mine = []
+            start.wait()
+            try:
+                for params in chunk:
+                    mine.append(self._page(params)[0])
+            finally:
+                connection.close()
+                with lock:
+                    latencies.extend(mine)
+
+        workers = opts["workers"]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(worker, tasks[i::workers]) for i in range(workers)]
+            t0 = time.perf_counter()
+            start.set()
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - t0
+
+        ms = sorted(x * 1000 for x in latencies)
+        self.stdout.write(
+            f"Load: {len(ms)} pages with {workers} workers in {elapsed:.2f}s ({len(ms) / elapsed:.0f} pages/s), "
+            f"p50 {statistics.median(ms):.1f}ms, p95 {ms[int(len(ms) * 0.95)]:.1f}ms, "
+            f"p99 {ms[int(len(ms) * 0.99)]:.1f}ms"
+        )
+
+    def _indexes(self, params):
+        if connection.vendor != "postgresql":
+            return "-"
+
+        queryset, ordering = plan_catalogue(params)
+        plan = queryset.values(*PRODUCT_LIST_VALUES).order_by(*ordering)[:25].explain()
+        if "Seq Scan on products_product" in plan:
+            return "SEQ SCAN"
+        return ", ".join(sorted({a or b for a, b in INDEX_RE.findall(plan)})) or "(no index)"
@@ -0,0 +1,22 @@
+# products/management/commands/refresh_product_cards.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.services import product_cards
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes every product's card (author name, type, category slug, absolute "
+        "image URL). Saves keep the cards current; run this after bulk imports or "
+        "after changing BACKEND_PUBLIC_URL / MEDIA_URL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        t0 = time.perf_counter()
+        written = product_cards.refresh(batch_size=opts["batch_size"])
+        self.stdout.write(f"Refreshed {written} product cards in {time.perf_counter() - t0:.2f}s")
@@ -0,0 +1,66 @@
+# Generated by Django 6.0 on 2026-10-17 23:05
+
+from urllib.parse import urljoin
+
+import django.db.models.deletion
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def create_cards(apps, schema_editor):
+    """
+    One card per existing product (products/services/product_cards.py
+    keeps them current from now on).
+    """
+    Product = apps.get_model("products", "Product")
+    ProductCard = apps.get_model("products", "ProductCard")
+    base = getattr(settings, "BACKEND_PUBLIC_URL", "").rstrip("/") + "/"
+
+    rows = Product.objects.values_list(
+        "id", "author__username", "author__email", "product_type__name", "category__slug", "image"
+    )
+    batch = []
+    for pk, username, email, type_name, category_slug, image in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(
+            ProductCard(
+                product_id=pk,
+                author_name=username or email,
+                type_name=type_name,
+                category_slug=category_slug,
+                image_url=urljoin(base, default_storage.url(image)) if image else None,
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            ProductCard.objects.bulk_create(batch)
+            batch = []
+
+    if batch:
+        ProductCard.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_product_catalogue_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductCard',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='products.product')),
+                ('author_name', models.CharField(blank=True, max_length=254, null=True)),
+                ('type_name', models.CharField(blank=True, max_length=50, null=True)),
+                ('category_slug', models.SlugField(blank=True, null=True)),
+                ('image_url', models.CharField(blank=True, max_length=500, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Product cards',
+            },
+        ),
+        migrations.RunPython(create_cards, migrations.RunPython.noop),
+    ]
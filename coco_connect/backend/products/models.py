@@ -96,6 +96,11 @@ class Product(models.Model):
         indexes = [
             models.Index(fields=["price"]),
             models.Index(fields=["created_at"]),
+            # Catalogue filter + sort shapes (services/catalogue.py)
+            models.Index(fields=["category", "product_type", "price", "id"], name="product_cat_type_price_idx"),
+            models.Index(fields=["category", "price", "id"], name="product_cat_price_idx"),
+            models.Index(fields=["product_type", "price", "id"], name="product_type_price_idx"),
+            models.Index(fields=["category", "created_at", "id"], name="product_cat_created_idx"),
         ]
 
     tx_hash = models.CharField(max_length=66, blank=True, null=True)
@@ -107,6 +112,37 @@ class Product(models.Model):
         return self.name
 
 
+# =========================
+# PRODUCT CARD
+# =========================
+class ProductCard(models.Model):
+    """
+    The related/derived fields a product listing shows, precomputed
+    (services/product_cards.py). Refreshed when the product, its category,
+    its type or its author is saved.
+    """
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="card",
+    )
+
+    author_name = models.CharField(max_length=254, null=True, blank=True)
+    type_name = models.CharField(max_length=50, null=True, blank=True)
+    category_slug = models.SlugField(null=True, blank=True)
+    # Absolute (BACKEND_PUBLIC_URL + MEDIA_URL), None without an image
+    image_url = models.CharField(max_length=500, null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Product cards"
+
+    def __str__(self):
+        return f"Card of product {self.product_id}"
+
+
 # =========================
 # NEWS
 # =========================
@@ -146,7 +182,10 @@ class Cart(models.Model):
 
     @property
     def total_items(self):
-        return sum(item.quantity for item in self.items.all())
+        # Summed in SQL (services/cart_summary.py), without loading the items
+        from .services.cart_summary import cart_totals
+
+        return cart_totals(self)["item_count"]
 
 
 # =========================
@@ -1,5 +1,9 @@
 # products/serializers.py
+from django.utils import timezone
 from rest_framework import serializers
+from connect.serializers import ImageSrcsetField, ThumbnailListSerializer, format_datetime
+from connect.services import thumbnails
+from .services.cart_batch import CART_OPERATIONS, MAX_CART_OPERATIONS
 from .models import Product, NewsItem, Category, ProductType, CartItem
 
 
@@ -14,9 +18,11 @@ class ProductSerializer(serializers.ModelSerializer):
 
     type = serializers.SerializerMethodField()
     image = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source="image")
 
     class Meta:
         model = Product
+        list_serializer_class = ThumbnailListSerializer
         fields = [
             "id",
             "name",
@@ -27,6 +33,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "category",
             "type",
             "image",
+            "image_srcset",
             "author",
             # ✅ BLOCKCHAIN FIELDS
             "tx_hash",
@@ -62,6 +69,58 @@ class ProductSerializer(serializers.ModelSerializer):
         return None
 
 
+# Columns product_list_data() needs (the card holds the precomputed ones)
+PRODUCT_LIST_VALUES = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "stock_status",
+    "reviews",
+    "author_id",
+    "tx_hash",
+    "product_hash",
+    "verified_at",
+    "image",
+    "card__author_name",
+    "card__type_name",
+    "card__category_slug",
+    "card__image_url",
+)
+
+
+def product_list_data(rows):
+    """
+    Same payload as ProductSerializer(products, many=True).data, built
+    straight from queryset.values(*PRODUCT_LIST_VALUES) rows (no model
+    instances, no per-row method fields) plus one srcset lookup. Image URLs are absolute on
+    BACKEND_PUBLIC_URL rather than the request's host.
+    """
+    tz = timezone.get_current_timezone()
+    srcsets = thumbnails.lookup(row["image"] for row in rows)
+    return [
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "price": f"{row['price']:f}",
+            "stock_status": row["stock_status"],
+            "reviews": row["reviews"],
+            "category": row["card__category_slug"],
+            "type": row["card__type_name"],
+            "image": row["card__image_url"],
+            "image_srcset": srcsets.get(row["image"]),
+            "author": (
+                None if row["author_id"] is None else {"id": row["author_id"], "name": row["card__author_name"]}
+            ),
+            "tx_hash": row["tx_hash"],
+            "product_hash": row["product_hash"],
+            "verified_at": format_datetime(row["verified_at"], tz),
+        }
+        for row in rows
+    ]
+
+
 # =========================
 # PRODUCT CREATE SERIALIZER
 # =========================
@@ -188,10 +247,12 @@ class ProductUpdateSerializer(serializers.ModelSerializer):
 # =========================
 class NewsSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source="image")
 
     class Meta:
         model = NewsItem
-        fields = ["id", "text", "image"]
+        list_serializer_class = ThumbnailListSerializer
+        fields = ["id", "text", "image", "image_srcset"]
 
     def get_image(self, obj):
         try:
@@ -217,15 +278,18 @@ class CartItemSerializer(serializers.ModelSerializer):
         read_only=True,
     )
     product_image = serializers.SerializerMethodField()
+    product_image_srcset = ImageSrcsetField(source="product.image")
 
     class Meta:
         model = CartItem
+        list_serializer_class = ThumbnailListSerializer
         fields = [
             "id",
             "product",
             "product_name",
             "product_price",
             "product_image",
+            "product_image_srcset",
             "quantity",
         ]
 
@@ -239,3 +303,45 @@ class CartItemSerializer(serializers.ModelSerializer):
         except Exception:
             pass
         return None
+
+
+def cart_items_data(lines):
+    """
+    CartItemSerializer's payload (plus "line_total") for the lines of
+    cart_summary(), with one srcset lookup. Image URLs are absolute on
+    BACKEND_PUBLIC_URL rather than the request's host.
+    """
+    srcsets = thumbnails.lookup(line["product__image"] for line in lines)
+    return [
+        {
+            "id": line["id"],
+            "product": line["product_id"],
+            "product_name": line["product__name"],
+            "product_price": f"{line['product__price']:f}",
+            "product_image": line["product__card__image_url"],
+            "product_image_srcset": srcsets.get(line["product__image"]),
+            "quantity": line["quantity"],
+            "line_total": f"{line['line_total']:f}",
+        }
+        for line in lines
+    ]
+
+
+# =========================
+# CART BATCH SERIALIZERS
+# =========================
+class CartOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=CART_OPERATIONS)
+    product_id = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, attrs):
+        if attrs["op"] == "add" and attrs.get("quantity", 1) < 1:
+            raise serializers.ValidationError({"quantity": "Must be at least 1 to add."})
+        if attrs["op"] == "update" and "quantity" not in attrs:
+            raise serializers.ValidationError({"quantity": "Required to update."})
+        return attrs
+
+
+class CartBatchSerializer(serializers.Serializer):
+    operations = CartOperationSerializer(many=True, allow_empty=False, max_length=MAX_CART_OPERATIONS)
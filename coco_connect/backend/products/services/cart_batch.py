@@ -0,0 +1,80 @@
+# products/services/cart_batch.py
+
+from django.db import transaction
+
+# "op" values of a batch: add (increase by quantity), update (set the
+# quantity; 0 removes the line) and remove
+CART_OPERATIONS = ("add", "update", "remove")
+MAX_CART_OPERATIONS = 100
+
+
+class UnknownProducts(Exception):
+    def __init__(self, product_ids):
+        self.product_ids = sorted(product_ids)
+        super().__init__(f"Products not found: {', '.join(map(str, self.product_ids))}")
+
+
+def _fold(operations, quantities):
+    """
+    Applies the operations in order to {product_id: quantity} (None = not
+    in the cart) and returns the result: one final state per product.
+    """
+    quantities = dict(quantities)
+    for operation in operations:
+        product_id = operation["product_id"]
+        if operation["op"] == "add":
+            quantities[product_id] = (quantities.get(product_id) or 0) + operation.get("quantity", 1)
+        elif operation["op"] == "update":
+            quantities[product_id] = operation["quantity"] or None
+        else:
+            quantities[product_id] = None
+    return quantities
+
+
+def apply_operations(user, operations):
+    """
+    Applies cart operations ({"op", "product_id", "quantity"}) all at once:
+    one transaction and a fixed number of queries (the cart row locked, a
+    read of the lines involved, one DELETE, one upsert) however many
+    operations there are.
+    Returns the cart. Raises UnknownProducts (nothing applied) when an
+    add/update names a product that doesn't exist.
+    """
+    from products.models import Cart, CartItem, Product
+
+    product_ids = {operation["product_id"] for operation in operations}
+    added = {operation["product_id"] for operation in operations if operation["op"] != "remove"}
+
+    with transaction.atomic():
+        cart, _ = Cart.objects.get_or_create(user=user)
+        # Locking the cart row makes concurrent batches of the same user apply
+        # one after the other (locking its lines alone wouldn't cover new ones)
+        cart = Cart.objects.select_for_update().get(pk=cart.pk)
+        missing = added - set(Product.objects.filter(id__in=added).values_list("id", flat=True))
+        if missing:
+            raise UnknownProducts(missing)
+
+        current = dict(
+            CartItem.objects.filter(cart=cart, product_id__in=product_ids).values_list("product_id", "quantity")
+        )
+        final = _fold(operations, current)
+
+        removed = [pk for pk, quantity in final.items() if quantity is None and pk in current]
+        changed = [
+            CartItem(cart=cart, product_id=pk, quantity=quantity)
+            for pk, quantity in final.items()
+            if quantity is not None and quantity != current.get(pk)
+        ]
+        if removed:
+            CartItem.objects.filter(cart=cart, product_id__in=removed).delete()
+        if changed:
+            # New lines and changed quantities in one statement; a line added
+            # meanwhile by a single-item request (which doesn't lock the cart)
+            # is overwritten
+            CartItem.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=["cart", "product"],
+                update_fields=["quantity"],
+            )
+    return cart
@@ -0,0 +1,72 @@
+# products/services/cart_summary.py
+
+from decimal import Decimal
+
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Window
+from django.db.models.functions import Coalesce
+
+# What a cart line carries (product columns are joined, not loaded as models)
+CART_LINE_VALUES = (
+    "id",
+    "product_id",
+    "product__name",
+    "product__price",
+    "product__image",
+    "product__card__image_url",
+    "quantity",
+)
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+# SQLite hands computed decimals back unrounded ("1.98000000000000")
+CENT = Decimal("0.01")
+
+
+def _line_total():
+    return ExpressionWrapper(F("quantity") * F("product__price"), output_field=MONEY)
+
+
+def cart_summary(cart):
+    """
+    {"item_count", "subtotal", "lines"} of a cart (instance or id) from one
+    query: each line's total is computed in SQL and the cart totals come
+    along on every row as window aggregates. Lines are values() dicts with
+    CART_LINE_VALUES plus "line_total", oldest first.
+    """
+    from products.models import CartItem
+
+    rows = list(
+        CartItem.objects.filter(cart=cart)
+        .annotate(
+            line_total=_line_total(),
+            cart_item_count=Window(Sum("quantity")),
+            cart_subtotal=Window(Sum(_line_total(), output_field=MONEY)),
+        )
+        .order_by("id")
+        .values(*CART_LINE_VALUES, "line_total", "cart_item_count", "cart_subtotal")
+    )
+    if not rows:
+        return {"item_count": 0, "subtotal": Decimal("0.00"), "lines": []}
+
+    summary = {
+        "item_count": rows[0]["cart_item_count"],
+        "subtotal": rows[0]["cart_subtotal"].quantize(CENT),
+        "lines": rows,
+    }
+    for row in rows:
+        row["line_total"] = row["line_total"].quantize(CENT)
+        del row["cart_item_count"], row["cart_subtotal"]
+    return summary
+
+
+def cart_totals(cart):
+    """
+    Just {"item_count", "subtotal"} of a cart, as one aggregate.
+    """
+    from products.models import CartItem
+
+    totals = CartItem.objects.filter(cart=cart).aggregate(
+        item_count=Coalesce(Sum("quantity"), 0),
+        subtotal=Coalesce(Sum(_line_total()), Decimal("0.00"), output_field=MONEY),
+    )
+    totals["subtotal"] = totals["subtotal"].quantize(CENT)
+    return totals
@@ -0,0 +1,86 @@
+# products/services/catalogue.py
+
+from decimal import Decimal, InvalidOperation
+
+from connect.services.pagination import keyset_page, parse_limit
+
+# ?sort= -> ordering; every order ends on id so cursor positions are unique.
+# "relevance" (the frontend default) is the newest-first Meta ordering.
+CATALOGUE_SORTS = {
+    "relevance": ("-created_at", "-id"),
+    "price_low_high": ("price", "id"),
+    "price_high_low": ("-price", "-id"),
+}
+CATALOGUE_PAGE_SIZE = 24
+MAX_CATALOGUE_PAGE_SIZE = 100
+
+
+def _resolve_id(model, **lookup):
+    return model.objects.filter(**lookup).values_list("id", flat=True).first()
+
+
+def plan_catalogue(params):
+    """
+    Returns (queryset, ordering) for the catalogue filters (?category= slug,
+    ?type= name, ?price_max=, ?author= id, ?sort=), or None when a filter
+    matches nothing.
+
+    Slugs/names are resolved to ids first, so the product query filters and
+    sorts on its own columns only; that's the shape of the composite
+    (category, product_type, price) / (category, created_at) indexes.
+    """
+    from products.models import Category, Product, ProductType
+
+    queryset = Product.objects.select_related("category", "product_type", "author")
+
+    category = params.get("category")
+    if category and category != "all":
+        category_id = _resolve_id(Category, slug=category)
+        if category_id is None:
+            return None
+        queryset = queryset.filter(category_id=category_id)
+
+    product_type = params.get("type")
+    if product_type and product_type != "all":
+        type_id = _resolve_id(ProductType, name=product_type)
+        if type_id is None:
+            return None
+        queryset = queryset.filter(product_type_id=type_id)
+
+    price_max = params.get("price_max")
+    if price_max:
+        try:
+            queryset = queryset.filter(price__lte=Decimal(str(price_max)))
+        except (InvalidOperation, ValueError, TypeError):
+            pass
+
+    author = params.get("author")
+    if author:
+        try:
+            queryset = queryset.filter(author_id=int(author))
+        except (ValueError, TypeError):
+            pass
+
+    ordering = CATALOGUE_SORTS.get(params.get("sort")) or CATALOGUE_SORTS["relevance"]
+    return queryset, ordering
+
+
+def catalogue_page(params, values=None):
+    """
+    One page of the catalogue (?limit=, ?cursor=): (products, next_cursor).
+    Raises InvalidCursor.
+
+    With `values` (field names) the page holds values() dicts instead of
+    model instances.
+    """
+    plan = plan_catalogue(params)
+    if plan is None:
+        return [], None
+
+    queryset, ordering = plan
+    if values:
+        # The sort keys are needed for the cursor
+        sort_keys = [key.lstrip("-") for key in ordering if key.lstrip("-") not in values]
+        queryset = queryset.values(*values, *sort_keys)
+    limit = parse_limit(params.get("limit"), CATALOGUE_PAGE_SIZE, MAX_CATALOGUE_PAGE_SIZE)
+    return keyset_page(queryset, ordering, params.get("cursor"), limit)
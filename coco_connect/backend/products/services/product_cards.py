@@ -0,0 +1,104 @@
+# products/services/product_cards.py
+
+from urllib.parse import urljoin
+
+from django.conf import settings
+
+# What a card is computed from
+SOURCE_VALUES = ("id", "author__username", "author__email", "product_type__name", "category__slug", "image")
+CARD_FIELDS = ("author_name", "type_name", "category_slug", "image_url", "updated_at")
+
+
+def image_url(name):
+    """
+    Absolute URL of a stored product image, without a request at hand.
+    """
+    from products.models import Product
+
+    if not name:
+        return None
+    url = Product._meta.get_field("image").storage.url(name)
+    return urljoin(getattr(settings, "BACKEND_PUBLIC_URL", "").rstrip("/") + "/", url)
+
+
+def _card(row):
+    from products.models import ProductCard
+
+    return ProductCard(
+        product_id=row["id"],
+        author_name=row["author__username"] or row["author__email"],
+        type_name=row["product_type__name"],
+        category_slug=row["category__slug"],
+        image_url=image_url(row["image"]),
+    )
+
+
+def _write(cards):
+    from products.models import ProductCard
+
+    ProductCard.objects.bulk_create(
+        cards, update_conflicts=True, unique_fields=["product"], update_fields=CARD_FIELDS
+    )
+
+
+def refresh(products=None, batch_size=2000):
+    """
+    Recomputes the cards of `products` (a Product queryset, all products by
+    default) with one upsert per batch. Returns the number of cards written.
+    """
+    from products.models import Product
+
+    if products is None:
+        products = Product.objects.all()
+    rows = products.order_by().values(*SOURCE_VALUES).iterator(chunk_size=batch_size)
+
+    batch, total = [], 0
+    for row in rows:
+        batch.append(_card(row))
+        if len(batch) >= batch_size:
+            _write(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        _write(batch)
+        total += len(batch)
+    return total
+
+
+# -------------------------------------------------
+# Signal receivers (wired up in ProductsConfig.ready())
+# -------------------------------------------------
+def product_saved(sender, instance, **kwargs):
+    from products.models import Product
+
+    refresh(Product.objects.filter(pk=instance.pk))
+
+
+def category_saved(sender, instance, **kwargs):
+    from products.models import ProductCard
+
+    ProductCard.objects.filter(product__category_id=instance.pk).update(category_slug=instance.slug)
+
+
+def product_type_saved(sender, instance, **kwargs):
+    from products.models import ProductCard
+
+    ProductCard.objects.filter(product__product_type_id=instance.pk).update(type_name=instance.name)
+
+
+def product_type_deleting(sender, instance, **kwargs):
+    # The products keep existing (SET_NULL, without post_save)
+    from products.models import ProductCard
+
+    ProductCard.objects.filter(product__product_type_id=instance.pk).update(type_name=None)
+
+
+def author_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    from products.models import ProductCard
+
+    # New users have no products yet; logins only touch last_login
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    ProductCard.objects.filter(product__author_id=instance.pk).update(
+        author_name=instance.username or instance.email
+    )
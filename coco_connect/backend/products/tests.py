@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from .models import CartItem, Category, Product
+from .services.cart_batch import UnknownProducts, _fold, apply_operations
+
+
+# ==================================================
+# CART BATCH
+# ==================================================
+class FoldCartOperationsTests(SimpleTestCase):
+    def test_add_accumulates(self):
+        operations = [
+            {"op": "add", "product_id": 1, "quantity": 2},
+            {"op": "add", "product_id": 1},
+            {"op": "add", "product_id": 2, "quantity": 3},
+        ]
+        self.assertEqual(_fold(operations, {1: 1}), {1: 4, 2: 3})
+
+    def test_update_sets_and_zero_removes(self):
+        operations = [
+            {"op": "update", "product_id": 1, "quantity": 5},
+            {"op": "update", "product_id": 2, "quantity": 0},
+        ]
+        self.assertEqual(_fold(operations, {1: 1, 2: 2}), {1: 5, 2: None})
+
+    def test_operations_apply_in_order(self):
+        operations = [
+            {"op": "remove", "product_id": 1},
+            {"op": "add", "product_id": 1, "quantity": 2},
+            {"op": "add", "product_id": 2},
+            {"op": "remove", "product_id": 2},
+        ]
+        self.assertEqual(_fold(operations, {1: 7}), {1: 2, 2: None})
+
+    def test_input_is_not_modified(self):
+        current = {1: 1}
+        _fold([{"op": "remove", "product_id": 1}], current)
+        self.assertEqual(current, {1: 1})
+
+
+class ApplyCartOperationsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="buyer")
+        category = Category.objects.create(name="Oil", slug="oil")
+        cls.products = [
+            Product.objects.create(name=f"p{i}", description="", price=10, category=category) for i in range(3)
+        ]
+
+    def quantities(self):
+        return dict(CartItem.objects.filter(cart__user=self.user).values_list("product_id", "quantity"))
+
+    def test_applies_batch(self):
+        first, second, third = (product.id for product in self.products)
+        apply_operations(self.user, [{"op": "add", "product_id": first}, {"op": "add", "product_id": second}])
+        apply_operations(
+            self.user,
+            [
+                {"op": "add", "product_id": first, "quantity": 2},
+                {"op": "remove", "product_id": second},
+                {"op": "update", "product_id": third, "quantity": 4},
+            ],
+        )
+        self.assertEqual(self.quantities(), {first: 3, third: 4})
+
+    def test_unknown_product_applies_nothing(self):
+        operations = [{"op": "add", "product_id": self.products[0].id}, {"op": "add", "product_id": 999999}]
+        with self.assertRaises(UnknownProducts) as raised:
+            apply_operations(self.user, operations)
+        self.assertEqual(raised.exception.product_ids, [999999])
+        self.assertEqual(self.quantities(), {})
@@ -17,6 +17,7 @@ from .views import (
     AddToCartView,
     CartDetailView,
     CartClearView,
+    CartBatchView,
     CartItemUpdateDeleteView,
     MyOrdersAPIView,
     OrderDetailAPIView,
@@ -45,6 +46,7 @@ def health_check(request):
                 "news": "/api/products/news/",
                 "cart_add": "/api/products/cart/add/",
                 "cart_detail": "/api/products/cart/",
+                "cart_batch": "/api/products/cart/batch/",
                 "cart_item": "/api/products/cart/item/<id>/",
                 "health": "/api/products/health/",
             },
@@ -72,6 +74,7 @@ urlpatterns = [
     path("cart/add/", AddToCartView.as_view(), name="cart-add"),
     path("cart/", CartDetailView.as_view(), name="cart-detail"),
     path("cart/clear/", CartClearView.as_view(), name="cart-clear"),
+    path("cart/batch/", CartBatchView.as_view(), name="cart-batch"),
     path(
         "cart/item/<int:pk>/",
         CartItemUpdateDeleteView.as_view(),
@@ -3,8 +3,9 @@ import traceback
 import time
 import io
 
-from django.contrib.auth.models import Group
+from django.contrib.auth.models import Group, User
 from django.db import transaction
+from django.utils.decorators import method_decorator
 
 from django.conf import settings
 from rest_framework.generics import ListAPIView, CreateAPIView, UpdateAPIView, DestroyAPIView
@@ -24,16 +25,25 @@ import hashlib
 import os
 from rest_framework.decorators import api_view, permission_classes
 
-from .models import Product, NewsItem, Cart, CartItem, Category, Order, OrderItem
+from .models import Product, ProductType, NewsItem, Cart, CartItem, Category, Order, OrderItem
 from .serializers import (
+    PRODUCT_LIST_VALUES,
     ProductSerializer,
+    product_list_data,
     ProductCreateSerializer,
     ProductUpdateSerializer,
     NewsSerializer,
     CartItemSerializer,
+    CartBatchSerializer,
+    cart_items_data,
 )
 
 from blockchain_records.web3_client import record_proof, make_product_hash, now_utc
+from connect.services.pagination import InvalidCursor
+from connect.services.response_cache import cached_view
+from .services.cart_batch import UnknownProducts, apply_operations
+from .services.cart_summary import cart_summary, cart_totals
+from .services.catalogue import catalogue_page
 
 
 # ======================================================
@@ -55,55 +65,36 @@ def ensure_user_in_group(user, group_name: str) -> bool:
 # ======================================================
 # PRODUCT LIST
 # ======================================================
+@method_decorator(cached_view(Product, Category, ProductType, User), name="dispatch")
 class ProductListAPIView(ListAPIView):
+    """
+    One page of the catalogue: ?category=, ?type=, ?price_max=, ?author=,
+    ?sort=, ?limit= (default 24, max 100), ?cursor= (next_cursor of the
+    previous page).
+    """
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
 
-    def get_queryset(self):
-        # Prefer select_related for performance, but fallback safely
-        try:
-            qs = Product.objects.select_related("category", "product_type", "author").all()
-        except Exception:
-            qs = Product.objects.all()
-
-        category = self.request.GET.get("category")
-        price_max = self.request.GET.get("price_max")
-        product_type = self.request.GET.get("type")
-        sort = self.request.GET.get("sort")
-
-        if category and category != "all":
-            qs = qs.filter(category__slug=category)
-
-        if price_max:
-            try:
-                qs = qs.filter(price__lte=Decimal(str(price_max)))
-            except (ValueError, TypeError):
-                pass
-
-        if product_type and product_type != "all":
-            qs = qs.filter(product_type__name=product_type)
-
-        if sort == "price_low_high":
-            qs = qs.order_by("price")
-        elif sort == "price_high_low":
-            qs = qs.order_by("-price")
-
-        return qs
-
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-        context["request"] = self.request
-        return context
-
     def list(self, request, *args, **kwargs):
         try:
-            return super().list(request, *args, **kwargs)
+            # values() rows with the precomputed card fields (ProductCard)
+            rows, next_cursor = catalogue_page(request.GET, values=PRODUCT_LIST_VALUES)
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(
                 {"error": "Failed to fetch products", "detail": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+        return Response(
+            {
+                "results": product_list_data(rows),
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+        )
+
 
 # ======================================================
 # PRODUCT CREATE  (EARN "FARMER" ROLE ON SUCCESS)
@@ -146,6 +137,7 @@ class ProductUpdateAPIView(UpdateAPIView):
 # ======================================================
 # NEWS LIST
 # ======================================================
+@method_decorator(cached_view(NewsItem), name="dispatch")
 class NewsListAPIView(ListAPIView):
     serializer_class = NewsSerializer
     permission_classes = [AllowAny]
@@ -174,6 +166,7 @@ class NewsListAPIView(ListAPIView):
 # ======================================================
 # CATEGORY LIST (PUBLIC)
 # ======================================================
+@method_decorator(cached_view(Category), name="dispatch")
 class CategoryListAPIView(APIView):
     """Public list of product categories for dropdowns"""
     permission_classes = [AllowAny]
@@ -206,9 +199,10 @@ class PayHereInitFromCart(APIView):
 
     def post(self, request):
         cart, _ = Cart.objects.get_or_create(user=request.user)
-        items_qs = cart.items.select_related("product")
+        summary = cart_summary(cart)
+        lines = summary["lines"]
 
-        if not items_qs.exists():
+        if not lines:
             return Response({"detail": "Cart is empty."}, status=status.HTTP_400_BAD_REQUEST)
 
         merchant_id = settings.PAYHERE_MERCHANT_ID
@@ -219,14 +213,8 @@ class PayHereInitFromCart(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        total = Decimal("0.00")
-        item_names = []
-        for it in items_qs:
-            total += (it.product.price * it.quantity)
-            if it.product and it.product.name:
-                item_names.append(it.product.name)
-
-        total = total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        item_names = [line["product__name"] for line in lines if line["product__name"]]
+        total = summary["subtotal"].quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
         amount_str = f"{total:.2f}"
 
         order_id = f"CC_{request.user.id}_{int(time.time())}"
@@ -252,13 +240,13 @@ class PayHereInitFromCart(APIView):
                 [
                     OrderItem(
                         order=order,
-                        product=it.product,
-                        product_name=it.product.name,
-                        unit_price=it.product.price,
-                        quantity=it.quantity,
-                        line_total=it.product.price * it.quantity,
+                        product_id=line["product_id"],
+                        product_name=line["product__name"],
+                        unit_price=line["product__price"],
+                        quantity=line["quantity"],
+                        line_total=line["line_total"],
                     )
-                    for it in items_qs
+                    for line in lines
                 ]
             )
 
@@ -298,8 +286,8 @@ class CheckoutCreateAPIView(APIView):
         if not cart:
             return Response({"error": "Cart not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        items = cart.items.select_related("product")
-        if not items.exists():
+        summary = cart_summary(cart)
+        if not summary["lines"]:
             return Response({"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST)
 
         payload = request.data or {}
@@ -314,7 +302,7 @@ class CheckoutCreateAPIView(APIView):
             except Exception:
                 return Decimal("0")
 
-        subtotal = sum((item.product.price * item.quantity) for item in items)
+        subtotal = summary["subtotal"]
         tax = to_decimal(payload.get("tax", 0))
         shipping = to_decimal(payload.get("shipping", 0))
         total_amount = to_decimal(payload.get("total_amount", subtotal + tax + shipping))
@@ -337,13 +325,13 @@ class CheckoutCreateAPIView(APIView):
             [
                 OrderItem(
                     order=order,
-                    product=item.product,
-                    product_name=item.product.name,
-                    unit_price=item.product.price,
-                    quantity=item.quantity,
-                    line_total=item.product.price * item.quantity,
+                    product_id=line["product_id"],
+                    product_name=line["product__name"],
+                    unit_price=line["product__price"],
+                    quantity=line["quantity"],
+                    line_total=line["line_total"],
                 )
-                for item in items
+                for line in summary["lines"]
             ]
         )
 
@@ -578,7 +566,7 @@ class AddToCartView(APIView):
             cart_item.save()
 
         return Response(
-            {"message": "Product added to cart", "cart_count": cart.total_items},
+            {"message": "Product added to cart", "cart_count": cart_totals(cart)["item_count"]},
             status=status.HTTP_200_OK,
         )
 
@@ -586,19 +574,49 @@ class AddToCartView(APIView):
 # ======================================================
 # CART – GET CART DETAILS
 # ======================================================
+def cart_detail_data(cart):
+    summary = cart_summary(cart)
+    return {
+        "items": cart_items_data(summary["lines"]),
+        "total_items": summary["item_count"],
+        "subtotal": f"{summary['subtotal']:f}",
+    }
+
+
 class CartDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         cart, _ = Cart.objects.get_or_create(user=request.user)
-        items = cart.items.select_related("product")
+        return Response(cart_detail_data(cart), status=status.HTTP_200_OK)
 
-        serializer = CartItemSerializer(items, many=True, context={"request": request})
 
-        return Response(
-            {"items": serializer.data, "total_items": cart.total_items},
-            status=status.HTTP_200_OK,
-        )
+# ======================================================
+# CART – BATCH ADD / UPDATE / REMOVE
+# ======================================================
+class CartBatchView(APIView):
+    """
+    Applies many cart operations in one request and transaction:
+    {"operations": [{"op": "add" | "update" | "remove", "product_id": 1, "quantity": 2}, ...]}
+    (in order; add defaults to 1, update to 0 removes). Returns the cart
+    like CartDetailView. Nothing is applied if any operation is invalid.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = CartBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            cart = apply_operations(request.user, serializer.validated_data["operations"])
+        except UnknownProducts as e:
+            return Response(
+                {"error": str(e), "product_ids": e.product_ids},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(cart_detail_data(cart), status=status.HTTP_200_OK)
 
 
 # ======================================================
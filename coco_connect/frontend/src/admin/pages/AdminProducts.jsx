@@ -56,14 +56,23 @@ export default function AdminProducts() {
     setError("");
 
     try {
-      const res = await fetch(`${API_BASE}/products/`, {
-        headers: authHeaders(token),
-      });
-
-      if (!res.ok) throw new Error("Failed to load products");
-
-      const data = await res.json();
-      setItems(Array.isArray(data) ? data : []);
+      // The catalogue is paged: follow next_cursor to the end
+      const all = [];
+      let cursor = null;
+      do {
+        const params = new URLSearchParams({ limit: "100" });
+        if (cursor) params.append("cursor", cursor);
+        const res = await fetch(`${API_BASE}/products/?${params}`, {
+          headers: authHeaders(token),
+        });
+
+        if (!res.ok) throw new Error("Failed to load products");
+
+        const data = await res.json();
+        all.push(...(Array.isArray(data.results) ? data.results : []));
+        cursor = data.next_cursor;
+      } while (cursor);
+      setItems(all);
     } catch (e) {
       setError(e.message);
       toast.error(e.message);
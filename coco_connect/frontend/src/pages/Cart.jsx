@@ -9,6 +9,7 @@ import { useNavigate } from "react-router-dom";
 
 const Cart = () => {
   const [cartItems, setCartItems] = useState([]);
+  const [cartSubtotal, setCartSubtotal] = useState(0);
   const [loading, setLoading] = useState(true);
   const [showPayment, setShowPayment] = useState(false);
   const [isLoginOpen, setIsLoginOpen] = useState(false);
@@ -58,6 +59,7 @@ const Cart = () => {
       const data = await res.json();
       setCartItems(data.items || []);
       setCartCount(data.total_items || 0);
+      setCartSubtotal(Number(data.subtotal || 0));
     } catch (err) {
       // 🔒 RULES
       if (cartItems.length > 0) return;
@@ -134,10 +136,8 @@ const Cart = () => {
   // =========================
   // TOTALS
   // =========================
-  const subtotal = cartItems.reduce(
-    (sum, item) => sum + item.product_price * item.quantity,
-    0
-  );
+  // Summed by the API (line totals and subtotal come with the cart)
+  const subtotal = cartItems.length ? cartSubtotal : 0;
 
   const tax = subtotal * taxRate;
   const total = subtotal + shipping + tax;
@@ -264,7 +264,7 @@ const Cart = () => {
                     {/* Total */}
                     <div className="flex justify-between items-center">
                       <span className="font-semibold">
-                        ${(item.product_price * item.quantity).toFixed(2)}
+                        ${item.line_total}
                       </span>
                       <button
                         onClick={() => removeItem(item.id)}
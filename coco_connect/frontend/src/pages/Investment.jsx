@@ -17,6 +17,8 @@ const InvestmentPage = () => {
   const [loadingMine, setLoadingMine] = useState(false);
 
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [investmentAmount, setInvestmentAmount] = useState(100);
 
   // Group investment states
@@ -192,106 +194,138 @@ const InvestmentPage = () => {
     return Math.round(targetAmount / totalUnits);
   };
 
-  // Fetch projects
-  useEffect(() => {
-    const fetchProjects = async () => {
-      setLoading(true);
-      try {
-        const params = new URLSearchParams();
+  // API project -> shape used by the UI
+  const toUiProject = (project) => {
+    const targetAmount = parseFloat(project.target_amount) || 0;
+    const totalUnits = project.total_units || 1000;
+    const unitPrice =
+      project.unit_price || calculateUnitPrice(targetAmount, totalUnits);
 
-        if (filters.category && filters.category !== "All Categories") {
-          params.append("category", filters.category);
-        }
+    const currentAmount = parseFloat(project.current_amount) || 0;
 
-        if (filters.location && filters.location !== "All Locations") {
-          params.append("location", filters.location);
-        }
+    return {
+      id: project.id,
+      title: project.title,
+      description: project.description,
+      category: project.category, // name
+      location: project.location,
 
-        params.append("minROI", filters.minROI.toString());
-        params.append("maxROI", filters.maxROI.toString());
+      // ✅ always provide these so UI doesn’t break
+      farmerName: project.farmer_name || "Farmer",
+      farmerExperience: project.farmer_experience ?? 0,
+      farmerRating: project.farmer_rating ?? 4.5,
 
-        if (filters.riskLevel) params.append("riskLevel", filters.riskLevel);
+      imageUrl: "",
+      roi: parseFloat(project.roi) || 0, // from serializer (expected_roi)
+      duration: project.duration || 12, // from serializer (duration_months)
+      targetAmount,
+      currentAmount,
+      investorsCount: project.investors_count || 0,
+      status: project.status || "active",
+      daysLeft: project.days_left || 0,
+      investmentType: project.investment_type || "equity",
+      riskLevel: project.risk_level || "medium",
+      createdAt: project.created_at || "2024-01-01",
+      tags: Array.isArray(project.tags)
+        ? project.tags
+        : project.tags
+        ? project.tags.split(",")
+        : [],
+      totalUnits,
+      availableUnits:
+        project.available_units ??
+        Math.floor((targetAmount - currentAmount) / unitPrice),
+      unitPrice,
+      investmentStructure:
+        project.investment_structure ||
+        (project.investment_type === "equity" ? "units" : "fixed"),
+    };
+  };
 
-        if (filters.investmentType && filters.investmentType !== "all") {
-          params.append("investmentType", filters.investmentType);
-        }
+  const buildProjectParams = (cursor) => {
+    const params = new URLSearchParams();
+
+    if (filters.category && filters.category !== "All Categories") {
+      params.append("category", filters.category);
+    }
+
+    if (filters.location && filters.location !== "All Locations") {
+      params.append("location", filters.location);
+    }
 
-        if (filters.search) params.append("search", filters.search);
+    params.append("minROI", filters.minROI.toString());
+    params.append("maxROI", filters.maxROI.toString());
 
-        params.append("sortBy", filters.sortBy);
-        params.append("status", "active");
+    if (filters.riskLevel) params.append("riskLevel", filters.riskLevel);
 
+    if (filters.investmentType && filters.investmentType !== "all") {
+      params.append("investmentType", filters.investmentType);
+    }
+
+    if (filters.search) params.append("search", filters.search);
+
+    params.append("sortBy", filters.sortBy);
+    params.append("status", "active");
+    if (cursor) params.append("cursor", cursor);
+    return params;
+  };
+
+  // Fetch projects (first page; the API pages with a cursor)
+  useEffect(() => {
+    const fetchProjects = async () => {
+      setLoading(true);
+      try {
+        const params = buildProjectParams(null);
         const response = await fetch(`${API}/api/projects/?${params}`);
         if (!response.ok) throw new Error("Failed to fetch projects");
 
         const data = await response.json();
 
         if (data.success && data.projects) {
-          const apiProjects = data.projects.map((project) => {
-            const targetAmount = parseFloat(project.target_amount) || 0;
-            const totalUnits = project.total_units || 1000;
-            const unitPrice =
-              project.unit_price || calculateUnitPrice(targetAmount, totalUnits);
-
-            const currentAmount = parseFloat(project.current_amount) || 0;
-
-            return {
-              id: project.id,
-              title: project.title,
-              description: project.description,
-              category: project.category, // name
-              location: project.location,
-
-              // ✅ always provide these so UI doesn’t break
-              farmerName: project.farmer_name || "Farmer",
-              farmerExperience: project.farmer_experience ?? 0,
-              farmerRating: project.farmer_rating ?? 4.5,
-
-              imageUrl: "",
-              roi: parseFloat(project.roi) || 0, // from serializer (expected_roi)
-              duration: project.duration || 12, // from serializer (duration_months)
-              targetAmount,
-              currentAmount,
-              investorsCount: project.investors_count || 0,
-              status: project.status || "active",
-              daysLeft: project.days_left || 0,
-              investmentType: project.investment_type || "equity",
-              riskLevel: project.risk_level || "medium",
-              createdAt: project.created_at || "2024-01-01",
-              tags: Array.isArray(project.tags)
-                ? project.tags
-                : project.tags
-                ? project.tags.split(",")
-                : [],
-              totalUnits,
-              availableUnits:
-                project.available_units ??
-                Math.floor((targetAmount - currentAmount) / unitPrice),
-              unitPrice,
-              investmentStructure:
-                project.investment_structure ||
-                (project.investment_type === "equity" ? "units" : "fixed"),
-            };
-          });
+          const apiProjects = data.projects.map(toUiProject);
 
           setProjects(apiProjects);
           setFilteredProjects(apiProjects);
+          setNextCursor(data.next_cursor || null);
         } else {
           setProjects(mockProjects);
           setFilteredProjects(mockProjects);
+          setNextCursor(null);
         }
       } catch (error) {
         console.error("Error fetching projects:", error);
         setProjects(mockProjects);
         setFilteredProjects(mockProjects);
+        setNextCursor(null);
       } finally {
         setLoading(false);
       }
     };
 
     fetchProjects();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [filters]);
 
+  const loadMoreProjects = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const params = buildProjectParams(nextCursor);
+      const response = await fetch(`${API}/api/projects/?${params}`);
+      if (!response.ok) throw new Error("Failed to fetch projects");
+
+      const data = await response.json();
+      if (data.success && data.projects) {
+        setProjects((prev) => [...prev, ...data.projects.map(toUiProject)]);
+        setNextCursor(data.next_cursor || null);
+      }
+    } catch (error) {
+      console.error("Error loading more projects:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Apply filters
   useEffect(() => {
     applyFilters();
@@ -321,17 +355,8 @@ const InvestmentPage = () => {
       filtered = filtered.filter((project) => project.investmentType === filters.investmentType);
     }
 
-    if (filters.search) {
-      const searchTerm = filters.search.toLowerCase();
-      filtered = filtered.filter((project) => {
-        const farmer = (project.farmerName || "").toLowerCase();
-        return (
-          project.title.toLowerCase().includes(searchTerm) ||
-          project.description.toLowerCase().includes(searchTerm) ||
-          farmer.includes(searchTerm)
-        );
-      });
-    }
+    // Search is done by the API (full-text, prefix + stemming), so the
+    // results aren't filtered again here
 
     if (filters.sortBy) {
       filtered.sort((a, b) => {
@@ -350,6 +375,7 @@ const InvestmentPage = () => {
             return b.investorsCount - a.investorsCount;
           case "price_per_share":
             return (a.unitPrice || 0) - (b.unitPrice || 0);
+          // trending / closest_to_funded: kept in the API's order
           default:
             return 0;
         }
@@ -889,11 +915,14 @@ const InvestmentPage = () => {
                       onChange={(e) => setFilters({ ...filters, sortBy: e.target.value })}
                       disabled={tab === "mine"}
                     >
+                      <option value="relevance">Best Match</option>
                       <option value="roi_desc">Highest ROI</option>
                       <option value="roi_asc">Lowest ROI</option>
                       <option value="date_newest">Newest First</option>
                       <option value="funding_needed">Most Funding Needed</option>
                       <option value="popularity">Most Popular</option>
+                      <option value="trending">Trending</option>
+                      <option value="closest_to_funded">Closest to Funded</option>
                       <option value="price_per_share">Lowest Price Per Share</option>
                     </select>
                   </div>
@@ -1227,6 +1256,18 @@ const InvestmentPage = () => {
                         );
                       })}
                     </div>
+
+                    {nextCursor && (
+                      <div className="mt-8 flex justify-center">
+                        <button
+                          onClick={loadMoreProjects}
+                          disabled={loadingMore}
+                          className="px-6 py-3 rounded-lg bg-accent4 text-accent6 font-semibold hover:bg-accent5 disabled:opacity-60"
+                        >
+                          {loadingMore ? "Loading..." : "Load more projects"}
+                        </button>
+                      </div>
+                    )}
                   </>
                 )}
               </>
@@ -18,18 +18,23 @@ import RegisterModal from "../components/RegisterModal";
 const API = "http://127.0.0.1:8000";
 const ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/webp", "image/jpg"];
 const MAX_IMAGE_SIZE_MB = 5;
+// Top of the price slider: at this value no price_max is sent
+const PRICE_SLIDER_MAX = 100000;
+// Card width in the 1 / 2 / 3 column grid, so the browser picks the right thumbnail
+const PRODUCT_CARD_SIZES = "(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw";
 
 const Product = () => {
   const [filters, setFilters] = useState({
     category: "all",
-    price: 500,
+    price: PRICE_SLIDER_MAX,
     type: "all",
     sortBy: "relevance",
   });
 
-  const [visibleCount, setVisibleCount] = useState(6);
-
   const [products, setProducts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [categories, setCategories] = useState([]);
   const [isLoadingProducts, setIsLoadingProducts] = useState(true);
   const [productsError, setProductsError] = useState(null);
   const [reloadProductsTick, setReloadProductsTick] = useState(0);
@@ -38,8 +43,6 @@ const Product = () => {
   const [verifyingId, setVerifyingId] = useState(null);
   const [verifyError, setVerifyError] = useState(null);
 
-  const hasSetMaxPrice = useRef(false);
-
   // ✅ Logged-in user + access token (reactive)
   const [user, setUser] = useState(() => {
     try {
@@ -112,6 +115,17 @@ const Product = () => {
     return () => clearInterval(interval);
   }, [newsItems.length]);
 
+  const buildProductParams = (cursor) => {
+    const params = new URLSearchParams();
+    if (filters.category !== "all") params.append("category", filters.category);
+    if (filters.type !== "all") params.append("type", filters.type);
+    if (filters.price < PRICE_SLIDER_MAX) params.append("price_max", filters.price.toString());
+    params.append("sort", filters.sortBy);
+    if (cursor) params.append("cursor", cursor);
+    return params;
+  };
+
+  // Fetch products (first page; filtering, sorting and paging run in the API)
   useEffect(() => {
     const fetchProducts = async () => {
       setIsLoadingProducts(true);
@@ -122,7 +136,7 @@ const Product = () => {
 
       const attemptFetch = async () => {
         try {
-          const response = await fetch(`${API}/api/products/`, {
+          const response = await fetch(`${API}/api/products/?${buildProductParams(null)}`, {
             method: "GET",
             headers: { "Content-Type": "application/json" },
           });
@@ -139,15 +153,8 @@ const Product = () => {
           }
 
           const data = await response.json();
-          setProducts(Array.isArray(data) ? data : []);
-
-          if (Array.isArray(data) && data.length > 0) {
-            const maxPrice = Math.max(...data.map((p) => Number(p.price) || 0));
-            if (!hasSetMaxPrice.current && maxPrice > filters.price) {
-              setFilters((prev) => ({ ...prev, price: Math.ceil(maxPrice) }));
-              hasSetMaxPrice.current = true;
-            }
-          }
+          setProducts(Array.isArray(data.results) ? data.results : []);
+          setNextCursor(data.next_cursor || null);
 
           setIsLoadingProducts(false);
         } catch (err) {
@@ -161,6 +168,7 @@ const Product = () => {
             setTimeout(attemptFetch, 1000);
           } else {
             setProducts([]);
+            setNextCursor(null);
             setProductsError(err.message || "Failed to fetch products");
             setIsLoadingProducts(false);
           }
@@ -172,6 +180,44 @@ const Product = () => {
 
     fetchProducts();
     // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [reloadProductsTick, filters]);
+
+  const loadMoreProducts = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetch(`${API}/api/products/?${buildProductParams(nextCursor)}`, {
+        headers: { "Content-Type": "application/json" },
+      });
+      if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+
+      const data = await response.json();
+      setProducts((prev) => [...prev, ...(Array.isArray(data.results) ? data.results : [])]);
+      setNextCursor(data.next_cursor || null);
+    } catch (err) {
+      console.error("❌ Error loading more products:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  useEffect(() => {
+    const fetchCategories = async () => {
+      try {
+        const response = await fetch(`${API}/api/products/categories/`, {
+          headers: { "Content-Type": "application/json" },
+        });
+        if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+
+        const data = await response.json();
+        setCategories(Array.isArray(data) ? data : []);
+      } catch (err) {
+        console.error("❌ Error fetching categories:", err);
+        setCategories([]);
+      }
+    };
+
+    fetchCategories();
   }, [reloadProductsTick]);
 
   useEffect(() => {
@@ -259,80 +305,8 @@ const Product = () => {
   const { addToCart } = useCart();
   const handleAddToCart = async (productId) => addToCart(productId);
 
-  // Categories from products
-  const availableCategories = useMemo(() => {
-    if (!Array.isArray(products) || products.length === 0) return [];
-    const categories = new Set();
-    products.forEach((p) => p?.category && categories.add(p.category));
-    return Array.from(categories).sort();
-  }, [products]);
-
-  // Category counts based on filters except category
-  const categoryCounts = useMemo(() => {
-    if (!Array.isArray(products) || products.length === 0) return { all: 0 };
-
-    const baseFiltered = products.filter((p) => {
-      const price = Number(p?.price);
-      if (Number.isNaN(price)) return false;
-      return price <= filters.price && (filters.type === "all" || p.type === filters.type);
-    });
-
-    const counts = { all: baseFiltered.length };
-    availableCategories.forEach((catSlug) => {
-      counts[catSlug] = baseFiltered.filter((p) => p?.category === catSlug).length;
-    });
-
-    return counts;
-  }, [products, filters.price, filters.type, availableCategories]);
-
-  const categoryData = useMemo(() => {
-    return {
-      categories: availableCategories.map((slug, idx) => ({
-        id: idx,
-        slug,
-        name: String(slug).replace(/-/g, " "),
-        count: categoryCounts[slug] ?? 0,
-      })),
-    };
-  }, [availableCategories, categoryCounts]);
-
-  const filteredProducts = useMemo(() => {
-    if (!Array.isArray(products) || products.length === 0) return [];
-
-    return products
-      .filter((p) => {
-        const price = Number(p?.price);
-        if (Number.isNaN(price)) return false;
-
-        return (
-          (filters.category === "all" || p.category === filters.category) &&
-          price <= filters.price &&
-          (filters.type === "all" || p.type === filters.type)
-        );
-      })
-      .sort((a, b) => {
-        if (filters.sortBy === "price_low_high") return Number(a.price) - Number(b.price);
-        if (filters.sortBy === "price_high_low") return Number(b.price) - Number(a.price);
-        return 0;
-      });
-  }, [products, filters.category, filters.price, filters.type, filters.sortBy]);
-
-  const visibleProducts = useMemo(() => filteredProducts.slice(0, visibleCount), [
-    filteredProducts,
-    visibleCount,
-  ]);
-
-  useEffect(() => {
-    setVisibleCount(6);
-  }, [filters.category, filters.price, filters.type, filters.sortBy]);
-
-  const handleLoadMore = () => {
-    setVisibleCount((prev) => Math.min(prev + 3, filteredProducts.length));
-  };
-
   const handleReset = () => {
-    setFilters({ category: "all", price: 500, type: "all", sortBy: "relevance" });
-    setVisibleCount(6);
+    setFilters({ category: "all", price: PRICE_SLIDER_MAX, type: "all", sortBy: "relevance" });
   };
 
   const openProduct = (product) => {
@@ -466,9 +440,9 @@ const Product = () => {
                 className="w-full px-3 py-2 border border-gray-300 rounded"
               >
                 <option value="all">All</option>
-                {categoryData.categories.map((cat) => (
+                {categories.map((cat) => (
                   <option key={cat.id} value={cat.slug}>
-                    {cat.name} ({cat.count})
+                    {cat.name}
                   </option>
                 ))}
               </select>
@@ -481,7 +455,7 @@ const Product = () => {
               <input
                 type="range"
                 min="0"
-                max="100000"
+                max={PRICE_SLIDER_MAX}
                 value={filters.price}
                 onChange={(e) => setFilters({ ...filters, price: Number(e.target.value) })}
                 className="w-full accent-green-400"
@@ -584,8 +558,8 @@ const Product = () => {
                 )}
 
                 <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-6">
-                  {visibleProducts.length > 0 ? (
-                    visibleProducts.map((product) => {
+                  {products.length > 0 ? (
+                    products.map((product) => {
                       const isVerified = Boolean(product?.verified_at);
                       const isVerifying = verifyingId === product.id;
 
@@ -614,20 +588,31 @@ const Product = () => {
 
                           {/* Image */}
                           {product.image ? (
-                            <div className="overflow-hidden rounded-xl">
+                            <picture className="block overflow-hidden rounded-xl">
+                              {/* Sized thumbnails once the backend has rendered them */}
+                              {product.image_srcset?.webp && (
+                                <source
+                                  type="image/webp"
+                                  srcSet={product.image_srcset.webp}
+                                  sizes={PRODUCT_CARD_SIZES}
+                                />
+                              )}
                               <img
                                 src={
                                   String(product.image).startsWith("http")
                                     ? product.image
                                     : `${API}${product.image}`
                                 }
+                                srcSet={product.image_srcset?.jpeg || undefined}
+                                sizes={PRODUCT_CARD_SIZES}
+                                loading="lazy"
                                 alt={product.name || "Product"}
                                 className="w-full h-48 object-cover transition-transform duration-300 group-hover:scale-[1.03]"
                                 onError={(e) => {
                                   e.currentTarget.style.display = "none";
                                 }}
                               />
-                            </div>
+                            </picture>
                           ) : (
                             <div className="w-full h-48 bg-gray-200 rounded-xl flex items-center justify-center">
                               <span className="text-gray-400">No Image</span>
@@ -711,13 +696,14 @@ const Product = () => {
               </>
             )}
 
-            {visibleCount < filteredProducts.length && (
+            {nextCursor && (
               <div className="flex justify-center mt-8">
                 <button
-                  onClick={handleLoadMore}
+                  onClick={loadMoreProducts}
+                  disabled={loadingMore}
                   className="px-5 py-2 border bg-[#faf0e6] rounded-md hover:bg-gray-100"
                 >
-                  Load More Products
+                  {loadingMore ? "Loading..." : "Load More Products"}
                 </button>
               </div>
             )}
@@ -894,6 +880,25 @@ const MyProductsModal = ({ isOpen, onClose, user, access, apiBase, onUpdated })
     };
   }, []);
 
+  // The catalogue is paged: follow next_cursor through this user's products
+  const fetchMyProducts = async () => {
+    if (!user?.id) return [];
+    const all = [];
+    let cursor = null;
+    do {
+      const params = new URLSearchParams({ author: user.id, limit: "100" });
+      if (cursor) params.append("cursor", cursor);
+      const res = await fetch(`${apiBase}/api/products/?${params}`, {
+        headers: { "Content-Type": "application/json" },
+      });
+      if (!res.ok) throw new Error("Failed to load products.");
+      const data = await res.json();
+      all.push(...(Array.isArray(data.results) ? data.results : []));
+      cursor = data.next_cursor;
+    } while (cursor);
+    return all;
+  };
+
   useEffect(() => {
     if (!isOpen) return;
 
@@ -901,18 +906,14 @@ const MyProductsModal = ({ isOpen, onClose, user, access, apiBase, onUpdated })
       setLoading(true);
       setError("");
       try {
-        const [productsRes, categoriesRes] = await Promise.all([
-          fetch(`${apiBase}/api/products/`, {
-            headers: { "Content-Type": "application/json" },
-          }),
+        const [productsData, categoriesRes] = await Promise.all([
+          fetchMyProducts(),
           fetch(`${apiBase}/api/products/categories/`, {
             headers: { "Content-Type": "application/json" },
           }),
         ]);
 
-        if (!productsRes.ok) throw new Error("Failed to load products.");
-        const productsData = await productsRes.json();
-        setItems(Array.isArray(productsData) ? productsData : []);
+        setItems(productsData);
 
         if (categoriesRes.ok) {
           const categoriesData = await categoriesRes.json();
@@ -930,7 +931,8 @@ const MyProductsModal = ({ isOpen, onClose, user, access, apiBase, onUpdated })
     };
 
     fetchAll();
-  }, [isOpen, apiBase]);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [isOpen, apiBase, user?.id]);
 
   const myProducts = useMemo(() => {
     if (!user?.id) return [];
@@ -1038,12 +1040,10 @@ const MyProductsModal = ({ isOpen, onClose, user, access, apiBase, onUpdated })
       cancelEdit();
       onUpdated?.();
       if (isOpen) {
-        const fresh = await fetch(`${apiBase}/api/products/`, {
-          headers: { "Content-Type": "application/json" },
-        });
-        if (fresh.ok) {
-          const data = await fresh.json();
-          setItems(Array.isArray(data) ? data : []);
+        try {
+          setItems(await fetchMyProducts());
+        } catch {
+          // Keep the current list; the update itself went through
         }
       }
       if (crackTimerRef.current) clearTimeout(crackTimerRef.current);